@@ -0,0 +1,314 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from decimal import getcontext, localcontext
+
+from vector import Vector
+from linsys import Parametrization
+
+getcontext().prec = 30
+
+# solve one system.  module level so it can be pickled and shipped to a process pool
+# decimal contexts are per thread, so the caller's context is carried along with the system
+def solve_system(system, context=None):
+    with localcontext(context):
+        return system.compute_solution()
+
+class ThroughputStats(object):
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.start_time = None
+        self.end_time = None
+
+    def start(self):
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+
+    def stop(self):
+        self.end_time = time.perf_counter()
+
+    def elapsed_seconds(self):
+        if self.start_time is None:
+            return 0.0
+        end = self.end_time if self.end_time is not None else time.perf_counter()
+        return end - self.start_time
+
+    # systems solved per second since the first submission
+    def systems_per_second(self):
+        elapsed = self.elapsed_seconds()
+        if elapsed == 0:
+            return 0.0
+        return self.completed / elapsed
+
+    def __str__(self):
+        return 'submitted: {}, completed: {}, {:.1f} systems/sec'.format(
+            self.submitted, self.completed, self.systems_per_second())
+
+class BatchSolver(object):
+
+    UNKNOWN_POOL_KIND_MSG = 'The pool kind must be either "thread" or "process"'
+    MAX_PENDING_MUST_BE_POSITIVE_MSG = 'The maximum number of pending systems must be positive'
+
+    # pool_kind: 'thread' or 'process'
+    # max_workers: size of the pool (None lets concurrent.futures pick)
+    # max_pending: bound on systems submitted but not yet yielded.  the input is not read
+    #              past this point until a result is consumed (backpressure)
+    def __init__(self, pool_kind='thread', max_workers=None, max_pending=64):
+        if pool_kind not in ('thread', 'process'):
+            raise ValueError(self.UNKNOWN_POOL_KIND_MSG)
+        if max_pending < 1:
+            raise ValueError(self.MAX_PENDING_MUST_BE_POSITIVE_MSG)
+
+        self.pool_kind = pool_kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.stats = ThroughputStats()
+        self.executor = None
+
+    def __enter__(self):
+        self.get_executor()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def get_executor(self):
+        if self.executor is None:
+            if self.pool_kind == 'thread':
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            else:
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.stats.stop()
+
+    # solve every system in the iterable, yielding results in input order
+    # each result is whatever compute_solution returns (a Parametrization or a message string)
+    def solve(self, systems):
+        executor = self.get_executor()
+        pending = deque()
+
+        for system in systems:
+            if len(pending) >= self.max_pending:
+                yield self.collect(pending.popleft())
+            pending.append(self.submit(executor, system))
+
+        while pending:
+            yield self.collect(pending.popleft())
+
+    # solve every system in the iterable, yielding (index, result) pairs as they finish
+    def solve_as_completed(self, systems):
+        executor = self.get_executor()
+        pending = {}
+
+        for i, system in enumerate(systems):
+            if len(pending) >= self.max_pending:
+                for pair in self.collect_finished(pending):
+                    yield pair
+            pending[self.submit(executor, system)] = i
+
+        while pending:
+            for pair in self.collect_finished(pending):
+                yield pair
+
+    # async counterpart of solve()/solve_as_completed().  accepts a plain iterable or an async iterator
+    async def solve_async(self, systems, ordered=True):
+        loop = asyncio.get_running_loop()
+        executor = self.get_executor()
+        pending = deque() if ordered else set()
+        index_of = {}
+
+        async def drain_one():
+            if ordered:
+                future = pending.popleft()
+                result = await future
+                self.stats.completed += 1
+                return [result]
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished = []
+            for future in done:
+                pending.discard(future)
+                self.stats.completed += 1
+                finished.append((index_of.pop(future), future.result()))
+            return finished
+
+        i = 0
+        async for system in self.iterate_async(systems):
+            if len(pending) >= self.max_pending:
+                for item in await drain_one():
+                    yield item
+            self.stats.start()
+            self.stats.submitted += 1
+            future = loop.run_in_executor(executor, solve_system, system, getcontext().copy())
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+                index_of[future] = i
+            i += 1
+
+        while pending:
+            for item in await drain_one():
+                yield item
+
+    @staticmethod
+    async def iterate_async(systems):
+        if hasattr(systems, '__aiter__'):
+            async for system in systems:
+                yield system
+        else:
+            for system in systems:
+                yield system
+
+    def submit(self, executor, system):
+        self.stats.start()
+        self.stats.submitted += 1
+        return executor.submit(solve_system, system, getcontext().copy())
+
+    def collect(self, future):
+        result = future.result()
+        self.stats.completed += 1
+        return result
+
+    def collect_finished(self, pending):
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        finished = []
+        for future in done:
+            finished.append((pending.pop(future), self.collect(future)))
+        return finished
+
+class SameShapeBatch(object):
+
+    SYSTEMS_MUST_SHARE_SHAPE_MSG = 'All systems in a batch must have the same number of equations and variables'
+    NO_SYSTEMS_MSG = 'At least one system is required to build a batch'
+
+    UNIQUE_SOLUTION = 'Unique solution'
+    NO_SOLUTIONS = 'No solutions'
+    INF_SOLUTIONS = 'Infinitely many solutions'
+
+    # a convenience wrapper for solving many systems of the same shape in floats: k systems of m equations
+    # in n variables are copied once into nested float lists (row i of system s is [a_1, ..., a_n, k]) and
+    # eliminated there, without the Plane/Vector objects and Decimal arithmetic of
+    # LinearSystem.compute_solution.  that is where the speedup comes from (see batch.same_shape in
+    # benchmark.py); the elimination itself is an ordinary scalar loop per system
+    def __init__(self, systems, tolerance=1e-10):
+        systems = list(systems)
+        if not systems:
+            raise Exception(self.NO_SYSTEMS_MSG)
+
+        self.num_equations = len(systems[0])
+        self.num_variables = systems[0].dimension
+        self.tolerance = tolerance
+
+        self.augmented = []
+        for system in systems:
+            if len(system) != self.num_equations or system.dimension != self.num_variables:
+                raise Exception(self.SYSTEMS_MUST_SHARE_SHAPE_MSG)
+            self.augmented.append([[float(x) for x in p.normal_vector.coordinates] + [float(p.constant_term)]
+                                   for p in system.planes])
+
+        self.pivot_columns = None
+
+    def __len__(self):
+        return len(self.augmented)
+
+    # gauss-jordan elimination with partial pivoting on each system's float rows
+    def compute_rref(self):
+        num_systems = len(self.augmented)
+        num_equations = self.num_equations
+        width = self.num_variables + 1
+        tolerance = self.tolerance
+
+        next_row = [0] * num_systems
+        self.pivot_columns = [[] for _ in range(num_systems)]
+
+        for col in range(self.num_variables):
+            for s in range(num_systems):
+                rows = self.augmented[s]
+                r = next_row[s]
+                if r >= num_equations:
+                    continue
+
+                best = max(range(r, num_equations), key=lambda i: abs(rows[i][col]))
+                if abs(rows[best][col]) < tolerance:
+                    continue
+                if best != r:
+                    rows[r], rows[best] = rows[best], rows[r]
+
+                pivot_row = rows[r]
+                beta = 1.0 / pivot_row[col]
+                for c in range(col, width):
+                    pivot_row[c] *= beta
+                pivot_row[col] = 1.0
+
+                for i in range(num_equations):
+                    if i == r:
+                        continue
+                    row = rows[i]
+                    alpha = row[col]
+                    if alpha == 0.0:
+                        continue
+                    for c in range(col, width):
+                        row[c] -= alpha * pivot_row[c]
+                    row[col] = 0.0
+
+                self.pivot_columns[s].append(col)
+                next_row[s] = r + 1
+
+    # returns one classification per system: UNIQUE_SOLUTION, NO_SOLUTIONS or INF_SOLUTIONS
+    def classify(self):
+        if self.pivot_columns is None:
+            self.compute_rref()
+
+        classifications = []
+        for rows, pivots in zip(self.augmented, self.pivot_columns):
+            rank = len(pivots)
+            if any(abs(rows[i][-1]) >= self.tolerance for i in range(rank, self.num_equations)):
+                classifications.append(self.NO_SOLUTIONS)
+            elif rank < self.num_variables:
+                classifications.append(self.INF_SOLUTIONS)
+            else:
+                classifications.append(self.UNIQUE_SOLUTION)
+        return classifications
+
+    # returns (classifications, solutions).  solutions[s] is a Parametrization for consistent systems
+    # (no direction vectors when the solution is unique), and None when there are no solutions,
+    # mirroring what compute_solution returns for each system
+    def solve(self):
+        classifications = self.classify()
+        num_variables = self.num_variables
+        solutions = []
+
+        for rows, pivots, classification in zip(self.augmented, self.pivot_columns, classifications):
+            if classification == self.NO_SOLUTIONS:
+                solutions.append(None)
+                continue
+
+            basepoint_coords = [0.0] * num_variables
+            for i, pivot_var in enumerate(pivots):
+                basepoint_coords[pivot_var] = rows[i][-1]
+
+            direction_vectors = []
+            pivot_set = set(pivots)
+            for free_var in range(num_variables):
+                if free_var in pivot_set:
+                    continue
+                vector_coords = [0.0] * num_variables
+                vector_coords[free_var] = 1.0
+                for i, pivot_var in enumerate(pivots):
+                    vector_coords[pivot_var] = -rows[i][free_var]
+                direction_vectors.append(Vector(vector_coords))
+
+            solutions.append(Parametrization(Vector(basepoint_coords), direction_vectors))
+
+        return classifications, solutions
+
+# solve many same-shaped systems in floats (see SameShapeBatch)
+def solve_same_shape(systems, tolerance=1e-10):
+    return SameShapeBatch(systems, tolerance).solve()
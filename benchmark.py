@@ -0,0 +1,494 @@
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import timeit
+from time import perf_counter
+from decimal import getcontext
+
+from vector import Vector
+from line import Line
+from plane import Plane
+from hyperplane import Hyperplane
+from linsys import LinearSystem, SolveStats, MyDecimal
+from solver import Solver
+from batch import SameShapeBatch
+from matrix import matrix_multiplication, transpose
+from simplex import LinearProgram
+from canonical import deduplicate
+from iterative import SparseSystem
+from distributed import LocalCluster, DistributedSolver
+from sparse import CSRMatrix
+import eigen
+
+getcontext().prec = 30
+
+# usage:
+#   python benchmark.py                          run everything up to --max-size unknowns and compare against
+#                                                benchmark_baseline.json, failing (exit code 1) on anything
+#                                                slower than --threshold x baseline
+#   python benchmark.py --save bench.json        record a baseline
+#   python benchmark.py --compare bench.json     compare against another baseline instead
+#   python benchmark.py --no-compare             just print the timings
+#   python benchmark.py --filter linsys --max-size 1000
+#
+# benchmark_baseline.json holds the default sizes (--max-size 100) timed on a single core machine.  timings
+# only compare on the same machine: regenerate it there with
+#   python benchmark.py --no-compare --save benchmark_baseline.json
+# and commit it alongside changes that are meant to move the numbers.  on a shared or busy machine the
+# microsecond benchmarks jitter by more than the default --threshold; raise it there rather than rerun
+
+SEED = 2016
+SOLVE_SIZES = (2, 3, 10, 50, 100, 250, 500, 1000)
+MATRIX_SIZES = (2, 10, 50, 100)
+DENSITIES = ('dense', 'sparse')
+SPARSE_SIZES = (50, 100, 500, 2000)
+FILL_FRACTIONS = ('1%', '5%', '20%')
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+BENCHMARKS = []
+
+class Benchmark(object):
+    def __init__(self, name, setup, size=None, variant=None):
+        self.name = name
+        self.setup = setup
+        self.size = size
+        self.variant = variant
+
+    def full_name(self):
+        params = []
+        if self.size is not None:
+            params.append('n={}'.format(self.size))
+        if self.variant is not None:
+            params.append(self.variant)
+        if not params:
+            return self.name
+        return '{}[{}]'.format(self.name, ','.join(params))
+
+    # build the inputs (untimed) and return the zero argument callable that gets timed
+    def prepare(self):
+        args = [x for x in (self.size, self.variant) if x is not None]
+        return self.setup(random.Random(SEED), *args)
+
+# decorator registering a setup function once per size/variant combination
+def benchmark(name, sizes=(None,), variants=(None,)):
+    def register(setup):
+        for size in sizes:
+            for variant in variants:
+                BENCHMARKS.append(Benchmark(name, setup, size, variant))
+        return setup
+    return register
+
+## input generators
+
+def random_coordinates(rng, n, density='dense'):
+    if density == 'sparse':
+        coords = ['0'] * n
+        for i in rng.sample(range(n), min(n, 3)):
+            coords[i] = str(rng.randint(-9, 9) or 1)
+        return coords
+    return ['{:.3f}'.format(rng.uniform(-10, 10)) for _ in range(n)]
+
+# square system in n unknowns.  sparse systems keep a nonzero diagonal so they stay solvable
+def random_system(rng, n, density='dense'):
+    rows = []
+    for i in range(n):
+        coords = random_coordinates(rng, n, density)
+        if density == 'sparse':
+            coords[i] = str(rng.randint(1, 9))
+        rows.append(coords + [str(rng.randint(-9, 9))])
+    return LinearSystem.from_augmented_rows(rows)
+
+def random_matrix(rng, n, density='dense'):
+    if density == 'sparse':
+        return [[rng.randint(-9, 9) if rng.random() < 0.1 else 0 for _ in range(n)] for _ in range(n)]
+    return [[rng.uniform(-10, 10) for _ in range(n)] for _ in range(n)]
+
+## benchmarks
+
+@benchmark('vector.dot')
+def bench_vector_dot(rng):
+    v = Vector(random_coordinates(rng, 3))
+    w = Vector(random_coordinates(rng, 3))
+    return lambda: Vector.dot(v, w)
+
+@benchmark('vector.cross')
+def bench_vector_cross(rng):
+    v = Vector(random_coordinates(rng, 3))
+    w = Vector(random_coordinates(rng, 3))
+    return lambda: Vector.cross(v, w)
+
+@benchmark('vector.angle_degrees')
+def bench_vector_angle_degrees(rng):
+    v = Vector(random_coordinates(rng, 3))
+    w = Vector(random_coordinates(rng, 3))
+    return lambda: Vector.angle_degrees(v, w)
+
+@benchmark('line.intersection')
+def bench_line_intersection(rng):
+    first = Line([rng.uniform(1, 10), rng.uniform(1, 10)], rng.uniform(1, 10))
+    second = Line([rng.uniform(1, 10), rng.uniform(1, 10)], rng.uniform(1, 10))
+    return lambda: Line.intersection(first, second)
+
+@benchmark('line.coincident')
+def bench_line_coincident(rng):
+    a, b, k = rng.uniform(1, 10), rng.uniform(1, 10), rng.uniform(1, 10)
+    first = Line([a, b], k)
+    second = Line([2 * a, 2 * b], 2 * k)
+    return lambda: Line.coincident(first, second)
+
+@benchmark('plane.parallel')
+def bench_plane_parallel(rng):
+    first = Plane(normal_vector=Vector(random_coordinates(rng, 3)), constant_term='1')
+    second = Plane(normal_vector=Vector(random_coordinates(rng, 3)), constant_term='2')
+    return lambda: Plane.parallel(first, second)
+
+@benchmark('plane.coincident')
+def bench_plane_coincident(rng):
+    coords = random_coordinates(rng, 3)
+    first = Plane(normal_vector=Vector(coords), constant_term='1')
+    second = Plane(normal_vector=Vector(coords).times_scalar(2), constant_term='2')
+    return lambda: Plane.coincident(first, second)
+
+# n planes, a third of them rescaled copies of others
+@benchmark('plane.deduplicate', sizes=(100, 1000))
+def bench_plane_deduplicate(rng, n):
+    planes = [Plane(normal_vector=Vector(random_coordinates(rng, 3)), constant_term=str(rng.randint(-9, 9)))
+              for _ in range(n - n // 3)]
+    planes += [Plane(normal_vector=p.normal_vector.times_scalar(-2), constant_term=p.constant_term * -2)
+               for p in rng.sample(planes, n // 3)]
+    return lambda: deduplicate(planes)
+
+# the same planes through a set: hashing on the canonical form.  fresh copies each run, so the canonical
+# forms cached on the planes don't hide the cost
+@benchmark('plane.set', sizes=(100, 1000))
+def bench_plane_set(rng, n):
+    planes = [Plane(normal_vector=Vector(random_coordinates(rng, 3)), constant_term=str(rng.randint(-9, 9)))
+              for _ in range(n - n // 3)]
+    planes += [Plane(normal_vector=p.normal_vector.times_scalar(-2), constant_term=p.constant_term * -2)
+               for p in rng.sample(planes, n // 3)]
+    return lambda: set([Plane(p.normal_vector, p.constant_term) for p in planes])
+
+@benchmark('matrix.matrix_multiplication', sizes=MATRIX_SIZES, variants=DENSITIES)
+def bench_matrix_multiplication(rng, n, density):
+    a = random_matrix(rng, n, density)
+    b = random_matrix(rng, n, density)
+    return lambda: matrix_multiplication(a, b)
+
+@benchmark('matrix.transpose', sizes=MATRIX_SIZES, variants=DENSITIES)
+def bench_matrix_transpose(rng, n, density):
+    a = random_matrix(rng, n, density)
+    return lambda: transpose(a)
+
+# n x n floats with about fraction (e.g. '5%') of the entries nonzero, in csr form
+def random_csr(rng, n, fraction):
+    p = float(fraction.rstrip('%')) / 100
+    return CSRMatrix.from_lines([dict((j, rng.uniform(-10, 10)) for j in range(n) if rng.random() < p)
+                                 for _ in range(n)], n)
+
+@benchmark('sparse.csr.multiply_vector', sizes=SPARSE_SIZES, variants=FILL_FRACTIONS)
+def bench_csr_multiply_vector(rng, n, fraction):
+    a = random_csr(rng, n, fraction)
+    x = [rng.uniform(-10, 10) for _ in range(n)]
+    return lambda: a.multiply_vector(x)
+
+@benchmark('sparse.csc.multiply_vector', sizes=SPARSE_SIZES, variants=FILL_FRACTIONS)
+def bench_csc_multiply_vector(rng, n, fraction):
+    a = random_csr(rng, n, fraction).to_csc()
+    x = [rng.uniform(-10, 10) for _ in range(n)]
+    return lambda: a.multiply_vector(x)
+
+# same inputs as matrix.matrix_multiplication at MATRIX_SIZES, for a direct comparison
+@benchmark('sparse.csr.multiply_matrix', sizes=MATRIX_SIZES + (500,), variants=FILL_FRACTIONS)
+def bench_csr_multiply_matrix(rng, n, fraction):
+    a = random_csr(rng, n, fraction)
+    b = random_csr(rng, n, fraction)
+    return lambda: a.multiply_matrix(b)
+
+@benchmark('sparse.csr.to_csc', sizes=SPARSE_SIZES, variants=FILL_FRACTIONS)
+def bench_csr_to_csc(rng, n, fraction):
+    a = random_csr(rng, n, fraction)
+    return a.to_csc
+
+@benchmark('linsys.compute_solution', sizes=SOLVE_SIZES, variants=DENSITIES)
+def bench_compute_solution(rng, n, density):
+    system = random_system(rng, n, density)
+    return system.compute_solution
+
+# float64 lu plus Decimal residual refinement, against linsys.compute_solution on the same systems
+@benchmark('linsys.solve_refined', sizes=SOLVE_SIZES)
+def bench_solve_refined(rng, n):
+    system = random_system(rng, n)
+    return system.solve_refined
+
+@benchmark('linsys.estimate_condition_number', sizes=(10, 50, 100))
+def bench_estimate_condition_number(rng, n):
+    return random_system(rng, n).estimate_condition_number
+
+# small dense systems, the service workload: a fresh working copy per solve against a shared Solver
+@benchmark('solver.compute_solution', sizes=(3, 10), variants=('linsys', 'workspace'))
+def bench_solver_compute_solution(rng, n, variant):
+    system = random_system(rng, n)
+    if variant == 'linsys':
+        return system.compute_solution
+    solver = Solver(n)
+    return lambda: solver.compute_solution(system)
+
+# 500 same-shaped systems through one SameShapeBatch ('batched') or LinearSystem.compute_solution each
+@benchmark('batch.same_shape', sizes=(3, 10), variants=('batched', 'linsys'))
+def bench_same_shape_batch(rng, n, variant):
+    systems = [random_system(rng, n) for _ in range(500)]
+    if variant == 'batched':
+        return lambda: SameShapeBatch(systems).solve()
+    return lambda: [system.compute_solution() for system in systems]
+
+# 500 variable system already in rref, with every 10th variable free.  'cached' extracts the
+# parametrization using the pivot structure recorded once; 'rescan' drops it before every consumer,
+# which is what each of them used to do
+@benchmark('linsys.extract_parametrization', sizes=(500,), variants=('cached', 'rescan'))
+def bench_extract_parametrization(rng, n, variant):
+    pivot_columns = [j for j in range(n) if j % 10 != 9]
+    rows = []
+    for i, j in enumerate(pivot_columns):
+        coords = ['0'] * n
+        coords[j] = '1'
+        for free in range(9, n, 10):
+            if free > j:
+                coords[free] = str(rng.randint(-9, 9))
+        rows.append(coords + [str(rng.randint(-9, 9))])
+    rows += [['0'] * (n + 1) for _ in range(n - len(pivot_columns))]
+    system = LinearSystem.from_augmented_rows(rows)
+    system.get_echelon_form()
+
+    def extract():
+        for step in (system.raise_exception_if_contradictory_equation,
+                     system.extract_direction_vectors_for_parametrization,
+                     system.extract_basepoint_for_parametrization):
+            if variant == 'rescan':
+                system.echelon = None
+            step()
+    return extract
+
+# n x n system of rank 3: elimination leaves n-3 all zero rows, the case where zero rows dominate
+def degenerate_system(rng, n):
+    basis = [[rng.randint(-9, 9) for _ in range(n + 1)] for _ in range(3)]
+    rows = []
+    for _ in range(n):
+        a, b, c = rng.randint(-3, 3), rng.randint(-3, 3), rng.randint(-3, 3)
+        rows.append([str(a * x + b * y + c * z) for x, y, z in zip(*basis)])
+    return LinearSystem.from_augmented_rows(rows)
+
+@benchmark('linsys.solve_degenerate', sizes=(10, 50))
+def bench_solve_degenerate(rng, n):
+    return degenerate_system(rng, n).solve
+
+# pivot scan of a reduced degenerate system: sentinel returns vs the old loop, which wrapped every
+# coefficient in a MyDecimal and raised (and matched the message of) an exception for each zero row
+@benchmark('linsys.pivot_scan_degenerate', sizes=(50,), variants=('sentinel', 'exceptions'))
+def bench_pivot_scan_degenerate(rng, n, variant):
+    rref = degenerate_system(rng, n).compute_rref()
+    if variant == 'sentinel':
+        return rref.scan_for_pivot_indices
+
+    def first_nonzero_index(p):
+        for k, item in enumerate(p.normal_vector.coordinates):
+            if not MyDecimal(item).is_near_zero():
+                return k
+        raise Exception(p.NO_NONZERO_ELTS_FOUND_MSG)
+
+    def scan_with_exceptions():
+        indices = [-1] * len(rref)
+        for i, p in enumerate(rref.planes):
+            try:
+                indices[i] = first_nonzero_index(p)
+            except Exception as e:
+                if str(e) != p.NO_NONZERO_ELTS_FOUND_MSG:
+                    raise e
+        return indices
+    return scan_with_exceptions
+
+# tridiagonal n x n system solved through structure detection (thomas algorithm) or by forcing the
+# general elimination path
+@benchmark('linsys.solve_tridiagonal', sizes=(10, 100, 500), variants=('structured', 'elimination'))
+def bench_solve_tridiagonal(rng, n, variant):
+    rows = []
+    for i in range(n):
+        coords = ['0'] * n
+        for j in range(max(0, i - 1), min(n, i + 2)):
+            coords[j] = str(rng.randint(1, 9))
+        coords[i] = str(rng.randint(20, 30))
+        rows.append(coords + [str(rng.randint(-9, 9))])
+    system = LinearSystem.from_augmented_rows(rows)
+    system.use_structure = variant == 'structured'
+    return system.solve
+
+# max sum(x) over n nonnegative variables and n sparse packing constraints, plus sum(x) <= n so it
+# stays bounded.  the variant picks the simplex backend
+@benchmark('simplex.solve', sizes=(10, 50), variants=('dense', 'sparse'))
+def bench_simplex_solve(rng, n, backend):
+    inequalities = []
+    for _ in range(n):
+        coords = [x.lstrip('-') for x in random_coordinates(rng, n, 'sparse')]
+        inequalities.append(Hyperplane(normal_vector=Vector(coords), constant_term=rng.randint(1, 20)))
+    inequalities.append(Hyperplane(normal_vector=Vector(['1'] * n), constant_term=n))
+    program = LinearProgram(['1'] * n, inequalities, nonnegative=True, maximize=True)
+    return lambda: program.solve(backend)
+
+@benchmark('eigen.eigenvalues', sizes=(10, 50))
+def bench_eigenvalues(rng, n):
+    a = random_matrix(rng, n)
+    return lambda: eigen.eigenvalues(a)
+
+@benchmark('eigen.svd', sizes=(10, 50))
+def bench_svd(rng, n):
+    a = random_matrix(rng, n)
+    return lambda: eigen.svd(a)
+
+# top 3 eigenpairs of the sparse 1d laplacian, whose largest eigenvalues are tightly clustered
+@benchmark('eigen.top_eigenpairs', sizes=(100,), variants=('lanczos', 'power'))
+def bench_top_eigenpairs(rng, n, method):
+    rows = [[(j, a) for j, a in ((i - 1, -1), (i, 2), (i + 1, -1)) if 0 <= j < n] for i in range(n)]
+    laplacian = SparseSystem(rows, [0] * n, n)
+    return lambda: eigen.top_eigenpairs(laplacian, 3, method, tolerance=1e-6, max_iterations=20000)
+
+## runner
+
+# seconds per call: the best of `repeat` timing runs.  calls slower than a second are only run once
+def time_callable(fn, repeat=5):
+    timer = timeit.Timer(fn)
+    number, total = timer.autorange()
+    best = total / number
+    if best < 1.0:
+        best = min([best] + [t / number for t in timer.repeat(repeat=repeat - 1, number=number)])
+    return best
+
+def run(benchmarks, repeat=5, out=sys.stdout):
+    results = {}
+    for b in benchmarks:
+        seconds = time_callable(b.prepare(), repeat)
+        results[b.full_name()] = seconds
+        out.write('{:<55} {:>14.3f} us\n'.format(b.full_name(), seconds * 1e6))
+        out.flush()
+    return results
+
+# names whose time grew past threshold x the baseline, with the ratio
+def regressions(results, baseline, threshold):
+    slower = []
+    for name, seconds in sorted(results.items()):
+        if name in baseline and baseline[name] > 0 and seconds / baseline[name] > threshold:
+            slower.append((name, seconds / baseline[name]))
+    return slower
+
+def select(filter_text=None, max_size=100):
+    return [b for b in BENCHMARKS
+            if (filter_text is None or filter_text in b.full_name())
+            and (b.size is None or b.size <= max_size)]
+
+# allocation and gc churn of many small solves, per solve path: rows and vectors built (SolveStats), gc
+# collections and the time spent in them
+def allocation_profile(n=3, solves=20000, out=sys.stdout):
+    rng = random.Random(SEED)
+    systems = [random_system(rng, n) for _ in range(100)]
+    solver = Solver(n)
+    paths = (('linsys', lambda system: system.compute_solution()), ('workspace', solver.compute_solution))
+
+    pauses = []
+    def gc_callback(phase, info):
+        if phase == 'start':
+            pauses.append(-perf_counter())
+        else:
+            pauses[-1] += perf_counter()
+
+    out.write('{} solves of {}x{} systems\n'.format(solves, n, n))
+    for name, solve in paths:
+        stats = SolveStats()
+        for system in systems:
+            system.enable_stats(stats)
+        del pauses[:]
+        gc.collect()
+        gc.callbacks.append(gc_callback)
+        start = perf_counter()
+        try:
+            for i in range(solves):
+                solve(systems[i % len(systems)])
+        finally:
+            elapsed = perf_counter() - start
+            gc.callbacks.remove(gc_callback)
+
+        per_solve = lambda key: stats.counts.get(key, 0) / float(solves)
+        out.write('{:<10} rows built/solve {:>7.1f}  vectors built/solve {:>7.1f}  deepcopies/solve {:>4.1f}  '
+                  'gc collections {:>5}  gc pause {:>8.3f} ms  total {:>8.3f} s\n'.format(
+                      name, per_solve('row_allocations'), per_solve('vector_allocations'), per_solve('deepcopy'),
+                      len(pauses), sum(pauses) * 1e3, elapsed))
+
+# wall time of DistributedSolver on local clusters of increasing size, with the speedup over one worker.
+# everything shares one machine, so this measures the tile and message overhead as much as the parallelism
+def scaling_profile(sizes=(200, 400), worker_counts=(1, 2, 4), tile_size=32, repeat=3, out=sys.stdout):
+    rng = random.Random(SEED)
+    for n in sizes:
+        system = random_system(rng, n)
+        single = None
+        for num_workers in worker_counts:
+            with LocalCluster(num_workers) as cluster:
+                with DistributedSolver(cluster.addresses, tile_size=tile_size) as solver:
+                    seconds = []
+                    for _ in range(repeat):
+                        start = perf_counter()
+                        solver.compute_solution(system)
+                        seconds.append(perf_counter() - start)
+                    best = min(seconds)
+                    grid = solver.grid
+            if single is None:
+                single = best
+            out.write('n={:<6} workers={:<3} grid={}x{:<3} {:>10.3f} s  speedup {:>5.2f}x\n'.format(
+                n, num_workers, grid[0], grid[1], best, single / best))
+            out.flush()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks for the vector/line/plane/matrix/linsys hot paths')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this text')
+    parser.add_argument('--max-size', type=int, default=100, help='skip sizes above this many unknowns')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='PATH', help='write the results as a json baseline')
+    parser.add_argument('--compare', metavar='PATH', default=BASELINE_PATH,
+                        help='compare against a json baseline (default: the committed benchmark_baseline.json)')
+    parser.add_argument('--no-compare', dest='compare', action='store_const', const=None,
+                        help='skip the baseline comparison')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown ratio against the baseline that counts as a regression')
+    parser.add_argument('--allocations', action='store_true',
+                        help='profile allocations and gc pauses of LinearSystem against Solver instead')
+    parser.add_argument('--scaling', action='store_true',
+                        help='time the distributed solver against 1, 2 and 4 local workers instead')
+    args = parser.parse_args(argv)
+
+    if args.allocations:
+        allocation_profile()
+        return 0
+
+    if args.scaling:
+        scaling_profile()
+        return 0
+
+    results = run(select(args.filter, args.max_size), args.repeat)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    # the committed baseline may be absent (e.g. a trimmed checkout); an explicit --compare path may not
+    if args.compare and (args.compare != BASELINE_PATH or os.path.exists(args.compare)):
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        slower = regressions(results, baseline, args.threshold)
+        for name, ratio in slower:
+            print('REGRESSION {}: {:.2f}x baseline'.format(name, ratio))
+        if slower:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
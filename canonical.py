@@ -0,0 +1,79 @@
+from decimal import Decimal, getcontext
+
+from predicates import coordinates_of
+
+getcontext().prec = 30
+
+# canonical forms of line/plane/hyperplane equations a.x = k, equal for equations describing the same set:
+# the equation is scaled so the normal vector has unit length and its first nonzero coefficient is
+# positive, then every coefficient and the constant term is quantized to a multiple of tolerance.  this
+# lets coincident objects be found by hashing in place of pairwise comparison.  like any quantization, two
+# equations that agree to within tolerance can still straddle a rounding boundary and get different keys
+
+DEFAULT_TOLERANCE = Decimal('1e-10')
+
+def as_decimal(x):
+    if isinstance(x, float):
+        return Decimal(repr(x))
+    return Decimal(x)
+
+# tuple of ints: the quantized unit normal followed by the quantized constant.  a zero normal vector
+# gives all zeros with a last entry of 0 (0 = 0, every point) or 1 (0 = nonzero, no points)
+def canonical_form(hyperplane, tolerance=DEFAULT_TOLERANCE):
+    tolerance = Decimal(tolerance)
+    coefficients = [as_decimal(x) for x in coordinates_of(hyperplane.normal_vector)]
+    constant_term = as_decimal(hyperplane.constant_term)
+
+    magnitude = sum((x * x for x in coefficients), Decimal(0)).sqrt()
+    if magnitude < tolerance:
+        return (0,) * len(coefficients) + (0 if abs(constant_term) < tolerance else 1,)
+
+    scale = 1 / magnitude
+    for x in coefficients:
+        if abs(x * scale) >= tolerance:
+            if x < 0:
+                scale = -scale
+            break
+
+    return tuple(int((x * scale / tolerance).to_integral_value()) for x in coefficients + [constant_term])
+
+# the part of a canonical form shared by parallel objects: the normal vector.  equations with a zero
+# normal vector (0 = 0 and 0 = k) aren't parallel to anything, so they keep their whole form
+def direction_key(key):
+    if not any(key[:-1]):
+        return key
+    return key[:-1]
+
+# the normal vector part of the canonical form: equal for parallel objects
+def direction_form(hyperplane, tolerance=DEFAULT_TOLERANCE):
+    return direction_key(canonical_form(hyperplane, tolerance))
+
+class Deduplication(object):
+    def __init__(self):
+        self.unique = []                # first object of each coincident group, in input order
+        self.coincident_groups = []     # lists of objects with the same canonical form
+        self.parallel_groups = []       # lists of coincident groups whose (nonzero) normals agree
+
+# one pass over the objects with two dictionaries, so linear in their number (against the quadratic
+# number of pairwise coincident/parallel tests).  groups keep the input order
+def deduplicate(objects, tolerance=DEFAULT_TOLERANCE):
+    result = Deduplication()
+    coincident = {}
+    parallel = {}
+    for obj in objects:
+        key = canonical_form(obj, tolerance)
+
+        group = coincident.get(key)
+        if group is None:
+            group = coincident[key] = []
+            result.unique.append(obj)
+            result.coincident_groups.append(group)
+
+            family_key = direction_key(key)
+            family = parallel.get(family_key)
+            if family is None:
+                family = parallel[family_key] = []
+                result.parallel_groups.append(family)
+            family.append(group)
+        group.append(obj)
+    return result
@@ -0,0 +1,78 @@
+from decimal import getcontext
+
+from refinement import FloatLU, decimal_residual
+
+getcontext().prec = 30
+
+# condition number estimates and error bounds for square systems, from a FloatLU.  the estimates cost a
+# handful of O(n^2) triangular solves on top of the factorization, instead of the O(n^3) of forming the
+# inverse.  all norms are infinity norms (max row sum for matrices, max entry for vectors)
+
+# unit roundoff of a float64: a float solve is accurate to roughly condition number * this
+FLOAT_UNIT_ROUNDOFF = 2.0 ** -53
+
+# hager's method rarely needs more than two or three steps
+MAX_ESTIMATOR_STEPS = 5
+
+def matrix_norm(rows):
+    return max([sum(abs(float(a)) for a in row) for row in rows] + [0.0])
+
+def vector_norm(v):
+    return max([abs(float(x)) for x in v] + [0.0])
+
+def sign(x):
+    return 1.0 if x >= 0 else -1.0
+
+# estimate of ||A^-1||_1 (hager's method with higham's extra test vector): maximizes ||A^-1 x||_1 over
+# the unit ball by moving to the vertex the gradient points at, until the gradient stops pointing away.
+# transpose estimates ||A^-T||_1 = ||A^-1||_inf instead
+def estimate_inverse_norm(lu, transpose=False):
+    n = lu.size
+    if n == 0:
+        return 0.0
+    solve, solve_transpose = lu.solve, lu.solve_transpose
+    if transpose:
+        solve, solve_transpose = solve_transpose, solve
+
+    x = [1.0 / n] * n
+    estimate = 0.0
+    for step in range(MAX_ESTIMATOR_STEPS):
+        y = solve(x)
+        new_estimate = sum(abs(yi) for yi in y)
+        if step > 0 and new_estimate <= estimate:
+            break
+        estimate = new_estimate
+        z = solve_transpose([sign(yi) for yi in y])
+        j = max(range(n), key=lambda i: abs(z[i]))
+        if abs(z[j]) <= sum(zi * xi for zi, xi in zip(z, x)):
+            break
+        x = [0.0] * n
+        x[j] = 1.0
+
+    # alternating vector catching the matrices that fool the gradient steps
+    if n > 1:
+        b = [(-1.0) ** i * (1.0 + i / (n - 1.0)) for i in range(n)]
+        estimate = max(estimate, 2.0 * sum(abs(yi) for yi in solve(b)) / (3.0 * n))
+    return estimate
+
+# estimated ||A||_inf ||A^-1||_inf; infinite for a matrix that is singular in floats
+def condition_number(rows, lu=None):
+    if lu is None:
+        lu = FloatLU(rows)
+    if lu.singular:
+        return float('inf')
+    return matrix_norm(rows) * estimate_inverse_norm(lu, transpose=True)
+
+# normwise backward error of x (the smallest relative change to A and b that makes x exact) from its
+# Decimal residual, and the first order forward error bound it implies: relative error in x (infinity
+# norm) at most 2 * condition * backward / (1 - condition * backward).  returns
+# (condition, backward error, forward error bound)
+def error_bounds(rows, b, x, lu=None):
+    condition = condition_number(rows, lu)
+    residual = decimal_residual(rows, b, x)
+    scale = matrix_norm(rows) * vector_norm(x) + vector_norm(b)
+    backward = vector_norm(residual) / scale if scale > 0 else 0.0
+
+    growth = condition * backward
+    forward = 2.0 * growth / (1.0 - growth) if growth < 1.0 else float('inf')
+    return condition, backward, forward
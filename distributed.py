@@ -0,0 +1,468 @@
+import json
+import multiprocessing
+import socket
+import struct
+import traceback
+from array import array
+from decimal import getcontext
+
+from vector import Vector
+from linsys import LinearSystem, Parametrization
+
+getcontext().prec = 30
+
+# distributed elimination of large dense systems.  the augmented matrix is cut into tile_size x tile_size
+# tiles dealt out 2d block cyclically: with workers arranged in a grid_rows x grid_columns process grid,
+# tile (I, J) lives on the worker at grid position (I mod grid_rows, J mod grid_columns).  a coordinator
+# (DistributedSolver) drives right looking, panel blocked elimination with partial pivoting:
+#   - gather the active rows of one panel of tile_size columns and factor it locally, which picks the
+#     pivot rows and the multipliers of every other active row
+#   - gather the pivot rows right of the panel and finish them against each other (the U12 block)
+#   - send each worker the multipliers of its rows and the U12 block; all workers update their trailing
+#     tiles at the same time
+# rows never move: pivoting is logical, so no tiles are exchanged for row swaps.  the pivot rows collected
+# on the coordinator form the echelon form the solution is read from by back substitution.  floats
+# throughout, like OutOfCoreSystem
+#
+# workers are plain TCP servers (run_worker); LocalCluster starts some on this machine for testing.
+# messages are a json header plus a flat float64 payload in native byte order, so workers and coordinator
+# must share a float format
+
+FRAME = struct.Struct('<II')    # header bytes, payload values
+
+CONNECTION_CLOSED_MSG = 'The connection was closed'
+
+def send_message(sock, header, values=()):
+    header_bytes = json.dumps(header).encode('utf-8')
+    payload = array('d', values)
+    sock.sendall(FRAME.pack(len(header_bytes), len(payload)) + header_bytes + payload.tobytes())
+
+def receive_exactly(sock, size):
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError(CONNECTION_CLOSED_MSG)
+        received += count
+    return buf
+
+def receive_message(sock):
+    header_size, num_values = FRAME.unpack(bytes(receive_exactly(sock, FRAME.size)))
+    header = json.loads(bytes(receive_exactly(sock, header_size)).decode('utf-8'))
+    values = array('d')
+    if num_values:
+        values.frombytes(bytes(receive_exactly(sock, 8 * num_values)))
+    return header, values
+
+# which worker owns which tile
+class BlockCyclicLayout(object):
+    def __init__(self, num_rows, num_columns, tile_size, grid_rows, grid_columns):
+        self.num_rows = num_rows
+        self.num_columns = num_columns
+        self.tile_size = tile_size
+        self.grid_rows = grid_rows
+        self.grid_columns = grid_columns
+        self.row_blocks = (num_rows + tile_size - 1) // tile_size
+        self.column_blocks = (num_columns + tile_size - 1) // tile_size
+
+    def owner(self, row_block, column_block):
+        return (row_block % self.grid_rows) * self.grid_columns + column_block % self.grid_columns
+
+    def grid_row(self, worker):
+        return worker // self.grid_columns
+
+    def tiles_of(self, worker):
+        return [(I, J) for I in range(self.row_blocks) for J in range(self.column_blocks)
+                if self.owner(I, J) == worker]
+
+    def tile_shape(self, row_block, column_block):
+        b = self.tile_size
+        return (min(b, self.num_rows - row_block * b), min(b, self.num_columns - column_block * b))
+
+## worker side
+
+# the tiles one worker holds, and the operations the coordinator asks of it
+class TileStore(object):
+
+    UNKNOWN_OPERATION_MSG = 'Unknown worker operation'
+
+    def __init__(self):
+        self.tiles = {}
+        self.tile_size = None
+        self.num_columns = None
+        self.column_blocks_of_row_block = {}
+
+    def handle(self, header, values):
+        op = header['op']
+        if op == 'ping':
+            return {'ok': True}, ()
+        if op == 'load':
+            return self.load(header, values)
+        if op == 'gather':
+            return self.gather(header)
+        if op == 'update':
+            return self.update(header, values)
+        raise Exception(self.UNKNOWN_OPERATION_MSG)
+
+    def load(self, header, values):
+        self.tile_size = header['tile_size']
+        self.num_columns = header['num_columns']
+        self.tiles = {}
+        self.column_blocks_of_row_block = {}
+        offset = 0
+        for row_block, column_block, rows, columns in header['tiles']:
+            self.tiles[(row_block, column_block)] = [values[offset + k * columns:offset + (k + 1) * columns].tolist()
+                                                     for k in range(rows)]
+            offset += rows * columns
+            self.column_blocks_of_row_block.setdefault(row_block, []).append(column_block)
+        return {'ok': True}, ()
+
+    # pieces: [row, start, stop] column ranges, each inside one tile held here
+    def gather(self, header):
+        b = self.tile_size
+        out = []
+        for row, start, stop in header['pieces']:
+            column_block = start // b
+            local_start = start - column_block * b
+            out.extend(self.tiles[(row // b, column_block)][row % b][local_start:local_start + stop - start])
+        return {'ok': True}, out
+
+    # row i -= sum_t multipliers[i][t] * u[t] over the columns from column_start on, for the listed rows
+    # in every tile held here.  values: the multipliers row by row, then the u rows
+    def update(self, header, values):
+        b = self.tile_size
+        rows = header['rows']
+        steps = header['steps']
+        column_start = header['column_start']
+        width = self.num_columns - column_start
+        split = len(rows) * steps
+        u_rows = [values[split + t * width:split + (t + 1) * width].tolist() for t in range(steps)]
+
+        for index, row in enumerate(rows):
+            terms = [(m, u_rows[t]) for t, m in enumerate(values[index * steps:(index + 1) * steps]) if m != 0.0]
+            if not terms:
+                continue
+            row_block = row // b
+            for column_block in self.column_blocks_of_row_block.get(row_block, ()):
+                tile_start = column_block * b
+                target = self.tiles[(row_block, column_block)][row % b]
+                if tile_start + len(target) <= column_start:
+                    continue
+                first = max(tile_start, column_start) - tile_start
+                offset = tile_start + first - column_start
+                segment = target[first:]
+                for m, u in terms:
+                    segment = [x - m * y for x, y in zip(segment, u[offset:offset + len(segment)])]
+                target[first:] = segment
+        return {'ok': True}, ()
+
+# serve coordinators one connection at a time until one sends 'shutdown'.  errors inside an operation are
+# reported back to the coordinator with their traceback instead of killing the worker
+def serve(listener):
+    store = TileStore()
+    while True:
+        connection, _ = listener.accept()
+        with connection:
+            while True:
+                try:
+                    header, values = receive_message(connection)
+                except (ConnectionError, OSError):
+                    break
+                if header.get('op') == 'shutdown':
+                    send_message(connection, {'ok': True})
+                    return
+                try:
+                    reply, payload = store.handle(header, values)
+                except Exception:
+                    reply, payload = {'error': traceback.format_exc()}, ()
+                send_message(connection, reply, payload)
+
+# worker process entry point.  port 0 picks a free port; ready (a queue) receives the bound address
+def run_worker(host='127.0.0.1', port=0, ready=None):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(1)
+    if ready is not None:
+        ready.put(listener.getsockname())
+    try:
+        serve(listener)
+    finally:
+        listener.close()
+
+# num_workers worker processes on this machine, for tests and benchmarks
+class LocalCluster(object):
+    def __init__(self, num_workers, host='127.0.0.1', startup_timeout=30):
+        ready = multiprocessing.Queue()
+        self.processes = [multiprocessing.Process(target=run_worker, args=(host, 0, ready), daemon=True)
+                          for _ in range(num_workers)]
+        for process in self.processes:
+            process.start()
+        self.addresses = [tuple(ready.get(timeout=startup_timeout)) for _ in self.processes]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        for address in self.addresses:
+            try:
+                with socket.create_connection(address, timeout=5) as sock:
+                    send_message(sock, {'op': 'shutdown'})
+                    receive_message(sock)
+            except (ConnectionError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+## coordinator side
+
+class WorkerFailure(object):
+    def __init__(self, worker, address, detail):
+        self.worker = worker        # index in the solver's address list
+        self.address = address
+        self.detail = detail        # the worker's traceback, or the connection error
+
+    def __str__(self):
+        return 'worker {} at {}:{}: {}'.format(self.worker, self.address[0], self.address[1], self.detail)
+
+class DistributedSolver(object):
+
+    NO_WORKERS_MSG = 'At least one worker address is needed'
+    GRID_MISMATCH_MSG = 'The process grid must have exactly one cell per worker'
+    WORKER_FAILED_MSG = 'A worker failed; see the solver\'s failures for details'
+
+    # addresses: (host, port) of each worker.  grid: (rows, columns) of the process grid, as square as
+    # possible by default.  tolerance: pivots below this count as zero
+    def __init__(self, addresses, grid=None, tile_size=32, tolerance=1e-10, timeout=60.0):
+        if not addresses:
+            raise Exception(self.NO_WORKERS_MSG)
+        self.addresses = [tuple(a) for a in addresses]
+        if grid is None:
+            grid_rows = int(len(self.addresses) ** 0.5)
+            while len(self.addresses) % grid_rows:
+                grid_rows -= 1
+            grid = (grid_rows, len(self.addresses) // grid_rows)
+        if grid[0] * grid[1] != len(self.addresses):
+            raise Exception(self.GRID_MISMATCH_MSG)
+        self.grid = grid
+        self.tile_size = tile_size
+        self.tolerance = tolerance
+        self.timeout = timeout
+        self.connections = None
+        self.failures = []
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def connect(self):
+        if self.connections is None:
+            self.connections = [None] * len(self.addresses)
+            for worker, address in enumerate(self.addresses):
+                try:
+                    self.connections[worker] = socket.create_connection(address, timeout=self.timeout)
+                except OSError as e:
+                    self.fail(worker, repr(e))
+
+    def close(self):
+        if self.connections is not None:
+            for connection in self.connections:
+                if connection is not None:
+                    connection.close()
+            self.connections = None
+
+    def fail(self, worker, detail):
+        self.failures.append(WorkerFailure(worker, self.addresses[worker], detail))
+        self.close()
+        raise Exception(self.WORKER_FAILED_MSG)
+
+    # send every request, then collect every reply, so the workers run in parallel.
+    # requests: {worker: (header, values)}; returns {worker: values}
+    def request_all(self, requests):
+        self.connect()
+        for worker, (header, values) in requests.items():
+            try:
+                send_message(self.connections[worker], header, values)
+            except OSError as e:
+                self.fail(worker, repr(e))
+        replies = {}
+        for worker in requests:
+            try:
+                header, values = receive_message(self.connections[worker])
+            except (ConnectionError, OSError) as e:
+                self.fail(worker, repr(e))
+            if 'error' in header:
+                self.fail(worker, header['error'])
+            replies[worker] = values
+        return replies
+
+    def ping(self):
+        self.request_all(dict((worker, ({'op': 'ping'}, ())) for worker in range(len(self.addresses))))
+
+    def distribute(self, rows):
+        layout = self.layout
+        b = self.tile_size
+        requests = {}
+        for worker in range(len(self.addresses)):
+            tiles = []
+            values = array('d')
+            for I, J in layout.tiles_of(worker):
+                num_rows, num_columns = layout.tile_shape(I, J)
+                tiles.append([I, J, num_rows, num_columns])
+                for row in rows[I * b:I * b + num_rows]:
+                    values.extend(row[J * b:J * b + num_columns])
+            requests[worker] = ({'op': 'load', 'tile_size': b, 'num_columns': layout.num_columns, 'tiles': tiles},
+                                values)
+        self.request_all(requests)
+
+    # {row: [values of columns start..stop-1]} for the given rows, collected from the tiles' owners
+    def gather(self, rows, start, stop):
+        layout = self.layout
+        b = self.tile_size
+        pieces = {}
+        for row in rows:
+            column = start
+            while column < stop:
+                piece_stop = min(stop, (column // b + 1) * b)
+                worker = layout.owner(row // b, column // b)
+                pieces.setdefault(worker, []).append((row, column, piece_stop))
+                column = piece_stop
+
+        replies = self.request_all(dict((worker, ({'op': 'gather', 'pieces': p}, ()))
+                                        for worker, p in pieces.items()))
+        result = dict((row, [0.0] * (stop - start)) for row in rows)
+        for worker, p in pieces.items():
+            values = replies[worker]
+            offset = 0
+            for row, piece_start, piece_stop in p:
+                width = piece_stop - piece_start
+                result[row][piece_start - start:piece_stop - start] = values[offset:offset + width]
+                offset += width
+        return result
+
+    # partial pivoting elimination of one panel (columns start..stop-1) of the active rows.  returns the
+    # steps [(pivot row, pivot column)] and each row's multipliers, one per step (zero for steps after a
+    # row became a pivot row); panel is updated in place
+    def factor_panel(self, panel, active, start, stop):
+        steps = []
+        multipliers = dict((row, []) for row in active)
+        remaining = set(active)
+        for column in range(start, stop):
+            c = column - start
+            pivot = max(remaining, key=lambda row: (abs(panel[row][c]), -row)) if remaining else None
+            if pivot is None or abs(panel[pivot][c]) < self.tolerance:
+                continue
+            remaining.discard(pivot)
+            pivot_values = panel[pivot]
+            for row in active:
+                if row in remaining:
+                    m = panel[row][c] / pivot_values[c]
+                    multipliers[row].append(m)
+                    if m != 0.0:
+                        panel[row][c:] = [x - m * y for x, y in zip(panel[row][c:], pivot_values[c:])]
+                else:
+                    multipliers[row].append(0.0)
+            steps.append((pivot, column))
+        return steps, multipliers
+
+    def compute_solution(self, system):
+        rows = [[float(x) for x in p.normal_vector.coordinates] + [float(p.constant_term)] for p in system.planes]
+        num_rows = len(rows)
+        num_variables = system.dimension
+        num_columns = num_variables + 1
+        b = self.tile_size
+        self.layout = BlockCyclicLayout(num_rows, num_columns, b, self.grid[0], self.grid[1])
+        self.distribute(rows)
+
+        echelon_rows = {}      # pivot column -> full row of the echelon form
+        active = list(range(num_rows))
+        for start in range(0, num_variables, b):
+            if not active:
+                break
+            stop = min(start + b, num_variables)
+            panel = self.gather(active, start, stop)
+            steps, multipliers = self.factor_panel(panel, active, start, stop)
+            if not steps:
+                continue
+
+            # U12: the pivot rows right of the panel, each reduced by the pivot rows chosen before it
+            pivot_rows = self.gather([row for row, _ in steps], stop, num_columns)
+            u_rows = []
+            for t, (row, column) in enumerate(steps):
+                u = pivot_rows[row]
+                for s in range(t):
+                    m = multipliers[row][s]
+                    if m != 0.0:
+                        u = [x - m * y for x, y in zip(u, u_rows[s])]
+                u_rows.append(u)
+                echelon_rows[column] = [0.0] * start + panel[row] + u
+
+            chosen = set(row for row, _ in steps)
+            active = [row for row in active if row not in chosen]
+            if stop < num_columns and active:
+                self.update_trailing(active, steps, multipliers, stop, u_rows)
+
+        if active:
+            constants = self.gather(active, num_variables, num_columns)
+            if any(abs(constants[row][0]) >= self.tolerance for row in active):
+                return LinearSystem.NO_SOLUTIONS_MSG
+        return self.back_substitute(echelon_rows, num_variables)
+
+    def update_trailing(self, active, steps, multipliers, column_start, u_rows):
+        layout = self.layout
+        b = self.tile_size
+        u_values = array('d')
+        for u in u_rows:
+            u_values.extend(u)
+
+        requests = {}
+        for worker in range(len(self.addresses)):
+            # only workers holding a tile column right of the panel have anything to update
+            grid_row = layout.grid_row(worker)
+            worker_column = worker % layout.grid_columns
+            if not any(J % layout.grid_columns == worker_column
+                       for J in range(column_start // b, layout.column_blocks)):
+                continue
+            rows = [row for row in active if (row // b) % layout.grid_rows == grid_row
+                    and any(m != 0.0 for m in multipliers[row])]
+            if not rows:
+                continue
+            values = array('d')
+            for row in rows:
+                values.extend(multipliers[row])
+            values.extend(u_values)
+            requests[worker] = ({'op': 'update', 'rows': rows, 'steps': len(steps), 'column_start': column_start},
+                                values)
+        self.request_all(requests)
+
+    # basepoint and direction vectors from the echelon rows, solving from the last pivot column back
+    def back_substitute(self, echelon_rows, num_variables):
+        pivot_columns = sorted(echelon_rows, reverse=True)
+        free_variables = [j for j in range(num_variables) if j not in echelon_rows]
+
+        def solve(x, constant):
+            for column in pivot_columns:
+                row = echelon_rows[column]
+                total = row[num_variables] if constant else 0.0
+                total -= sum(row[j] * x[j] for j in range(column + 1, num_variables) if x[j] != 0.0)
+                x[column] = total / row[column]
+            return x
+
+        basepoint = solve([0.0] * num_variables, True)
+        direction_vectors = []
+        for free_var in free_variables:
+            x = [0.0] * num_variables
+            x[free_var] = 1.0
+            direction_vectors.append(Vector(solve(x, False)))
+        return Parametrization(Vector(basepoint), direction_vectors)
@@ -0,0 +1,454 @@
+import cmath
+import random
+from math import sqrt, hypot
+from decimal import getcontext
+
+from structure import solve_tridiagonal
+
+getcontext().prec = 30
+
+# eigenvalues and singular values of Matrix objects or plain lists of rows, in floats.  every routine here
+# works on whole rows or columns at a time (zip over row pairs, list comprehensions per vector) rather than
+# entry by entry, which is the vectorized form plain python offers
+
+EPSILON = 2.0 ** -52
+MAX_SWEEPS = 100
+MAX_QR_ITERATIONS_PER_EIGENVALUE = 60
+
+NOT_SQUARE_MSG = 'The matrix must be square'
+NOT_SYMMETRIC_MSG = 'The matrix must be symmetric'
+NO_CONVERGENCE_MSG = 'The iteration did not converge'
+UNKNOWN_TOP_K_METHOD_MSG = 'The method must be either "lanczos" or "power"'
+TOO_MANY_EIGENPAIRS_MSG = 'Cannot ask for more eigenpairs than the matrix has rows'
+
+def as_rows(matrix):
+    rows = matrix.vals if hasattr(matrix, 'vals') else matrix
+    return [[float(x) for x in row] for row in rows]
+
+def check_square(rows):
+    if any(len(row) != len(rows) for row in rows):
+        raise Exception(NOT_SQUARE_MSG)
+
+def check_symmetric(rows, tolerance=1e-10):
+    scale = max([abs(x) for row in rows for x in row] + [1.0])
+    for i, row in enumerate(rows):
+        for j in range(i):
+            if abs(row[j] - rows[j][i]) > tolerance * scale:
+                raise Exception(NOT_SYMMETRIC_MSG)
+
+def dot(v, w):
+    return sum(x * y for x, y in zip(v, w))
+
+def norm(v):
+    return sqrt(dot(v, v))
+
+## hessenberg reduction and shifted qr
+
+# householder reduction to upper hessenberg form (zeros below the first subdiagonal), same eigenvalues
+def hessenberg(matrix):
+    h = as_rows(matrix)
+    check_square(h)
+    n = len(h)
+    for k in range(n - 2):
+        x = [h[i][k] for i in range(k + 1, n)]
+        alpha = norm(x)
+        if alpha == 0.0:
+            continue
+        if x[0] > 0:
+            alpha = -alpha
+        v = list(x)
+        v[0] -= alpha
+        vv = dot(v, v)
+        if vv == 0.0:
+            continue
+
+        # h = (I - 2vv'/v'v) h (I - 2vv'/v'v), touching rows and columns k+1..n-1
+        for j in range(k, n):
+            s = 2.0 * sum(vi * h[k + 1 + i][j] for i, vi in enumerate(v)) / vv
+            for i, vi in enumerate(v):
+                h[k + 1 + i][j] -= s * vi
+        for row in h:
+            tail = row[k + 1:]
+            s = 2.0 * dot(tail, v) / vv
+            row[k + 1:] = [t - s * vi for t, vi in zip(tail, v)]
+        for i in range(k + 2, n):
+            h[i][k] = 0.0
+    return h
+
+# rotation [[conj(c), conj(s)], [-s, c]] taking (a, b) to (r, 0)
+def givens(a, b):
+    r = sqrt(abs(a) ** 2 + abs(b) ** 2)
+    if r == 0.0:
+        return 1.0, 0.0
+    return a / r, b / r
+
+# shift from the trailing 2x2 block: the eigenvalue closer to its bottom right entry (wilkinson)
+def wilkinson_shift(a, b, c, d):
+    half_trace = (a + d) / 2
+    discriminant = cmath.sqrt(half_trace * half_trace - (a * d - b * c))
+    first = half_trace + discriminant
+    second = half_trace - discriminant
+    return first if abs(first - d) <= abs(second - d) else second
+
+# all eigenvalues, by reduction to hessenberg form and single shift qr iteration in complex arithmetic,
+# deflating one eigenvalue at a time off the bottom of the active block.  real eigenvalues come back as
+# floats, complex ones (in conjugate pairs for real input) as complex numbers
+def eigenvalues(matrix, tolerance=1e-12):
+    h = [[complex(x) for x in row] for row in hessenberg(matrix)]
+    n = len(h)
+    values = [0j] * n
+    hi = n - 1
+    iterations = 0
+
+    while hi >= 0:
+        low = hi
+        while low > 0 and abs(h[low][low - 1]) > EPSILON * (abs(h[low - 1][low - 1]) + abs(h[low][low])):
+            low -= 1
+        if low > 0:
+            h[low][low - 1] = 0j
+        if low == hi:
+            values[hi] = h[hi][hi]
+            hi -= 1
+            iterations = 0
+            continue
+
+        iterations += 1
+        if iterations > MAX_QR_ITERATIONS_PER_EIGENVALUE:
+            raise Exception(NO_CONVERGENCE_MSG)
+        if iterations % 10 == 0:
+            # exceptional shift to break a stalled iteration
+            mu = h[hi][hi] + abs(h[hi][hi - 1])
+        else:
+            mu = wilkinson_shift(h[hi - 1][hi - 1], h[hi - 1][hi], h[hi][hi - 1], h[hi][hi])
+
+        # one qr step on the block low..hi: h - mu = qr, h <- rq + mu
+        for k in range(low, hi + 1):
+            h[k][k] -= mu
+        rotations = []
+        for k in range(low, hi):
+            c, s = givens(h[k][k], h[k + 1][k])
+            upper, lower = h[k], h[k + 1]
+            h[k][k:hi + 1], h[k + 1][k:hi + 1] = (
+                [c.conjugate() * x + s.conjugate() * y for x, y in zip(upper[k:hi + 1], lower[k:hi + 1])],
+                [-s * x + c * y for x, y in zip(upper[k:hi + 1], lower[k:hi + 1])])
+            rotations.append((k, c, s))
+        for k, c, s in rotations:
+            for i in range(low, min(k + 2, hi) + 1):
+                x, y = h[i][k], h[i][k + 1]
+                h[i][k] = x * c + y * s
+                h[i][k + 1] = -x * s.conjugate() + y * c.conjugate()
+        for k in range(low, hi + 1):
+            h[k][k] += mu
+
+    return [v.real if abs(v.imag) <= tolerance * max(1.0, abs(v)) else v for v in values]
+
+## symmetric eigendecomposition
+
+# cyclic jacobi: rotate away the off diagonal entries until they are negligible.  returns (values,
+# vectors) with values in descending order and vectors[i] the unit eigenvector of values[i]
+def symmetric_eigen(matrix, tolerance=1e-12):
+    a = as_rows(matrix)
+    check_square(a)
+    check_symmetric(a)
+    n = len(a)
+    v = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]   # rows of v are the eigenvectors
+
+    for _ in range(MAX_SWEEPS):
+        off = sqrt(sum(a[i][j] ** 2 for i in range(n) for j in range(n) if i != j))
+        scale = sqrt(sum(x * x for row in a for x in row))
+        if off <= tolerance * max(scale, EPSILON):
+            break
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                if a[p][q] == 0.0:
+                    continue
+                theta = (a[q][q] - a[p][p]) / (2.0 * a[p][q])
+                t = (1.0 if theta >= 0 else -1.0) / (abs(theta) + sqrt(theta * theta + 1.0))
+                c = 1.0 / sqrt(t * t + 1.0)
+                s = t * c
+                # a <- j' a j for the rotation j in the (p, q) plane: columns, then rows
+                for row in a:
+                    x, y = row[p], row[q]
+                    row[p] = c * x - s * y
+                    row[q] = s * x + c * y
+                a[p], a[q] = ([c * x - s * y for x, y in zip(a[p], a[q])],
+                              [s * x + c * y for x, y in zip(a[p], a[q])])
+                v[p], v[q] = ([c * x - s * y for x, y in zip(v[p], v[q])],
+                              [s * x + c * y for x, y in zip(v[p], v[q])])
+    else:
+        raise Exception(NO_CONVERGENCE_MSG)
+
+    order = sorted(range(n), key=lambda i: -a[i][i])
+    return [a[i][i] for i in order], [v[i] for i in order]
+
+## singular value decomposition
+
+# extend orthonormal columns (given as a list of vectors) with unit vectors until there are count of them
+def complete_orthonormal(vectors, dimension, count):
+    vectors = list(vectors)
+    for i in range(dimension):
+        if len(vectors) >= count:
+            break
+        w = [1.0 if j == i else 0.0 for j in range(dimension)]
+        for _ in range(2):
+            for q in vectors:
+                s = dot(w, q)
+                w = [wi - s * qi for wi, qi in zip(w, q)]
+        magnitude = norm(w)
+        if magnitude > 1e-8:
+            vectors.append([wi / magnitude for wi in w])
+    return vectors
+
+# one sided jacobi (hestenes): rotate pairs of columns until they are orthogonal; the column norms are the
+# singular values.  returns (u, s, vt) with matrix = u diag(s) vt, u m x p, vt p x n, p = min(m, n), and s
+# in descending order
+def svd(matrix, tolerance=1e-12):
+    rows = as_rows(matrix)
+    m = len(rows)
+    n = len(rows[0])
+    if m < n:
+        u, s, vt = svd([list(column) for column in zip(*rows)], tolerance)
+        return [list(column) for column in zip(*vt)], s, [list(column) for column in zip(*u)]
+
+    columns = [list(column) for column in zip(*rows)]
+    v = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]     # v[i] is column i of V
+
+    for _ in range(MAX_SWEEPS):
+        rotated = False
+        for p in range(n - 1):
+            for q in range(p + 1, n):
+                alpha = dot(columns[p], columns[p])
+                beta = dot(columns[q], columns[q])
+                gamma = dot(columns[p], columns[q])
+                if abs(gamma) <= tolerance * sqrt(alpha * beta) or gamma == 0.0:
+                    continue
+                rotated = True
+                zeta = (beta - alpha) / (2.0 * gamma)
+                t = (1.0 if zeta >= 0 else -1.0) / (abs(zeta) + sqrt(1.0 + zeta * zeta))
+                c = 1.0 / sqrt(1.0 + t * t)
+                s = c * t
+                columns[p], columns[q] = ([c * x - s * y for x, y in zip(columns[p], columns[q])],
+                                          [s * x + c * y for x, y in zip(columns[p], columns[q])])
+                v[p], v[q] = ([c * x - s * y for x, y in zip(v[p], v[q])],
+                              [s * x + c * y for x, y in zip(v[p], v[q])])
+        if not rotated:
+            break
+    else:
+        raise Exception(NO_CONVERGENCE_MSG)
+
+    singular_values = [norm(column) for column in columns]
+    order = sorted(range(n), key=lambda i: -singular_values[i])
+    largest = singular_values[order[0]] if n else 0.0
+
+    u_columns = []
+    for i in order:
+        if singular_values[i] > EPSILON * max(m, n) * largest:
+            u_columns.append([x / singular_values[i] for x in columns[i]])
+    u_columns = complete_orthonormal(u_columns, m, n)
+
+    u = [list(row) for row in zip(*u_columns)]
+    return u, [singular_values[i] for i in order], [v[i] for i in order]
+
+## top k eigenpairs of large sparse symmetric matrices
+
+# x -> Ax for dense rows, or for anything with a multiply method (iterative.SparseSystem)
+def as_operator(matrix):
+    if hasattr(matrix, 'multiply'):
+        return matrix.multiply, matrix.num_variables
+    rows = as_rows(matrix)
+    check_square(rows)
+    return (lambda x: [dot(row, x) for row in rows]), len(rows)
+
+def orthogonalize(w, basis):
+    for _ in range(2):
+        for q in basis:
+            s = dot(w, q)
+            w = [wi - s * qi for wi, qi in zip(w, q)]
+    return w
+
+# rayleigh-ritz on an orthonormal basis: eigenpairs of the projected matrix, lifted back
+def ritz_pairs(basis, images):
+    k = len(basis)
+    projected = [[dot(basis[i], images[j]) for j in range(k)] for i in range(k)]
+    for i in range(k):
+        for j in range(i):
+            projected[i][j] = projected[j][i] = (projected[i][j] + projected[j][i]) / 2
+    values, vectors = symmetric_eigen(projected)
+    lifted = [[sum(y[i] * basis[i][r] for i in range(k)) for r in range(len(basis[0]))] for y in vectors]
+    return values, vectors, lifted
+
+def residual_norm(operator, value, vector):
+    return norm([av - value * x for av, x in zip(operator(vector), vector)])
+
+# the k eigenpairs of largest magnitude of a symmetric matrix that is only touched through products:
+# 'lanczos' grows a krylov basis (with full reorthogonalization) and checks the ritz pairs of the
+# tridiagonal projection whenever the basis has doubled, deflating one pair at a time; 'power' runs
+# subspace iteration on a block of k vectors.  returns (values, vectors) ordered by decreasing magnitude
+def top_eigenpairs(matrix, k=1, method='lanczos', tolerance=1e-8, max_iterations=1000, seed=2016):
+    if method not in ('lanczos', 'power'):
+        raise Exception(UNKNOWN_TOP_K_METHOD_MSG)
+    operator, n = as_operator(matrix)
+    if k > n:
+        raise Exception(TOO_MANY_EIGENPAIRS_MSG)
+    rng = random.Random(seed)
+
+    def start_vector(basis):
+        while True:
+            w = orthogonalize([rng.uniform(-1, 1) for _ in range(n)], basis)
+            magnitude = norm(w)
+            if magnitude > 1e-8:
+                return [x / magnitude for x in w]
+
+    def converged(values, lifted):
+        pairs = sorted(zip(values, lifted), key=lambda pair: -abs(pair[0]))[:k]
+        scale = max(abs(pairs[0][0]), EPSILON)
+        if all(residual_norm(operator, value, vector) <= tolerance * scale for value, vector in pairs):
+            return [value for value, _ in pairs], [vector for _, vector in pairs]
+        return None
+
+    if method == 'power':
+        basis = []
+        for _ in range(k):
+            basis.append(start_vector(basis))
+        for _ in range(max_iterations):
+            images = [operator(q) for q in basis]
+            values, _, lifted = ritz_pairs(basis, images)
+            result = converged(values, lifted)
+            if result is not None:
+                return result
+            basis = []
+            for w in images:
+                w = orthogonalize(w, basis)
+                magnitude = norm(w)
+                basis.append([x / magnitude for x in w] if magnitude > 1e-12 else start_vector(basis))
+        raise Exception(NO_CONVERGENCE_MSG)
+
+    # lanczos with explicit deflation: one run per eigenpair, each kept orthogonal to the pairs already
+    # found.  a krylov space grown from one start vector holds a single direction of a repeated eigenvalue,
+    # so its copies come out of successive runs instead of as duplicate ritz vectors
+    values = []
+    vectors = []
+    while len(values) < k:
+        value, vector = lanczos_top_pair(operator, n, vectors, tolerance, start_vector)
+        values.append(value)
+        vectors.append(vector)
+    return values, vectors
+
+# largest magnitude eigenpair of the operator restricted to the orthogonal complement of locked.  alphas
+# are the diagonal of T = Q'AQ, betas its off diagonal
+def lanczos_top_pair(operator, n, locked, tolerance, start_vector):
+    size = n - len(locked)
+    basis = [start_vector(locked)]
+    alphas = []
+    betas = []
+    check_at = min(size, 20)
+    while True:
+        w = operator(basis[-1])
+        alphas.append(dot(w, basis[-1]))
+        w = orthogonalize(w, locked + basis)
+        beta = norm(w)
+
+        if len(basis) >= check_at or len(basis) == size:
+            result = lanczos_ritz_pairs(alphas, betas, beta, basis, 1, tolerance, len(basis) == size)
+            if result is not None:
+                return result[0][0], result[1][0]
+            if len(basis) == size:
+                raise Exception(NO_CONVERGENCE_MSG)
+            check_at = min(size, 2 * check_at)
+
+        if beta > 1e-10 * max(1.0, abs(alphas[-1])):
+            betas.append(beta)
+            basis.append([x / beta for x in w])
+        else:
+            # invariant subspace found: restart in the orthogonal complement, T splits into blocks
+            betas.append(0.0)
+            basis.append(start_vector(locked + basis))
+
+# eigenvalues of the symmetric tridiagonal matrix with the given diagonal and off diagonal, by implicit ql
+# with wilkinson shifts
+def tridiagonal_eigenvalues(diagonal, off_diagonal):
+    d = list(diagonal)
+    e = list(off_diagonal) + [0.0]
+    n = len(d)
+    for low in range(n):
+        iterations = 0
+        while True:
+            m = low
+            while m < n - 1 and abs(e[m]) > EPSILON * (abs(d[m]) + abs(d[m + 1])):
+                m += 1
+            if m == low:
+                break
+            iterations += 1
+            if iterations > MAX_QR_ITERATIONS_PER_EIGENVALUE:
+                raise Exception(NO_CONVERGENCE_MSG)
+
+            g = (d[low + 1] - d[low]) / (2.0 * e[low])
+            r = hypot(g, 1.0)
+            g = d[m] - d[low] + e[low] / (g + (r if g >= 0 else -r))
+            s = c = 1.0
+            p = 0.0
+            underflow = False
+            for i in range(m - 1, low - 1, -1):
+                f = s * e[i]
+                b = c * e[i]
+                r = hypot(f, g)
+                e[i + 1] = r
+                if r == 0.0:
+                    d[i + 1] -= p
+                    e[m] = 0.0
+                    underflow = True
+                    break
+                s = f / r
+                c = g / r
+                g = d[i + 1] - p
+                r = (d[i] - g) * s + 2.0 * c * b
+                p = s * r
+                d[i + 1] = g + p
+                g = c * r - b
+            if underflow:
+                continue
+            d[low] -= p
+            e[low] = g
+            e[m] = 0.0
+    return d
+
+# unit eigenvector of a symmetric tridiagonal matrix for a known eigenvalue, by inverse iteration with the
+# thomas solver.  the rows are dicts holding only the three bands
+def tridiagonal_eigenvector(diagonal, off_diagonal, value):
+    n = len(diagonal)
+    scale = max([abs(x) for x in diagonal] + [abs(x) for x in off_diagonal] + [1.0])
+    x = [1.0] * n
+    delta = 1e-9 * scale
+    while True:
+        shift = value + delta
+        rows = []
+        for i in range(n):
+            row = {i: diagonal[i] - shift}
+            if i > 0:
+                row[i - 1] = off_diagonal[i - 1]
+            if i + 1 < n:
+                row[i + 1] = off_diagonal[i]
+            rows.append(row)
+        for _ in range(3):
+            y = solve_tridiagonal(rows, x)
+            if y is None:
+                break
+            magnitude = norm(y)
+            x = [yi / magnitude for yi in y]
+        else:
+            return x
+        delta *= 10
+
+# ritz pairs of the k largest magnitude eigenvalues of T, when the residual estimate |beta * y_last| of
+# each is small enough (or the basis spans the whole space: complete); None otherwise
+def lanczos_ritz_pairs(alphas, betas, beta, basis, k, tolerance, complete=False):
+    values = tridiagonal_eigenvalues(alphas, betas)
+    values = sorted(values, key=lambda value: -abs(value))[:k]
+    scale = max(abs(values[0]), EPSILON)
+    vectors = []
+    for value in values:
+        y = tridiagonal_eigenvector(alphas, betas, value)
+        if abs(beta * y[-1]) > tolerance * scale and not complete:
+            return None
+        vectors.append([sum(yi * q[r] for yi, q in zip(y, basis)) for r in range(len(basis[0]))])
+    return values, vectors
@@ -0,0 +1,112 @@
+from math import sqrt
+from decimal import getcontext
+
+from canonical import canonical_form, DEFAULT_TOLERANCE
+from predicates import coordinates_of
+
+getcontext().prec = 30
+
+# behaviour shared by Line, Plane and Hyperplane (equations a.x = k with normal_vector and constant_term
+# attributes).  values derived from the two (the canonical form and the float unit normal and offset) are
+# kept on the object and dropped whenever either attribute is assigned; the Vector and Decimal themselves
+# never change in place
+class LinearEquation(object):
+
+    ZERO_NORMAL_VECTOR_MSG = 'The normal vector is zero, so distances are undefined'
+
+    canonical_cache = None
+    unit_normal_cache = None
+
+    @property
+    def normal_vector(self):
+        return self._normal_vector
+
+    @normal_vector.setter
+    def normal_vector(self, normal_vector):
+        self._normal_vector = normal_vector
+        self.forget_derived()
+
+    @property
+    def constant_term(self):
+        return self._constant_term
+
+    @constant_term.setter
+    def constant_term(self, constant_term):
+        self._constant_term = constant_term
+        self.forget_derived()
+
+    def forget_derived(self):
+        self.canonical_cache = None
+        self.unit_normal_cache = None
+
+    # canonical form of the equation (see canonical.py).  the one at the default tolerance is kept
+    def canonical_form(self, tolerance=DEFAULT_TOLERANCE):
+        if tolerance != DEFAULT_TOLERANCE:
+            return canonical_form(self, tolerance)
+        if self.canonical_cache is None:
+            self.canonical_cache = canonical_form(self)
+        return self.canonical_cache
+
+    # equal when the canonical forms (at the default tolerance) are, which also makes the hash a hash of the
+    # canonical form, so sets and dicts of equations spread them out.  the quantization can put equations
+    # that agree to within the tolerance on either side of a rounding boundary: coincident() is the
+    # tolerance test
+    def __eq__(self, other):
+        if not isinstance(other, LinearEquation):
+            return NotImplemented
+        return self.canonical_form() == other.canonical_form()
+
+    def __hash__(self):
+        return hash(self.canonical_form())
+
+    ## distances and projections, in floats.  the batch forms take a list of points and normalize the
+    ## equation once per call
+
+    # (unit normal, offset) with unit normal . x = offset describing the same set, computed on first use
+    def unit_normal_and_offset(self):
+        if self.unit_normal_cache is None:
+            coordinates = [float(x) for x in coordinates_of(self.normal_vector)]
+            magnitude = sqrt(sum(x * x for x in coordinates))
+            if magnitude == 0:
+                raise Exception(self.ZERO_NORMAL_VECTOR_MSG)
+            self.unit_normal_cache = ([x / magnitude for x in coordinates], float(self.constant_term) / magnitude)
+        return self.unit_normal_cache
+
+    def get_unit_normal(self):
+        return list(self.unit_normal_and_offset()[0])
+
+    # positive on the side the normal vector points to, negative on the other
+    def signed_distance(self, point):
+        return self.signed_distances([point])[0]
+
+    def signed_distances(self, points):
+        unit_normal, offset = self.unit_normal_and_offset()
+        return [signed_distance(unit_normal, offset, p) for p in points]
+
+    def distance_to(self, point):
+        return abs(self.signed_distance(point))
+
+    def distances_to(self, points):
+        return [abs(d) for d in self.signed_distances(points)]
+
+    # 1 or -1 for the side the point is on, 0 when it is within tolerance of the line/plane
+    def signed_side(self, point, tolerance=1e-10):
+        return self.signed_sides([point], tolerance)[0]
+
+    def signed_sides(self, points, tolerance=1e-10):
+        return [0 if abs(d) <= tolerance else (1 if d > 0 else -1) for d in self.signed_distances(points)]
+
+    # closest point on the line/plane
+    def project_point(self, point):
+        return self.project_points([point])[0]
+
+    def project_points(self, points):
+        unit_normal, offset = self.unit_normal_and_offset()
+        projections = []
+        for p in points:
+            d = signed_distance(unit_normal, offset, p)
+            projections.append([float(pi) - d * ni for pi, ni in zip(coordinates_of(p), unit_normal)])
+        return projections
+
+def signed_distance(unit_normal, offset, point):
+    return sum(ni * float(pi) for ni, pi in zip(unit_normal, coordinates_of(point))) - offset
@@ -1,11 +1,15 @@
 from decimal import Decimal, getcontext
 
 from vector import Vector
+from equation import LinearEquation
 
 getcontext().prec = 30
 
-class Hyperplane(object):
+class Hyperplane(LinearEquation):
     NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
+    NO_NONZERO_INDEX = -1
+    # MyDecimal.is_near_zero's default eps as a Decimal, so the pivot scan compares coefficients directly
+    NEAR_ZERO = Decimal(1e-10)
     EITHER_DIM_OR_NORMAL_VEC_MUST_BE_PROVIDED_MSG = 'Either the dimension the hyper'
 
     def __init__(self, dimension=None, normal_vector=None, constant_term=None):
@@ -26,4 +30,78 @@ class Hyperplane(object):
 
         self.set_basepoint()
 
-# todo: copy paste from plane.py?
\ No newline at end of file
+    def set_basepoint(self):
+        n = self.normal_vector
+        c = self.constant_term
+        basepoint_coords = ['0'] * self.dimension
+
+        initial_index = Hyperplane.find_first_nonzero_index(n)
+        if initial_index == Hyperplane.NO_NONZERO_INDEX:
+            self.basepoint = None
+            return
+
+        initial_coefficient = n.coordinates[initial_index]
+
+        basepoint_coords[initial_index] = c/initial_coefficient
+        self.basepoint = Vector(basepoint_coords)
+
+    def __str__(self):
+
+        num_decimal_places = 3
+
+        def write_coefficient(coefficient, is_initial_term=False):
+            coefficient = round(coefficient, num_decimal_places)
+            if coefficient % 1 == 0:
+                coefficient = int(coefficient)
+
+            output = ''
+
+            if coefficient < 0:
+                output += '-'
+            if coefficient > 0 and not is_initial_term:
+                output += '+'
+
+            if not is_initial_term:
+                output += ' '
+
+            if abs(coefficient) != 1:
+                output += '{}'.format(abs(coefficient))
+
+            return output
+
+        n = self.normal_vector
+
+        initial_index = Hyperplane.find_first_nonzero_index(n)
+        if initial_index == Hyperplane.NO_NONZERO_INDEX:
+            output = '0'
+        else:
+            terms = [write_coefficient(n[i], is_initial_term=(i==initial_index)) + 'x_{}'.format(i+1)
+                     for i in range(self.dimension) if round(n[i], num_decimal_places) != 0]
+            output = ' '.join(terms)
+
+        constant = round(self.constant_term, num_decimal_places)
+        if constant % 1 == 0:
+            constant = int(constant)
+        output += ' = {}'.format(constant)
+
+        return output
+
+    # index of the first coefficient that isn't near zero, or NO_NONZERO_INDEX when they all are
+    @staticmethod
+    def find_first_nonzero_index(iterable):
+        for k, item in enumerate(iterable.coordinates):
+            if abs(item) >= Hyperplane.NEAR_ZERO:
+                return k
+        return Hyperplane.NO_NONZERO_INDEX
+
+    # raising form of find_first_nonzero_index
+    @staticmethod
+    def first_nonzero_index(iterable):
+        k = Hyperplane.find_first_nonzero_index(iterable)
+        if k == Hyperplane.NO_NONZERO_INDEX:
+            raise Exception(Hyperplane.NO_NONZERO_ELTS_FOUND_MSG)
+        return k
+
+class MyDecimal(Decimal):
+    def is_near_zero(self, eps=1e-10):
+        return abs(self) < eps
@@ -0,0 +1,225 @@
+from math import sqrt
+from decimal import getcontext
+
+from vector import Vector
+from linsys import Parametrization
+
+getcontext().prec = 30
+
+# a square system held as sparse float rows: rows[i] is a list of (column, value) pairs for equation i.
+# build one with from_linear_system, or directly from rows when the system is too large for Plane objects
+class SparseSystem(object):
+
+    SYSTEM_MUST_BE_SQUARE_MSG = 'Iterative solvers need as many equations as unknowns'
+
+    def __init__(self, rows, constants, num_variables):
+        if len(rows) != num_variables or len(constants) != num_variables:
+            raise Exception(self.SYSTEM_MUST_BE_SQUARE_MSG)
+        self.rows = [[(j, float(a)) for j, a in row if a != 0] for row in rows]
+        self.constants = [float(k) for k in constants]
+        self.num_variables = num_variables
+
+    @staticmethod
+    def from_linear_system(system):
+        rows = [list(enumerate(p.normal_vector.coordinates)) for p in system.planes]
+        constants = [p.constant_term for p in system.planes]
+        return SparseSystem(rows, constants, system.dimension)
+
+    def diagonal(self):
+        d = [0.0] * self.num_variables
+        for i, row in enumerate(self.rows):
+            for j, a in row:
+                if j == i:
+                    d[i] = a
+        return d
+
+    def multiply(self, x):
+        return [sum(a * x[j] for j, a in row) for row in self.rows]
+
+    def residual(self, x):
+        return [k - ax for k, ax in zip(self.constants, self.multiply(x))]
+
+def norm(v):
+    return sqrt(sum(x * x for x in v))
+
+def dot(v, w):
+    return sum(x * y for x, y in zip(v, w))
+
+class IterativeResult(object):
+    def __init__(self, solution, converged, iterations, residual_history):
+        self.solution = solution                    # list of floats
+        self.converged = converged
+        self.iterations = iterations
+        self.residual_history = residual_history    # relative residual norm after each iteration
+
+    def residual_norm(self):
+        return self.residual_history[-1]
+
+    def parametrization(self):
+        return Parametrization(Vector(self.solution), [])
+
+class IterativeSolver(object):
+
+    ZERO_DIAGONAL_MSG = 'Jacobi and Gauss-Seidel need a nonzero diagonal'
+    UNKNOWN_METHOD_MSG = 'Unknown iterative method'
+    BREAKDOWN_MSG = 'The iteration broke down (the matrix may not be positive definite)'
+    WARM_START_WRONG_DIMENSION_MSG = 'The warm start must have one value per unknown'
+
+    METHODS = ('jacobi', 'gauss_seidel', 'conjugate_gradient', 'gmres')
+
+    # tolerance: stop once ||b - Ax|| / ||b|| drops below this
+    # restart: inner iterations per GMRES cycle
+    def __init__(self, method='conjugate_gradient', tolerance=1e-10, max_iterations=1000, restart=30):
+        if method not in self.METHODS:
+            raise Exception(self.UNKNOWN_METHOD_MSG)
+        self.method = method
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.restart = restart
+
+    # system: a LinearSystem or a SparseSystem
+    # x0: warm start; a list of numbers, a Vector, a Parametrization or a previous IterativeResult
+    def solve(self, system, x0=None):
+        if not isinstance(system, SparseSystem):
+            system = SparseSystem.from_linear_system(system)
+        x = self.initial_guess(system, x0)
+        return getattr(self, self.method)(system, x)
+
+    def initial_guess(self, system, x0):
+        if x0 is None:
+            return [0.0] * system.num_variables
+        if isinstance(x0, IterativeResult):
+            x0 = x0.solution
+        elif isinstance(x0, Parametrization):
+            x0 = x0.basepoint.coordinates
+        elif isinstance(x0, Vector):
+            x0 = x0.coordinates
+        if len(x0) != system.num_variables:
+            raise Exception(self.WARM_START_WRONG_DIMENSION_MSG)
+        return [float(v) for v in x0]
+
+    def scale(self, system):
+        b_norm = norm(system.constants)
+        return b_norm if b_norm > 0 else 1.0
+
+    def jacobi(self, system, x):
+        d = system.diagonal()
+        if any(a == 0.0 for a in d):
+            raise Exception(self.ZERO_DIAGONAL_MSG)
+
+        b_norm = self.scale(system)
+        history = [norm(system.residual(x)) / b_norm]
+        iterations = 0
+        while history[-1] >= self.tolerance and iterations < self.max_iterations:
+            r = system.residual(x)
+            x = [xi + ri / di for xi, ri, di in zip(x, r, d)]
+            iterations += 1
+            history.append(norm(system.residual(x)) / b_norm)
+
+        return IterativeResult(x, history[-1] < self.tolerance, iterations, history)
+
+    def gauss_seidel(self, system, x):
+        d = system.diagonal()
+        if any(a == 0.0 for a in d):
+            raise Exception(self.ZERO_DIAGONAL_MSG)
+
+        b_norm = self.scale(system)
+        history = [norm(system.residual(x)) / b_norm]
+        iterations = 0
+        while history[-1] >= self.tolerance and iterations < self.max_iterations:
+            for i, row in enumerate(system.rows):
+                sigma = sum(a * x[j] for j, a in row if j != i)
+                x[i] = (system.constants[i] - sigma) / d[i]
+            iterations += 1
+            history.append(norm(system.residual(x)) / b_norm)
+
+        return IterativeResult(x, history[-1] < self.tolerance, iterations, history)
+
+    # for symmetric positive definite systems
+    def conjugate_gradient(self, system, x):
+        b_norm = self.scale(system)
+        r = system.residual(x)
+        p = list(r)
+        rr = dot(r, r)
+        history = [sqrt(rr) / b_norm]
+        iterations = 0
+
+        while history[-1] >= self.tolerance and iterations < self.max_iterations:
+            ap = system.multiply(p)
+            pap = dot(p, ap)
+            if pap <= 0.0:
+                raise Exception(self.BREAKDOWN_MSG)
+            alpha = rr / pap
+            x = [xi + alpha * pi for xi, pi in zip(x, p)]
+            r = [ri - alpha * api for ri, api in zip(r, ap)]
+            rr_next = dot(r, r)
+            p = [ri + (rr_next / rr) * pi for ri, pi in zip(r, p)]
+            rr = rr_next
+            iterations += 1
+            history.append(sqrt(rr) / b_norm)
+
+        return IterativeResult(x, history[-1] < self.tolerance, iterations, history)
+
+    # restarted GMRES(restart) with Arnoldi (modified Gram-Schmidt) and Givens rotations
+    def gmres(self, system, x):
+        b_norm = self.scale(system)
+        r = system.residual(x)
+        beta = norm(r)
+        history = [beta / b_norm]
+        iterations = 0
+
+        while history[-1] >= self.tolerance and iterations < self.max_iterations:
+            basis = [[ri / beta for ri in r]]
+            h = []                   # h[k] is column k of the Hessenberg matrix
+            cs, sn = [], []
+            g = [beta]
+
+            for k in range(self.restart):
+                w = system.multiply(basis[k])
+                column = []
+                for v in basis:
+                    hjk = dot(w, v)
+                    w = [wi - hjk * vi for wi, vi in zip(w, v)]
+                    column.append(hjk)
+                h_next = norm(w)
+                column.append(h_next)
+
+                # apply the earlier rotations to the new column, then make a new one to zero its last entry
+                for j in range(k):
+                    temp = cs[j] * column[j] + sn[j] * column[j + 1]
+                    column[j + 1] = -sn[j] * column[j] + cs[j] * column[j + 1]
+                    column[j] = temp
+                denominator = sqrt(column[k] ** 2 + column[k + 1] ** 2)
+                if denominator == 0.0:
+                    cs.append(1.0)
+                    sn.append(0.0)
+                else:
+                    cs.append(column[k] / denominator)
+                    sn.append(column[k + 1] / denominator)
+                column[k] = cs[k] * column[k] + sn[k] * column[k + 1]
+                column[k + 1] = 0.0
+                g.append(-sn[k] * g[k])
+                g[k] = cs[k] * g[k]
+                h.append(column)
+
+                iterations += 1
+                history.append(abs(g[k + 1]) / b_norm)
+                if history[-1] < self.tolerance or iterations >= self.max_iterations or h_next == 0.0:
+                    break
+                basis.append([wi / h_next for wi in w])
+
+            # back substitution for the least squares coefficients, then update x
+            m = len(h)
+            y = [0.0] * m
+            for i in range(m)[::-1]:
+                y[i] = (g[i] - sum(h[j][i] * y[j] for j in range(i + 1, m))) / h[i][i]
+            for j in range(m):
+                x = [xi + y[j] * vi for xi, vi in zip(x, basis[j])]
+
+            r = system.residual(x)
+            beta = norm(r)
+            history[-1] = beta / b_norm
+            if beta == 0.0:
+                break
+
+        return IterativeResult(x, history[-1] < self.tolerance, iterations, history)
@@ -1,11 +1,16 @@
 from decimal import Decimal, getcontext
 from vector import Vector
+from equation import LinearEquation
+from predicates import hyperplanes_parallel, hyperplanes_coincident
 
 getcontext().prec = 30
 
-class Line(object):
+class Line(LinearEquation):
 
     NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
+    NO_NONZERO_INDEX = -1
+    # MyDecimal.is_near_zero's default eps as a Decimal, so the pivot scan compares coefficients directly
+    NEAR_ZERO = Decimal(1e-10)
 
     def __init__(self, normal_vector=None, constant_term=None):
         self.dimension = 2
@@ -29,22 +34,19 @@ class Line(object):
     #     basepoint_difference = x0.minus
 
     def set_basepoint(self):
-        try:
-            n = self.normal_vector
-            c = self.constant_term
-            basepoint_coords = ['0']*self.dimension
+        n = self.normal_vector
+        c = self.constant_term
+        basepoint_coords = ['0'] * self.dimension
 
-            initial_index = Line.first_nonzero_index(n)
-            initial_coefficient = n[initial_index]
+        initial_index = Line.find_first_nonzero_index(n)
+        if initial_index == Line.NO_NONZERO_INDEX:
+            self.basepoint = None
+            return
 
-            basepoint_coords[initial_index] = c/Decimal(initial_coefficient)
-            self.basepoint = Vector(basepoint_coords)
+        initial_coefficient = n[initial_index]
 
-        except Exception as e:
-            if str(e) == Line.NO_NONZERO_ELTS_FOUND_MSG:
-                self.basepoint = None
-            else:
-                raise e
+        basepoint_coords[initial_index] = c/Decimal(initial_coefficient)
+        self.basepoint = Vector(basepoint_coords)
 
     # return a point on line as a vector when x=1 and y=1
     def get_point_on_line(self):
@@ -75,18 +77,14 @@ class Line(object):
                 output += '{}'.format(abs(coefficient))
 
             return output
-        try:
-            initial_index = Line.first_nonzero_index(n)
+        initial_index = Line.find_first_nonzero_index(n)
+        if initial_index == Line.NO_NONZERO_INDEX:
+            output = '0'
+        else:
             terms = [write_coefficient(n[i], is_initial_term=(i==initial_index)) + 'x_{}'.format(i+1)
                         for i in range(self.dimension) if round(n[i], num_decimal_places) != 0]
             output = ' '.join(terms)
 
-        except Exception as e:
-            if str(e) == self.NO_NONZERO_ELTS_FOUND_MSG:
-                output = '0'
-            else:
-                raise e
-
         constant = round(self.constant_term, num_decimal_places)
         if constant % 1 == 0:
             constant = int(constant)
@@ -94,33 +92,17 @@ class Line(object):
 
         return output
 
+    # the normal vectors are multiples of each other, to within tolerance, or exactly with exact=True
+    # (both filtered predicates, see predicates.py)
     @staticmethod
-    def parallel(first, second):
-        v1 = Vector(first.normal_vector)
-        v2 = Vector(second.normal_vector)
-        return Vector.parallel(v1, v2)
+    def parallel(first, second, tolerance=1e-10, exact=False):
+        return hyperplanes_parallel(first, second, tolerance, exact)
 
     @staticmethod # return true if supplied lines are coincident (parallel & overlapping)
-    def coincident(first, second):
-        result = False
-        parallel_lines = Line.parallel(first, second)
-        if parallel_lines:
-            # todo: handle lines that are vertical or horizontal (A=0 or B=0)
-            ptline1 = first.get_point_on_line()
-            ptline2 = second.get_point_on_line()
-            if ptline1[0] == ptline2[0] and ptline1[1] == ptline2[1]:
-                result = True
-            else:
-                v0 = Vector( [ptline2[0]-ptline1[0], ptline2[1]-ptline1[1]] )
-                v1 = Vector(first.normal_vector)
-                v2 = Vector(second.normal_vector)
-                first_orthogonal = Vector.orthagonal(v0, v1)
-                second_orthogonal = Vector.orthagonal(v0, v2)
-                if first_orthogonal and second_orthogonal:
-                    result = True
-        else:
-            result = parallel_lines
-        return result
+    def coincident(first, second, tolerance=1e-10, exact=False):
+        # coincident when the two equations are multiples of each other, which also covers vertical and
+        # horizontal lines
+        return hyperplanes_coincident(first, second, tolerance, exact)
 
     @staticmethod
     def intersection(first, second):
@@ -137,12 +119,21 @@ class Line(object):
         else:
             return False
 
+    # index of the first coefficient that isn't near zero, or NO_NONZERO_INDEX when they all are
     @staticmethod
-    def first_nonzero_index(iterable):
+    def find_first_nonzero_index(iterable):
         for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
+            if abs(item) >= Line.NEAR_ZERO:
                 return k
-        raise Exception(Line.NO_NONZERO_ELTS_FOUND_MSG)
+        return Line.NO_NONZERO_INDEX
+
+    # raising form of find_first_nonzero_index
+    @staticmethod
+    def first_nonzero_index(iterable):
+        k = Line.find_first_nonzero_index(iterable)
+        if k == Line.NO_NONZERO_INDEX:
+            raise Exception(Line.NO_NONZERO_ELTS_FOUND_MSG)
+        return k
 
 class MyDecimal(Decimal):
     def is_near_zero(self, eps=1e-10):
@@ -1,18 +1,110 @@
 from decimal import Decimal, getcontext
+from math import sqrt
 from copy import deepcopy
+from enum import Enum
+from functools import wraps
+from time import perf_counter
 
 from vector import Vector
 from plane import Plane
 from hyperplane import Hyperplane
+from qr import QRDecomposition
+from projection import ProjectionEngine
+from structure import detect_structure, solve_structured, SOLVER_PATHS, GENERAL
+from refinement import refine, FloatLU
+from condition import condition_number, error_bounds, FLOAT_UNIT_ROUNDOFF
 
 getcontext().prec = 30
 
+# opt-in instrumentation for LinearSystem.  counts row operations and allocations, and accumulates
+# wall time per solve phase.  a system only records into it once enable_stats() has been called
+class SolveStats(object):
+    def __init__(self):
+        self.counts = {}
+        self.phase_seconds = {}
+        self.phase_calls = {}
+
+    def count(self, name, amount=1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def add_time(self, name, seconds):
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+        self.phase_calls[name] = self.phase_calls.get(name, 0) + 1
+
+    def reset(self):
+        self.counts.clear()
+        self.phase_seconds.clear()
+        self.phase_calls.clear()
+
+    # the working copies made during elimination must keep reporting into the same stats object
+    def __deepcopy__(self, memo):
+        return self
+
+    def __str__(self):
+        lines = ['Solve stats:']
+        lines += ['  {}: {}'.format(name, self.counts[name]) for name in sorted(self.counts)]
+        lines += ['  {}: {:.6f}s over {} call(s)'.format(name, self.phase_seconds[name], self.phase_calls[name])
+                  for name in sorted(self.phase_seconds)]
+        return '\n'.join(lines)
+
+# time a LinearSystem method as a solve phase when the system has stats enabled
+def timed_phase(method):
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        stats = self.stats
+        if stats is None:
+            return method(self, *args, **kwargs)
+        start = perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            stats.add_time(name, perf_counter() - start)
+
+    return wrapper
+
+# outcome of LinearSystem.solve().  the values are the messages compute_solution has always used
+class SolutionStatus(Enum):
+    UNIQUE = 'Unique solution'
+    NONE = 'No solutions'
+    INFINITE = 'Infinitely many solutions'
+
+# pivot structure of a system in echelon form: pivot_indices[i] is the column of row i's leading
+# coefficient, or -1 for a row with no nonzero coefficients.  recorded by compute_triangular_form and
+# compute_rref as they eliminate, so later steps don't have to rescan every coefficient of every row
+class EchelonForm(object):
+    def __init__(self, pivot_indices, num_variables, reduced=False):
+        self.pivot_indices = pivot_indices
+        self.num_variables = num_variables
+        self.reduced = reduced
+        self.pivot_rows = [(i, j) for i, j in enumerate(pivot_indices) if j >= 0]
+        self.num_pivots = len(self.pivot_rows)
+        pivot_columns = set(j for _, j in self.pivot_rows)
+        self.free_variable_indices = [j for j in range(num_variables) if j not in pivot_columns]
+        self.zero_rows = [i for i, j in enumerate(pivot_indices) if j < 0]
+
 class LinearSystem(object):
 
     ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG = 'All planes in the system should live in the same dimension'
     NO_SOLUTIONS_MSG = 'No solutions'
     INF_SOLUTIONS_MSG = 'Infinitely many solutions'
 
+    UNKNOWN_SPACE_METHOD_MSG = 'The method must be either "rref" or "qr"'
+
+    stats = None
+    rref_cache = None       # (rows key, rref, pivot indices)
+    echelon = None
+    echelon_rows = None     # rows key the echelon form was recorded for
+    # let solve() take the direct solvers in structure.py when the matrix allows: diagonal and triangular
+    # systems, and diagonally dominant tridiagonal/banded ones.  these give the solution general elimination
+    # would (to rounding); solve_path names the solver used.  set False to always eliminate
+    use_structure = True
+    solve_path = None       # solver the last solve() went through
+    # unique solutions from solve() can report error bounds (see attach_error_bounds).  they cost a float lu
+    # and a Decimal residual, so they are only worked out when first asked for.  set False to leave them off
+    attach_bounds = True
+
     def __init__(self, planes):
         try:
             d = planes[0].dimension
@@ -25,24 +117,47 @@ class LinearSystem(object):
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
+    # start recording operation counts and phase timings into a SolveStats object (returned)
+    def enable_stats(self, stats=None):
+        self.stats = stats if stats is not None else SolveStats()
+        return self.stats
+
+    def disable_stats(self):
+        self.stats = None
+
+    # scratch copy for elimination.  shares the stats object but none of the cached results
+    def working_copy(self):
+        system = LinearSystem(deepcopy(self.planes))
+        system.stats = self.stats
+        if system.stats is not None:
+            system.stats.count('deepcopy')
+        return system
+
+    @timed_phase
     def compute_triangular_form(self):
-        system = deepcopy(self)
+        system = self.working_copy()
 
         num_equations = len(system)
         num_variables = system.dimension # n is number of variables
 
+        pivot_indices = [-1] * num_equations
         j = 0 # variable index
         for i in range(num_equations):
             while j < num_variables:
                 c = MyDecimal(system[i].normal_vector[j])
+                if system.stats is not None:
+                    system.stats.count('decimal_conversions')
                 if c.is_near_zero():
                     swap_succeeded = system.swap_with_row_below_for_nonzero_coefficient_if_able(i, j)
                     if not swap_succeeded:
                         j += 1
                         continue
                 system.clear_coefficients_below(i, j)
+                pivot_indices[i] = j
                 j += 1
                 break
+
+        system.set_echelon_form(EchelonForm(pivot_indices, num_variables))
         return system
 
     def swap_with_row_below_for_nonzero_coefficient_if_able(self, row, col):
@@ -50,6 +165,8 @@ class LinearSystem(object):
 
         for k in range(row+1, num_equations):
             coefficient = MyDecimal(self[k].normal_vector[col])
+            if self.stats is not None:
+                self.stats.count('decimal_conversions')
             if not coefficient.is_near_zero():
                 self.swap_rows(row, k)
                 return True
@@ -60,6 +177,8 @@ class LinearSystem(object):
     def clear_coefficients_below(self, row, col):
         num_equations = len(self)
         beta = MyDecimal(self[row].normal_vector[col])
+        if self.stats is not None:
+            self.stats.count('decimal_conversions')
 
         for k in range(row+1, num_equations):
             n = self[k].normal_vector
@@ -68,6 +187,8 @@ class LinearSystem(object):
             self.add_multiple_times_row_to_row(alpha, row, k)
 
     def swap_rows(self, row1, row2): # simple swap, hopefully default python = operator does simple memberwise copy
+        if self.stats is not None:
+            self.stats.count('swap_rows')
         temp = self.planes[row1]
         self.planes[row1] = self.planes[row2]
         self.planes[row2] = temp
@@ -81,8 +202,10 @@ class LinearSystem(object):
 
         new_normal_vector = n.times_scalar(coefficient)
         new_constant_term = k * coefficient
-        self[row] = Plane(normal_vector=new_normal_vector,
-                          constant_term=new_constant_term)
+        self[row] = type(self[row])(normal_vector=new_normal_vector,
+                                    constant_term=new_constant_term)
+        if self.stats is not None:
+            self.count_row_rebuild('multiply_coefficient_and_row', row, vectors_built=1)
 
     # row_to_... are indices
     # add row_to_add * coefficient to row_to_be_added_to
@@ -96,23 +219,59 @@ class LinearSystem(object):
         new_normal_vector = n1.times_scalar(coefficient).plus(n2)
         new_constant_term = (k1 * coefficient) + k2
 
-        self[row_to_be_added_to] = Plane(normal_vector=new_normal_vector,
-                                         constant_term=new_constant_term)
+        self[row_to_be_added_to] = type(self[row_to_be_added_to])(normal_vector=new_normal_vector,
+                                                                  constant_term=new_constant_term)
+        if self.stats is not None:
+            self.count_row_rebuild('add_multiple_times_row_to_row', row_to_be_added_to, vectors_built=2)
+
+    # bookkeeping for a row operation: the operation itself, the rebuilt row, and the vectors allocated
+    # for it (the new normal vector's intermediates plus the row's basepoint, when it has one)
+    def count_row_rebuild(self, operation, row, vectors_built):
+        if self[row].basepoint is not None:
+            vectors_built += 1
+        self.stats.count(operation)
+        self.stats.count('row_allocations')
+        self.stats.count('vector_allocations', vectors_built)
+
+    # identities of the rows, their normal vectors, coordinates and constant terms.  none of these change in
+    # place (row operations build new ones), so any edit to the system, whether through __setitem__,
+    # swap_rows, a row operation or the planes list itself, gives a different key.  the cached echelon form
+    # and rref are checked against it, which costs O(rows) per lookup
+    def rows_key(self):
+        return [(p, p.normal_vector, p.normal_vector.coordinates, p.constant_term) for p in self.planes]
+
+    def rows_unchanged(self, key):
+        return key is not None and len(key) == len(self.planes) and \
+            all(entry[0] is p and entry[1] is p.normal_vector and entry[2] is p.normal_vector.coordinates
+                and entry[3] is p.constant_term for entry, p in zip(key, self.planes))
+
+    def set_echelon_form(self, echelon):
+        self.echelon = echelon
+        self.echelon_rows = self.rows_key()
+
+    # the recorded pivot structure when elimination produced this system and no row has changed since,
+    # otherwise one built by scanning
+    def get_echelon_form(self):
+        if self.echelon is None or not self.rows_unchanged(self.echelon_rows):
+            self.set_echelon_form(EchelonForm(self.scan_for_pivot_indices(), self.dimension))
+        elif self.stats is not None:
+            self.stats.count('pivot_cache_hits')
+        return self.echelon
 
     def indices_of_first_nonzero_terms_in_each_row(self):
+        return list(self.get_echelon_form().pivot_indices)
+
+    def scan_for_pivot_indices(self):
         num_equations = len(self)
         num_variables = self.dimension
 
         indices = [-1] * num_equations
 
+        if self.stats is not None:
+            self.stats.count('pivot_scans')
+
         for i, p in enumerate(self.planes):
-            try:
-                indices[i] = p.first_nonzero_index(p.normal_vector)
-            except Exception as e:
-                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                    continue
-                else:
-                    raise e
+            indices[i] = p.find_first_nonzero_index(p.normal_vector)
 
         return indices
 
@@ -128,11 +287,12 @@ class LinearSystem(object):
             self.add_multiple_times_row_to_row(alpha, row, k)
 
     # compute reduced row eschelon form
+    @timed_phase
     def compute_rref(self):
         tf = self.compute_triangular_form()
 
         num_equations = len(tf)
-        pivot_indices = tf.indices_of_first_nonzero_terms_in_each_row()
+        pivot_indices = tf.get_echelon_form().pivot_indices
 
         for i in range(num_equations)[::-1]:
             j = pivot_indices[i]
@@ -141,62 +301,152 @@ class LinearSystem(object):
             tf.scale_row_to_make_coefficient_equal_one(i, j)
             tf.clear_coefficients_above(i, j)
 
+        # scaling and clearing above leave every pivot where it was
+        tf.set_echelon_form(EchelonForm(pivot_indices, tf.dimension, reduced=True))
         return tf
 
     # given a system, compute its rref and:
     # output a unique solution, or indicate there is no solution or infinite solutions
+    @timed_phase
     def compute_solution(self):
-        try:
-            return self.do_gaussian_elimination_and_parametrize_solution()
-        except Exception as e:
-            if (str(e) == self.NO_SOLUTIONS_MSG or
-            str(e) == self.INF_SOLUTIONS_MSG):
-                return str(e)
-            else:
-                raise e
+        status, parametrization = self.solve()
+        if status == SolutionStatus.NONE:
+            return self.NO_SOLUTIONS_MSG
+        return parametrization
+
+    # non-raising solve: returns (SolutionStatus, Parametrization or None)
+    @timed_phase
+    def solve(self):
+        if self.use_structure:
+            parametrization = self.solve_by_structure()
+            if parametrization is not None:
+                return SolutionStatus.UNIQUE, self.bounded(parametrization)
+        self.record_solve_path(SOLVER_PATHS[GENERAL])
+
+        rref = self.compute_rref()
+
+        if rref.has_contradictory_equation():
+            return SolutionStatus.NONE, None
 
+        direction_vectors = rref.extract_direction_vectors_for_parametrization()
+        basepoint = rref.extract_basepoint_for_parametrization()
+
+        if direction_vectors:
+            return SolutionStatus.INFINITE, Parametrization(basepoint, direction_vectors)
+        return SolutionStatus.UNIQUE, self.bounded(Parametrization(basepoint, direction_vectors))
+
+    # mixed precision solve: float64 lu plus iterative refinement with Decimal residuals (see refinement.py).
+    # same return as solve(); systems that aren't square, are singular in floats, or too ill conditioned for
+    # refinement to converge go through solve() instead
+    # the refined parametrization carries error bounds, which cost little more here since the float
+    # factorization already exists
+    @timed_phase
+    def solve_refined(self, tolerance=None, max_iterations=10):
+        if len(self) == self.dimension:
+            rows = [p.normal_vector.coordinates for p in self.planes]
+            lu = FloatLU(rows)
+            result = refine(rows, [p.constant_term for p in self.planes], tolerance, max_iterations, lu)
+            if self.stats is not None:
+                self.stats.count('refinement_iterations', result.iterations)
+            if result.converged:
+                self.record_solve_path('mixed_precision_refinement')
+                parametrization = Parametrization(Vector(result.solution), [])
+                return SolutionStatus.UNIQUE, self.attach_error_bounds(parametrization, lu)
+        return self.solve()
+
+    # estimated infinity norm condition number of a square coefficient matrix (float('inf') when it is
+    # singular in floats, None when it isn't square).  a float solve loses about log10 of it in digits:
+    # expected_float_error() is the relative error to expect from one
+    def estimate_condition_number(self):
+        if len(self) != self.dimension:
+            return None
+        return condition_number([p.normal_vector.coordinates for p in self.planes])
+
+    def expected_float_error(self):
+        condition = self.estimate_condition_number()
+        if condition is None:
+            return None
+        return condition * FLOAT_UNIT_ROUNDOFF
+
+    # set the condition number, backward error and forward error bound of a unique solution of this system
+    # on the parametrization (returned).  lu: a FloatLU of the coefficients when one is at hand
+    def attach_error_bounds(self, parametrization, lu=None):
+        if len(self) != self.dimension or parametrization.direction_vectors:
+            return parametrization
+        rows = [p.normal_vector.coordinates for p in self.planes]
+        bounds = error_bounds(rows, [p.constant_term for p in self.planes],
+                              parametrization.basepoint.coordinates, lu)
+        parametrization.set_error_bounds(*bounds)
+        return parametrization
+
+    # the same bounds, worked out on first access.  the rows are captured now, so later edits to this
+    # system don't change them
+    def bounded(self, parametrization):
+        if not self.attach_bounds or len(self) != self.dimension or parametrization.direction_vectors:
+            return parametrization
+        parametrization.defer_error_bounds(LinearSystem(list(self.planes)))
+        return parametrization
+
+    # structure of the coefficient matrix (diagonal, triangular, tridiagonal, banded or general)
+    def detect_structure(self, tolerance=0):
+        return detect_structure([p.normal_vector.coordinates for p in self.planes], tolerance)
+
+    # unique solution of a square diagonal, triangular or banded system from the matching direct solver,
+    # working on the coefficients in place of a working copy.  None when the system is general, not
+    # square, or the solver meets a zero pivot; solve() then falls back to elimination
+    @timed_phase
+    def solve_by_structure(self):
+        if len(self) != self.dimension:
+            return None
+        rows = [p.normal_vector.coordinates for p in self.planes]
+        structure = detect_structure(rows)
+        if structure.kind == GENERAL:
+            return None
+        solution, path = solve_structured(rows, [p.constant_term for p in self.planes], structure)
+        if solution is None:
+            return None
+        self.record_solve_path(path)
+        return Parametrization(Vector([x + 0 for x in solution]), [])     # + 0 turns -0 into 0
+
+    def record_solve_path(self, path):
+        self.solve_path = path
+        if self.stats is not None:
+            self.stats.count('path_' + path)
+
+    @timed_phase
     def extract_direction_vectors_for_parametrization(self):
         num_variables = self.dimension
-        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
-        free_variable_indices = set(range(num_variables))-set(pivot_indices)
+        echelon = self.get_echelon_form()
 
         direction_vectors = []
 
-        for free_var in free_variable_indices:
+        for free_var in echelon.free_variable_indices:
             vector_coords = [0] * num_variables
             vector_coords[free_var] = 1
-            for i, p in enumerate(self.planes):
-                pivot_var = pivot_indices[i]
-                if pivot_var < 0:
-                    break
-                vector_coords[pivot_var] = -p.normal_vector[free_var]
+            for i, pivot_var in echelon.pivot_rows:
+                vector_coords[pivot_var] = -self.planes[i].normal_vector[free_var]
             direction_vectors.append(Vector(vector_coords))
 
         return direction_vectors
 
+    @timed_phase
     def extract_basepoint_for_parametrization(self):
         num_varibles = self.dimension
-        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
+        echelon = self.get_echelon_form()
 
         basepoint_coords = [0] * num_varibles
 
-        for i,p in enumerate(self.planes):
-            pivot_var = pivot_indices[i]
-            if pivot_var < 0:
-                break
-            basepoint_coords[pivot_var] = p.constant_term
+        for i, pivot_var in echelon.pivot_rows:
+            basepoint_coords[pivot_var] = self.planes[i].constant_term
 
         return Vector(basepoint_coords)
 
+    # raising form of solve()
     def do_gaussian_elimination_and_parametrize_solution(self):
-        rref = self.compute_rref()
-
-        rref.raise_exception_if_contradictory_equation()
-
-        direction_vectors = rref.extract_direction_vectors_for_parametrization()
-        basepoint = rref.extract_basepoint_for_parametrization()
-
-        return Parametrization(basepoint, direction_vectors)
+        status, parametrization = self.solve()
+        if status == SolutionStatus.NONE:
+            raise Exception(self.NO_SOLUTIONS_MSG)
+        return parametrization
         # rref.parameterize()
         # rref.raise_exception_if_too_few_pivots()
 
@@ -204,22 +454,23 @@ class LinearSystem(object):
         # solution_coordinates = [rref.planes[i].constant_term for i in range(num_variables)]
         # return Vector(solution_coordinates)
 
+    # true when some row reads 0 = nonzero
+    @timed_phase
+    def has_contradictory_equation(self):
+        for i in self.get_echelon_form().zero_rows:
+            constant_term = MyDecimal(self.planes[i].constant_term)
+            if not constant_term.is_near_zero():
+                return True
+        return False
+
     def raise_exception_if_contradictory_equation(self):
-        for p in self.planes:
-            try:
-                p.first_nonzero_index(p.normal_vector)
-            except Exception as e:
-                if str(e) == 'No nonzero elements found':
-
-                    constant_term = MyDecimal(p.constant_term)
-                    if not constant_term.is_near_zero():
-                        raise Exception(self.NO_SOLUTIONS_MSG)
-                else:
-                    raise e
+        if self.has_contradictory_equation():
+            raise Exception(self.NO_SOLUTIONS_MSG)
 
     def parameterize(self):
-        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
-        num_pivots = sum([1 if index >= 0 else 0 for index in pivot_indices])
+        echelon = self.get_echelon_form()
+        pivot_indices = echelon.pivot_indices
+        num_pivots = echelon.num_pivots
         num_variables = self.dimension
 
         if num_pivots < num_variables:
@@ -237,14 +488,93 @@ class LinearSystem(object):
             # separate out each free var as a direction vector
             # base point is what is left after separating out direction vectors
 
-    def raise_exception_if_too_few_pivots(self):
-        pivot_indices = self.indices_of_first_nonzero_terms_in_each_row()
-        num_pivots = sum([1 if index >= 0 else 0 for index in pivot_indices])
-        num_variables = self.dimension
+    def has_too_few_pivots(self):
+        return self.get_echelon_form().num_pivots < self.dimension
 
-        if num_pivots < num_variables:
+    def raise_exception_if_too_few_pivots(self):
+        if self.has_too_few_pivots():
             raise Exception(self.INF_SOLUTIONS_MSG)
 
+    # best fit for overdetermined (or inconsistent) systems: minimizes ||b - Ax|| with householder qr,
+    # without forming the normal equations.  returns (Parametrization, residual norm).  the
+    # parametrization has direction vectors when the columns are rank deficient
+    def least_squares(self, tolerance=1e-10):
+        rows = self.to_augmented_rows()
+        qr = QRDecomposition([row[:-1] for row in rows], tolerance=tolerance)
+        basepoint, direction_vectors, residual_norm = qr.solve_least_squares([row[-1] for row in rows])
+        return Parametrization(Vector(basepoint), [Vector(d) for d in direction_vectors]), residual_norm
+
+    # (rref, pivot indices), computed on first use and kept until a row of this system changes (see rows_key)
+    def cached_rref(self):
+        if self.rref_cache is None or not self.rows_unchanged(self.rref_cache[0]):
+            rref = self.compute_rref()
+            self.rref_cache = (self.rows_key(), rref, rref.get_echelon_form().pivot_indices)
+        return self.rref_cache[1:]
+
+    # rank-revealing householder qr of the coefficient matrix (or of its transpose)
+    def coefficient_qr(self, transpose=False, tolerance=1e-10):
+        rows = [list(p.normal_vector.coordinates) for p in self.planes]
+        if transpose:
+            rows = [list(column) for column in zip(*rows)]
+        return QRDecomposition(rows, pivoting=True, tolerance=tolerance)
+
+    def check_space_method(self, method):
+        if method not in ('rref', 'qr'):
+            raise Exception(self.UNKNOWN_SPACE_METHOD_MSG)
+
+    # number of independent equations.  method='qr' uses column-pivoted qr, which is the safer choice
+    # for near-singular systems
+    def rank(self, method='rref', tolerance=1e-10):
+        self.check_space_method(method)
+        if method == 'qr':
+            return self.coefficient_qr(tolerance=tolerance).rank
+        return sum(1 for j in self.cached_rref()[1] if j >= 0)
+
+    # basis of the solutions of the homogeneous system Ax = 0
+    def null_space(self, method='rref', tolerance=1e-10):
+        self.check_space_method(method)
+        if method == 'qr':
+            return [Vector(d) for d in self.coefficient_qr(tolerance=tolerance).null_space()]
+
+        return self.cached_rref()[0].extract_direction_vectors_for_parametrization()
+
+    # basis of the span of the coefficient rows.  rref gives the nonzero rref rows, qr an orthonormal basis
+    def row_space(self, method='rref', tolerance=1e-10):
+        self.check_space_method(method)
+        if method == 'qr':
+            qr = self.coefficient_qr(transpose=True, tolerance=tolerance)
+            return [Vector(q) for q in qr.q_columns(qr.rank)]
+
+        rref, pivot_indices = self.cached_rref()
+        return [rref[i].normal_vector for i, j in enumerate(pivot_indices) if j >= 0]
+
+    # basis of the span of the coefficient columns (in R^m, m = number of equations).  rref picks the
+    # original pivot columns, qr an orthonormal basis
+    def column_space(self, method='rref', tolerance=1e-10):
+        self.check_space_method(method)
+        if method == 'qr':
+            qr = self.coefficient_qr(tolerance=tolerance)
+            return [Vector(q) for q in qr.q_columns(qr.rank)]
+
+        pivot_indices = self.cached_rref()[1]
+        return [Vector([p.normal_vector[j] for p in self.planes]) for j in pivot_indices if j >= 0]
+
+    # build a system from augmented rows [a_1, ..., a_n, k].  3 variable rows become Planes, others Hyperplanes
+    @staticmethod
+    def from_augmented_rows(rows):
+        planes = []
+        for row in rows:
+            normal_vector = Vector(row[:-1])
+            if normal_vector.dimension == 3:
+                planes.append(Plane(normal_vector=normal_vector, constant_term=row[-1]))
+            else:
+                planes.append(Hyperplane(normal_vector=normal_vector, constant_term=row[-1]))
+        return LinearSystem(planes)
+
+    # the system as a list of augmented rows [a_1, ..., a_n, k]
+    def to_augmented_rows(self):
+        return [list(p.normal_vector.coordinates) + [p.constant_term] for p in self.planes]
+
     def __len__(self):
         return len(self.planes)
 
@@ -268,6 +598,8 @@ class LinearSystem(object):
 class Parametrization(object):
     BASEPT_AND_DIR_VECTORS_MUST_BE_IN_SAME_DIM_MSG = (
         'The basepoint and direction vectors should all live in the same dimension')
+    WRONG_NUMBER_OF_PARAMETERS_MSG = 'Each parameter tuple needs one value per direction vector'
+    POINT_WRONG_DIMENSION_MSG = 'Points must live in the same dimension as the parametrization'
 
     def __init__(self, basepoint, direction_vectors):
         self.basepoint = basepoint
@@ -281,6 +613,96 @@ class Parametrization(object):
         except AssertionError:
             raise Exception(self.BASEPT_AND_DIR_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
 
+        self.float_basepoint = [float(x) for x in basepoint.coordinates]
+        self.float_direction_vectors = [[float(x) for x in v.coordinates] for v in direction_vectors]
+        self.projection_engine = None
+
+        # (condition number, backward error, forward error bound) of a unique solution, filled in by
+        # LinearSystem.attach_error_bounds, or on first access from the system in pending_bounds (a plain
+        # object rather than a closure, so parametrizations still pickle)
+        self.error_bounds = None
+        self.pending_bounds = None
+
+    def set_error_bounds(self, condition_number, backward_error, forward_error_bound):
+        self.error_bounds = (condition_number, backward_error, forward_error_bound)
+        self.pending_bounds = None
+
+    def defer_error_bounds(self, system):
+        self.error_bounds = None
+        self.pending_bounds = system
+
+    def get_error_bounds(self):
+        if self.pending_bounds is not None:
+            system, self.pending_bounds = self.pending_bounds, None
+            system.attach_error_bounds(self)
+        return self.error_bounds or (None, None, None)
+
+    @property
+    def condition_number(self):
+        return self.get_error_bounds()[0]
+
+    @property
+    def backward_error(self):
+        return self.get_error_bounds()[1]
+
+    @property
+    def forward_error_bound(self):
+        return self.get_error_bounds()[2]
+
+    # true when the forward error bound is known and no larger than tolerance (relative, infinity norm)
+    def is_reliable(self, tolerance):
+        return self.forward_error_bound is not None and self.forward_error_bound <= tolerance
+
+    # projections onto the span of the direction vectors (built on first use and cached)
+    def get_projection_engine(self):
+        if self.projection_engine is None:
+            self.projection_engine = ProjectionEngine(self.float_direction_vectors, self.dimension)
+        return self.projection_engine
+
+    # orthonormal basis (as float lists) of the span of the direction vectors
+    def orthonormal_basis(self):
+        return self.get_projection_engine().orthonormal_basis()
+
+    # points of the solution set for a batch of parameter tuples (one parameter per direction vector)
+    def evaluate(self, params_array):
+        points = []
+        for params in params_array:
+            if len(params) != len(self.float_direction_vectors):
+                raise Exception(self.WRONG_NUMBER_OF_PARAMETERS_MSG)
+            point = list(self.float_basepoint)
+            for t, d in zip(params, self.float_direction_vectors):
+                t = float(t)
+                for i, di in enumerate(d):
+                    point[i] += t * di
+            points.append(point)
+        return points
+
+    # closest point of the solution set to each point (orthogonal projection onto the affine subspace)
+    def project(self, points):
+        offsets = self.offsets(points)
+        return [[bi + si for bi, si in zip(self.float_basepoint, s)]
+                for s in self.get_projection_engine().project(offsets)]
+
+    # euclidean distance from each point to the solution set
+    def distances(self, points):
+        perps = self.get_projection_engine().project_complement(self.offsets(points))
+        return [sqrt(sum(x * x for x in perp)) for perp in perps]
+
+    # whether each point lies in the solution set, to within tol
+    def contains(self, points, tol=1e-10):
+        return [d <= tol for d in self.distances(points)]
+
+    # each point minus the basepoint.  accepts Vectors or plain sequences of numbers
+    def offsets(self, points):
+        offsets = []
+        for p in points:
+            if isinstance(p, Vector):
+                p = p.coordinates
+            if len(p) != self.dimension:
+                raise Exception(self.POINT_WRONG_DIMENSION_MSG)
+            offsets.append([float(x) - bi for x, bi in zip(p, self.float_basepoint)])
+        return offsets
+
 class MyDecimal(Decimal):
     def is_near_zero(self, eps=1e-10):
         return abs(self) < eps
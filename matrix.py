@@ -1,6 +1,9 @@
 from decimal import Decimal, getcontext
 
 from vector import Vector
+from linsys import LinearSystem, SolutionStatus
+from structure import detect_structure, solve_structured
+import eigen
 
 getcontext().prec = 30
 
@@ -12,6 +15,38 @@ class Matrix(object):
         self.vals = vals_in
         self.element_count = len(vals_in)
 
+    # diagonal, triangular, tridiagonal, banded or general (see structure.py)
+    def detect_structure(self, tolerance=0):
+        return detect_structure(self.vals, tolerance)
+
+    # solve self * x = b with the direct solver matching the structure, falling back to gaussian
+    # elimination.  returns (solution as a list, or None when there is no unique solution, solver path)
+    def solve(self, b, tolerance=0):
+        structure = self.detect_structure(tolerance)
+        solution, path = solve_structured(self.vals, b, structure)
+        if solution is not None:
+            return solution, path
+
+        system = LinearSystem.from_augmented_rows([list(row) + [k] for row, k in zip(self.vals, b)])
+        system.use_structure = False
+        status, parametrization = system.solve()
+        if status != SolutionStatus.UNIQUE:
+            return None, system.solve_path
+        return list(parametrization.basepoint.coordinates), system.solve_path
+
+    # eigen and singular value routines (see eigen.py), all in floats
+    def eigenvalues(self):
+        return eigen.eigenvalues(self)
+
+    def symmetric_eigen(self):
+        return eigen.symmetric_eigen(self)
+
+    def svd(self):
+        return eigen.svd(self)
+
+    def top_eigenpairs(self, k=1, method='lanczos', tolerance=1e-8):
+        return eigen.top_eigenpairs(self, k, method, tolerance)
+
     #def print(self):
 
 def get_column(matrix_in, column_number):
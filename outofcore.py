@@ -0,0 +1,169 @@
+import mmap
+import struct
+from decimal import getcontext
+
+from vector import Vector
+from linsys import LinearSystem, Parametrization
+from serialization import (HEADER, BinaryReader, FORMAT_FLOAT64, KIND_LINEAR_SYSTEM,
+                           write_system, import_csv_to_binary)
+
+getcontext().prec = 30
+
+class OutOfCoreSystem(object):
+
+    FLOAT64_FILE_REQUIRED_MSG = 'Out-of-core elimination needs a float64 linear system file'
+    BLOCK_ROWS_MUST_BE_POSITIVE_MSG = 'The block size must be at least one row'
+
+    # path: a float64 linear system file (see serialization.py).  elimination happens in place,
+    #       so the file ends up holding the reduced system
+    # block_rows: rows held in memory at once.  at most two blocks (the pivot panel and the block
+    #             being updated) are resident, so memory is about 2 * block_rows * (n+1) floats
+    def __init__(self, path, block_rows=256, tolerance=1e-10):
+        if block_rows < 1:
+            raise Exception(self.BLOCK_ROWS_MUST_BE_POSITIVE_MSG)
+
+        with BinaryReader(path) as reader:
+            if reader.kind != KIND_LINEAR_SYSTEM or reader.coefficient_format != FORMAT_FLOAT64:
+                raise Exception(self.FLOAT64_FILE_REQUIRED_MSG)
+            self.num_equations = reader.num_rows
+            self.width = reader.values_per_row
+
+        self.path = path
+        self.num_variables = self.width - 1
+        self.block_rows = block_rows
+        self.tolerance = tolerance
+        self.row_struct = struct.Struct('<{}d'.format(self.width))
+        self.pivot_of_row = None
+
+        self.file = open(path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    @staticmethod
+    def from_system(system, path, block_rows=256, tolerance=1e-10):
+        write_system(system, path, FORMAT_FLOAT64)
+        return OutOfCoreSystem(path, block_rows, tolerance)
+
+    # stream a csv of augmented rows straight to the working file without building the system in memory
+    @staticmethod
+    def from_csv(csv_path, path, block_rows=256, tolerance=1e-10):
+        import_csv_to_binary(csv_path, path, FORMAT_FLOAT64)
+        return OutOfCoreSystem(path, block_rows, tolerance)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.num_equations
+
+    def close(self):
+        if not self.map.closed:
+            self.map.flush()
+            self.map.close()
+            self.file.close()
+
+    def read_rows(self, start, stop):
+        size = self.row_struct.size
+        return [list(self.row_struct.unpack_from(self.map, HEADER.size + i * size)) for i in range(start, stop)]
+
+    def write_rows(self, start, rows):
+        size = self.row_struct.size
+        for i, row in enumerate(rows):
+            self.row_struct.pack_into(self.map, HEADER.size + (start + i) * size, *row)
+
+    # blocked gauss-jordan elimination.  the rows are cut into panels of block_rows; each panel is
+    # loaded, reduced against itself with partial pivoting inside the panel, written back, and then its
+    # pivot rows are applied to every other row of the file one block at a time.  every pivot column
+    # ends up as a unit column, so the file holds the rref up to row order (see pivot_of_row)
+    def eliminate(self):
+        tolerance = self.tolerance
+        width = self.width
+        self.pivot_of_row = [-1] * self.num_equations
+        pivot_columns = set()
+
+        for panel_start in range(0, self.num_equations, self.block_rows):
+            panel_stop = min(panel_start + self.block_rows, self.num_equations)
+            panel = self.read_rows(panel_start, panel_stop)
+            panel_pivots = []   # (column, index into panel) in the order they were chosen
+
+            r = 0
+            for col in range(self.num_variables):
+                if r >= len(panel):
+                    break
+                if col in pivot_columns:
+                    continue
+
+                best = max(range(r, len(panel)), key=lambda i: abs(panel[i][col]))
+                if abs(panel[best][col]) < tolerance:
+                    continue
+                panel[r], panel[best] = panel[best], panel[r]
+
+                pivot_row = panel[r]
+                beta = 1.0 / pivot_row[col]
+                for c in range(width):
+                    pivot_row[c] *= beta
+                pivot_row[col] = 1.0
+
+                for i, row in enumerate(panel):
+                    if i == r:
+                        continue
+                    alpha = row[col]
+                    if alpha != 0.0:
+                        for c in range(width):
+                            row[c] -= alpha * pivot_row[c]
+                        row[col] = 0.0
+
+                panel_pivots.append((col, r))
+                pivot_columns.add(col)
+                self.pivot_of_row[panel_start + r] = col
+                r += 1
+
+            self.write_rows(panel_start, panel)
+            if not panel_pivots:
+                continue
+
+            pivots = [(col, panel[i]) for col, i in panel_pivots]
+            for block_start in range(0, self.num_equations, self.block_rows):
+                if block_start == panel_start:
+                    continue
+                block_stop = min(block_start + self.block_rows, self.num_equations)
+                block = self.read_rows(block_start, block_stop)
+                for row in block:
+                    for col, pivot_row in pivots:
+                        alpha = row[col]
+                        if alpha != 0.0:
+                            for c in range(width):
+                                row[c] -= alpha * pivot_row[c]
+                            row[col] = 0.0
+                self.write_rows(block_start, block)
+
+        self.map.flush()
+
+    # same contract as LinearSystem.compute_solution: a Parametrization, or the no solutions message.
+    # the reduced file is streamed once more to pick out the basepoint and direction vectors
+    def compute_solution(self):
+        if self.pivot_of_row is None:
+            self.eliminate()
+
+        num_variables = self.num_variables
+        free_variables = sorted(set(range(num_variables)) - set(self.pivot_of_row))
+        basepoint_coords = [0.0] * num_variables
+        direction_coords = [[0.0] * num_variables for _ in free_variables]
+        for d, free_var in zip(direction_coords, free_variables):
+            d[free_var] = 1.0
+
+        for block_start in range(0, self.num_equations, self.block_rows):
+            block_stop = min(block_start + self.block_rows, self.num_equations)
+            for i, row in enumerate(self.read_rows(block_start, block_stop)):
+                pivot_var = self.pivot_of_row[block_start + i]
+                if pivot_var < 0:
+                    if abs(row[-1]) >= self.tolerance:
+                        return LinearSystem.NO_SOLUTIONS_MSG
+                    continue
+                basepoint_coords[pivot_var] = row[-1]
+                for d, free_var in zip(direction_coords, free_variables):
+                    d[pivot_var] = -row[free_var]
+
+        return Parametrization(Vector(basepoint_coords), [Vector(d) for d in direction_coords])
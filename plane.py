@@ -1,12 +1,17 @@
 from decimal import Decimal, getcontext
 from line import Line
 from vector import Vector
+from equation import LinearEquation
+from predicates import hyperplanes_parallel, hyperplanes_coincident
 
 getcontext().prec = 30
 
-class Plane(object):
+class Plane(LinearEquation):
 
     NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
+    NO_NONZERO_INDEX = -1
+    # MyDecimal.is_near_zero's default eps as a Decimal, so the pivot scan compares coefficients directly
+    NEAR_ZERO = Decimal(1e-10)
 
     def __init__(self, normal_vector=None, constant_term=None):
         self.dimension = 3
@@ -23,57 +28,30 @@ class Plane(object):
         self.set_basepoint()
 
     def set_basepoint(self):
-        try:
-            n = self.normal_vector
-            c = self.constant_term
-            basepoint_coords = ['0'] * self.dimension
+        n = self.normal_vector
+        c = self.constant_term
+        basepoint_coords = ['0'] * self.dimension
 
-            initial_index = Plane.first_nonzero_index(n)
-            initial_coefficient = n.coordinates[initial_index]
+        initial_index = Plane.find_first_nonzero_index(n)
+        if initial_index == Plane.NO_NONZERO_INDEX:
+            self.basepoint = None
+            return
 
-            basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
+        initial_coefficient = n.coordinates[initial_index]
 
-        except Exception as e:
-            if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                self.basepoint = None
-            else:
-                raise e
+        basepoint_coords[initial_index] = c/initial_coefficient
+        self.basepoint = Vector(basepoint_coords)
 
+    # coincident when the two equations are multiples of each other, to within tolerance, or exactly with
+    # exact=True (both filtered predicates, see predicates.py)
     @staticmethod
-    def coincident(first, second):
-        result = False
-        if Plane.parallel(first, second):
-            # test if basepoints are equal
-            basepoints_equal = second.basepoint == first.basepoint
-            if not basepoints_equal:
-                # create a vector from the two basepoints on each plane
-                test_vector = second.basepoint
-                test_vector.minus(first.basepoint)
-
-                # is the 1st planes' normal orthogonal the test vector?
-                first_orthogonal = Vector.orthagonal(first.normal_vector, test_vector)
-                # is the 2nd planes' normal orthogonal the test vector?
-                second_orthogonal = Vector.orthagonal(second.normal_vector, test_vector)
-
-                if first_orthogonal and second_orthogonal:
-                    result = True   # vector formed by points on different planes is orthogonal to both planes' normals,
-                    # therefore planes are coincident
-            else:
-                result = True # planes share a common point and they are parallel, therefore coincident
-
-        return result
+    def coincident(first, second, tolerance=1e-10, exact=False):
+        return hyperplanes_coincident(first, second, tolerance, exact)
 
+    # parallel when the normal vectors are multiples of each other
     @staticmethod
-    def parallel(first, second):
-        # determine the angle between the 2 supplied planes' normal vectors.
-        angle = Vector.angle_degrees(first.normal_vector, second.normal_vector)
-
-        # if angle between normals is 0, return true, else false
-        if angle == 0.0 or angle == 180:
-            return True
-        else:
-            return False
+    def parallel(first, second, tolerance=1e-10, exact=False):
+        return hyperplanes_parallel(first, second, tolerance, exact)
 
     def __str__(self):
 
@@ -101,19 +79,15 @@ class Plane(object):
 
         n = self.normal_vector
 
-        try:
-            initial_index = Plane.first_nonzero_index(n)
+        initial_index = Plane.find_first_nonzero_index(n)
+        if initial_index == Plane.NO_NONZERO_INDEX:
+            output = '0'
+        else:
             # todo: can't index Vector object n? seems to work for Line class.  trace thru that?
             terms = [write_coefficient(n[i], is_initial_term=(i==initial_index)) + 'x_{}'.format(i+1)
                      for i in range(self.dimension) if round(n[i], num_decimal_places) != 0]
             output = ' '.join(terms)
 
-        except Exception as e:
-            if str(e) == self.NO_NONZERO_ELTS_FOUND_MSG:
-                output = '0'
-            else:
-                raise e
-
         constant = round(self.constant_term, num_decimal_places)
         if constant % 1 == 0:
             constant = int(constant)
@@ -121,12 +95,21 @@ class Plane(object):
 
         return output
 
+    # index of the first coefficient that isn't near zero, or NO_NONZERO_INDEX when they all are
     @staticmethod
-    def first_nonzero_index(iterable):
+    def find_first_nonzero_index(iterable):
         for k, item in enumerate(iterable.coordinates):
-            if not MyDecimal(item).is_near_zero():
+            if abs(item) >= Plane.NEAR_ZERO:
                 return k
-        raise Exception(Plane.NO_NONZERO_ELTS_FOUND_MSG)
+        return Plane.NO_NONZERO_INDEX
+
+    # raising form of find_first_nonzero_index
+    @staticmethod
+    def first_nonzero_index(iterable):
+        k = Plane.find_first_nonzero_index(iterable)
+        if k == Plane.NO_NONZERO_INDEX:
+            raise Exception(Plane.NO_NONZERO_ELTS_FOUND_MSG)
+        return k
 
 class MyDecimal(Decimal):
     def is_near_zero(self, eps=1e-10):
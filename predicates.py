@@ -0,0 +1,113 @@
+from fractions import Fraction
+from decimal import Decimal, getcontext
+
+from vector import Vector
+
+getcontext().prec = 30
+
+# parallel/coincident predicates for lines, planes and hyperplanes, as "these coefficient vectors are
+# multiples of each other".  both forms are filtered predicates: each test is first evaluated in floats
+# together with a bound on its rounding error, and only when the float result lies inside that bound is
+# it recomputed exactly with Fractions, so the common case costs a few float operations and the answer is
+# always the exact one.  every coefficient (float, Decimal, int or str) is taken at its exact value.
+# by default a 2x2 minor u_i v_j - u_j v_i counts as zero when it is within tolerance of |u| |v| (the sine
+# of the angle between u and v, for two coordinates).  coefficients reaching us carry rounding error from
+# float input or Decimal elimination, so an exactly zero test would call Vector([0.1, 0.3]) and
+# Vector([0.3, 0.9]) not parallel (0.3 is not three times 0.1 in binary); exact=True asks for exactly
+# zero minors anyway
+
+DEFAULT_TOLERANCE = 1e-10
+
+# unit roundoff of a float64
+EPSILON = 2.0 ** -53
+
+# |error| of fl(a*d - b*c) against the exact determinant is below this times (|a*d| + |b*c|): one
+# rounding per input conversion, per product and for the subtraction, with some margin
+DETERMINANT_ERROR_BOUND = 8 * EPSILON
+
+# below this the float tolerance bound may have lost digits to underflow, so the filter isn't trusted
+FILTER_MIN = 2.0 ** -900
+
+def exact_value(x):
+    if isinstance(x, (float, int, Decimal, Fraction)):
+        return Fraction(x)
+    return Fraction(str(x))
+
+def is_zero(x):
+    return exact_value(x) == 0
+
+def coordinates_of(v):
+    if isinstance(v, Vector):
+        return v.coordinates
+    return tuple(v)
+
+# sign (-1, 0 or 1) of a*d - b*c
+def determinant2_sign(a, b, c, d):
+    left = float(a) * float(d)
+    right = float(b) * float(c)
+    determinant = left - right
+    error_bound = DETERMINANT_ERROR_BOUND * (abs(left) + abs(right))
+
+    # comparisons with nan (from overflowing inputs) are false, which also falls through to the exact path
+    if determinant > error_bound:
+        return 1
+    if -determinant > error_bound:
+        return -1
+
+    exact = exact_value(a) * exact_value(d) - exact_value(b) * exact_value(c)
+    return (exact > 0) - (exact < 0)
+
+# true when u and v are scalar multiples of each other (every 2x2 minor of the 2 x n matrix [u; v] is
+# zero, exactly or to within tolerance).  a zero vector counts as a multiple of anything
+def proportional(u, v, tolerance=DEFAULT_TOLERANCE, exact=False):
+    u = coordinates_of(u)
+    v = coordinates_of(v)
+    if exact:
+        for i in range(len(u)):
+            for j in range(i + 1, len(u)):
+                if determinant2_sign(u[i], u[j], v[i], v[j]) != 0:
+                    return False
+        return True
+
+    # squared: minor^2 against tolerance^2 |u|^2 |v|^2, which is rational, so the exact fallback is exact
+    fu = [float(x) for x in u]
+    fv = [float(x) for x in v]
+    bound = float(tolerance) ** 2 * sum(x * x for x in fu) * sum(x * x for x in fv)
+    trusted = FILTER_MIN < bound < float('inf')
+    slack = (4 * len(u) + 16) * EPSILON
+    exact_bound = None
+    for i in range(len(u)):
+        for j in range(i + 1, len(u)):
+            left = fu[i] * fv[j]
+            right = fu[j] * fv[i]
+            minor = abs(left - right)
+            error = DETERMINANT_ERROR_BOUND * (abs(left) + abs(right))
+            if trusted:
+                if minor > error and (minor - error) ** 2 > bound * (1 + slack):
+                    return False
+                if (minor + error) ** 2 < bound * (1 - slack):
+                    continue
+
+            if exact_bound is None:
+                exact_bound = exact_value(tolerance) ** 2 * sum(exact_value(x) ** 2 for x in u) * \
+                    sum(exact_value(x) ** 2 for x in v)
+            exact_minor = exact_value(u[i]) * exact_value(v[j]) - exact_value(u[j]) * exact_value(v[i])
+            if exact_minor * exact_minor > exact_bound:
+                return False
+    return True
+
+# parallel: the normal vectors are proportional
+def hyperplanes_parallel(first, second, tolerance=DEFAULT_TOLERANCE, exact=False):
+    return proportional(first.normal_vector, second.normal_vector, tolerance, exact)
+
+# coincident: the whole equations (normal vector and constant term) are proportional.  both normals
+# must be nonzero, otherwise the equations don't describe a line/plane
+def hyperplanes_coincident(first, second, tolerance=DEFAULT_TOLERANCE, exact=False):
+    n1 = tuple(coordinates_of(first.normal_vector))
+    n2 = tuple(coordinates_of(second.normal_vector))
+    if exact:
+        if all(is_zero(x) for x in n1) or all(is_zero(x) for x in n2):
+            return False
+    elif all(abs(Decimal(x)) < tolerance for x in n1) or all(abs(Decimal(x)) < tolerance for x in n2):
+        return False
+    return proportional(n1 + (first.constant_term,), n2 + (second.constant_term,), tolerance, exact)
@@ -0,0 +1,88 @@
+from math import sqrt
+from decimal import getcontext
+
+from vector import Vector
+
+getcontext().prec = 30
+
+# turn Vectors or plain sequences of numbers into float lists, checking their dimension
+def as_float_rows(vectors, dimension=None):
+    rows = []
+    for v in vectors:
+        if isinstance(v, Vector):
+            v = v.coordinates
+        if dimension is None:
+            dimension = len(v)
+        if len(v) != dimension:
+            raise Exception(ProjectionEngine.VECTORS_MUST_SHARE_DIMENSION_MSG)
+        rows.append([float(x) for x in v])
+    return rows
+
+# projections onto the subspace spanned by a set of vectors, and onto its orthogonal complement.
+# the orthonormal basis is built once (modified gram-schmidt with a second reorthogonalization pass,
+# dropping dependent vectors) and reused by every projection call.  inputs may be Vectors or sequences;
+# results are float lists, one per input vector
+class ProjectionEngine(object):
+
+    VECTORS_MUST_SHARE_DIMENSION_MSG = 'All vectors must live in the same dimension'
+    DIMENSION_REQUIRED_MSG = 'The dimension must be given when the spanning set is empty'
+
+    def __init__(self, vectors, dimension=None, tolerance=1e-10):
+        vectors = list(vectors)
+        if dimension is None:
+            if not vectors:
+                raise Exception(self.DIMENSION_REQUIRED_MSG)
+            first = vectors[0]
+            dimension = first.dimension if isinstance(first, Vector) else len(first)
+
+        self.dimension = dimension
+        self.tolerance = tolerance
+        self.spanning_set = as_float_rows(vectors, dimension)
+        self.basis = None
+
+    def orthonormal_basis(self):
+        if self.basis is None:
+            basis = []
+            for v in self.spanning_set:
+                w = list(v)
+                for _ in range(2):
+                    for q in basis:
+                        s = sum(wi * qi for wi, qi in zip(w, q))
+                        w = [wi - s * qi for wi, qi in zip(w, q)]
+                magnitude = sqrt(sum(wi * wi for wi in w))
+                if magnitude > self.tolerance:
+                    basis.append([wi / magnitude for wi in w])
+            self.basis = basis
+        return self.basis
+
+    def rank(self):
+        return len(self.orthonormal_basis())
+
+    # coordinates of each vector's projection in terms of the orthonormal basis
+    def coefficients(self, vectors):
+        basis = self.orthonormal_basis()
+        return [[sum(vi * qi for vi, qi in zip(v, q)) for q in basis]
+                for v in as_float_rows(vectors, self.dimension)]
+
+    # (parallel components, orthogonal components) for a batch of vectors, in one pass
+    def decompose(self, vectors):
+        basis = self.orthonormal_basis()
+        parallels = []
+        perps = []
+        for v in as_float_rows(vectors, self.dimension):
+            parallel = [0.0] * self.dimension
+            for q in basis:
+                s = sum(vi * qi for vi, qi in zip(v, q))
+                for i, qi in enumerate(q):
+                    parallel[i] += s * qi
+            parallels.append(parallel)
+            perps.append([vi - pi for vi, pi in zip(v, parallel)])
+        return parallels, perps
+
+    # projection of each vector onto the span
+    def project(self, vectors):
+        return self.decompose(vectors)[0]
+
+    # projection of each vector onto the orthogonal complement of the span
+    def project_complement(self, vectors):
+        return self.decompose(vectors)[1]
@@ -0,0 +1,118 @@
+from decimal import Decimal, getcontext
+
+getcontext().prec = 30
+
+# householder qr with column pivoting (A P = Q R) on a list of rows, computed in Decimal.
+# Q is kept implicitly as the list of householder reflectors; R is stored column by column.
+# the pivoting moves the largest remaining column forward at each step, so the rank shows up as the
+# number of diagonal entries of R above the tolerance
+class QRDecomposition(object):
+
+    def __init__(self, rows, pivoting=True, tolerance=1e-10):
+        self.num_rows = len(rows)
+        self.num_cols = len(rows[0])
+        self.tolerance = Decimal(tolerance)
+
+        m = self.num_rows
+        n = self.num_cols
+        columns = [[Decimal(rows[i][j]) for i in range(m)] for j in range(n)]
+        self.permutation = list(range(n))
+        self.reflectors = []    # (k, v, 2 / v.v); H_k = I - (2 / v.v) v v^T acting on entries k..m-1
+        self.rank = 0
+
+        for k in range(min(m, n)):
+            if pivoting:
+                norms = [sum(x * x for x in columns[j][k:]) for j in range(k, n)]
+                p = k + norms.index(max(norms))
+                if p != k:
+                    columns[k], columns[p] = columns[p], columns[k]
+                    self.permutation[k], self.permutation[p] = self.permutation[p], self.permutation[k]
+
+            x = columns[k][k:]
+            alpha = sum(xi * xi for xi in x).sqrt()
+            if alpha < self.tolerance:
+                break
+
+            sign = 1 if x[0] >= 0 else -1
+            v = list(x)
+            v[0] += sign * alpha
+            vv = sum(vi * vi for vi in v)
+            if vv != 0:
+                scale = 2 / vv
+                for j in range(k + 1, n):
+                    column = columns[j]
+                    s = scale * sum(vi * column[k + i] for i, vi in enumerate(v))
+                    for i, vi in enumerate(v):
+                        column[k + i] -= s * vi
+                self.reflectors.append((k, v, scale))
+
+            columns[k][k] = -sign * alpha
+            for i in range(k + 1, m):
+                columns[k][i] = Decimal(0)
+            self.rank = k + 1
+
+        self.columns = columns
+
+    # R[i][j] (for the permuted columns)
+    def r(self, i, j):
+        return self.columns[j][i]
+
+    def diagonal(self):
+        return [self.columns[k][k] for k in range(min(self.num_rows, self.num_cols))]
+
+    # apply the given householder reflectors, in order, to y (in place)
+    @staticmethod
+    def reflect(y, reflectors):
+        for k, v, scale in reflectors:
+            s = scale * sum(vi * y[k + i] for i, vi in enumerate(v))
+            for i, vi in enumerate(v):
+                y[k + i] -= s * vi
+        return y
+
+    # Q^T b
+    def apply_qt(self, b):
+        return self.reflect([Decimal(x) for x in b], self.reflectors)
+
+    # solve R11 z = rhs for the leading rank x rank triangle of R
+    def back_substitute(self, rhs):
+        z = [Decimal(0)] * self.rank
+        for i in range(self.rank)[::-1]:
+            total = rhs[i] - sum(self.r(i, j) * z[j] for j in range(i + 1, self.rank))
+            z[i] = total / self.r(i, i)
+        return z
+
+    # least squares solution of A x ~= b.  returns (basepoint, direction_vectors, residual_norm):
+    # the basic solution (free variables set to zero), a basis for the null space of A (every point
+    # basepoint + sum t_i d_i fits equally well) and ||b - A x||
+    def solve_least_squares(self, b):
+        n = self.num_cols
+        y = self.apply_qt(b)
+        residual_norm = sum((yi * yi for yi in y[self.rank:]), Decimal(0)).sqrt()
+
+        basepoint = [Decimal(0)] * n
+        for i, zi in enumerate(self.back_substitute(y[:self.rank])):
+            basepoint[self.permutation[i]] = zi
+
+        return basepoint, self.null_space(), residual_norm
+
+    # basis of the null space of A: one vector per column beyond the rank
+    def null_space(self):
+        n = self.num_cols
+        basis = []
+        for free in range(self.rank, n):
+            z = self.back_substitute([-self.r(i, free) for i in range(self.rank)])
+            d = [Decimal(0)] * n
+            d[self.permutation[free]] = Decimal(1)
+            for i, zi in enumerate(z):
+                d[self.permutation[i]] = zi
+            basis.append(d)
+        return basis
+
+    # the first count columns of Q, i.e. Q e_j, by applying the reflectors in reverse order
+    def q_columns(self, count):
+        columns = []
+        for j in range(count):
+            y = [Decimal(0)] * self.num_rows
+            y[j] = Decimal(1)
+            columns.append(self.reflect(y, self.reflectors[::-1]))
+        return columns
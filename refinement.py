@@ -0,0 +1,121 @@
+from decimal import Decimal, getcontext, localcontext
+
+getcontext().prec = 30
+
+# mixed precision solves: factor the coefficient matrix once in float64, then repeatedly compute the
+# residual b - Ax in Decimal (context precision plus guard digits) and correct x by the float solve of
+# A dx = r.  each pass gains roughly the float precision less log10 of the condition number in digits, so
+# well conditioned systems reach full Decimal precision in two or three O(n^2) passes after one O(n^3)
+# float factorization
+
+# pivots smaller than this times the largest entry of the matrix mark it as (numerically) singular
+SINGULAR_PIVOT_RATIO = 1e-13
+
+# extra digits carried while accumulating a residual, so the cancellation in b - Ax doesn't eat into the
+# precision the refined solution can reach
+RESIDUAL_GUARD_DIGITS = 10
+
+# lu factorization with partial pivoting in floats.  a singular matrix isn't an error here: singular is
+# set and the caller falls back to exact elimination
+class FloatLU(object):
+    def __init__(self, rows):
+        lu = [[float(x) for x in row] for row in rows]
+        n = len(lu)
+        self.size = n
+        self.permutation = list(range(n))
+        self.singular = False
+        scale = max([abs(x) for row in lu for x in row] + [0.0])
+
+        for k in range(n):
+            p = max(range(k, n), key=lambda i: abs(lu[i][k]))
+            if abs(lu[p][k]) <= SINGULAR_PIVOT_RATIO * scale or scale == 0.0:
+                self.singular = True
+                break
+            if p != k:
+                lu[k], lu[p] = lu[p], lu[k]
+                self.permutation[k], self.permutation[p] = self.permutation[p], self.permutation[k]
+            pivot_row = lu[k]
+            pivot = pivot_row[k]
+            for i in range(k + 1, n):
+                row = lu[i]
+                if row[k] == 0.0:
+                    continue
+                factor = row[k] / pivot
+                row[k] = factor
+                row[k + 1:] = [a - factor * b for a, b in zip(row[k + 1:], pivot_row[k + 1:])]
+        self.lu = lu
+
+    # x with Ax = b (b as floats)
+    def solve(self, b):
+        n = self.size
+        lu = self.lu
+        y = [float(b[p]) for p in self.permutation]
+        for i in range(n):
+            row = lu[i]
+            y[i] -= sum(row[j] * y[j] for j in range(i))
+        for i in range(n)[::-1]:
+            row = lu[i]
+            y[i] = (y[i] - sum(row[j] * y[j] for j in range(i + 1, n))) / row[i]
+        return y
+
+    # x with A'x = b: solve U'z = b, then L'w = z, then undo the row permutation
+    def solve_transpose(self, b):
+        n = self.size
+        lu = self.lu
+        z = [float(x) for x in b]
+        for i in range(n):
+            z[i] = (z[i] - sum(lu[j][i] * z[j] for j in range(i))) / lu[i][i]
+        for i in range(n)[::-1]:
+            z[i] -= sum(lu[j][i] * z[j] for j in range(i + 1, n))
+        x = [0.0] * n
+        for k, p in enumerate(self.permutation):
+            x[p] = z[k]
+        return x
+
+class RefinementResult(object):
+    def __init__(self, solution, converged, iterations, correction_history):
+        self.solution = solution                        # list of Decimals
+        self.converged = converged
+        self.iterations = iterations
+        self.correction_history = correction_history    # ||dx|| / ||x|| (max norms) after each pass
+
+# b - Ax in Decimal, accumulated with RESIDUAL_GUARD_DIGITS beyond the context precision
+def decimal_residual(rows, b, x):
+    with localcontext() as context:
+        context.prec += RESIDUAL_GUARD_DIGITS
+        residual = [k - sum((a * xi for a, xi in zip(row, x) if a != 0), Decimal(0)) for row, k in zip(rows, b)]
+    return [+r for r in residual]
+
+# relative accuracy asked for when none is given: all but the last two digits of the context precision
+def default_tolerance():
+    return Decimal(10) ** (2 - getcontext().prec)
+
+# rows: square coefficient rows (Decimals), b: constants.  lu: an existing FloatLU of rows, to solve several
+# right hand sides against one factorization.  stops once the relative correction drops below tolerance,
+# or as soon as a correction fails to halve (the condition number is too large for refinement to converge)
+def refine(rows, b, tolerance=None, max_iterations=10, lu=None):
+    if tolerance is None:
+        tolerance = default_tolerance()
+    tolerance = Decimal(tolerance)
+    if lu is None:
+        lu = FloatLU(rows)
+    if lu.singular:
+        return RefinementResult(None, False, 0, [])
+
+    b = [Decimal(k) for k in b]
+    x = [Decimal(xi) for xi in lu.solve([float(k) for k in b])]
+    history = []
+    for iteration in range(1, max_iterations + 1):
+        residual = decimal_residual(rows, b, x)
+        correction = lu.solve([float(r) for r in residual])
+        x = [xi + Decimal(di) for xi, di in zip(x, correction)]
+
+        size = max(abs(xi) for xi in x) if x else Decimal(0)
+        change = Decimal(max(abs(di) for di in correction)) if correction else Decimal(0)
+        relative = change / size if size != 0 else change
+        history.append(relative)
+        if relative <= tolerance:
+            return RefinementResult(x, True, iteration, history)
+        if len(history) > 1 and relative > history[-2] / 2:
+            break
+    return RefinementResult(x, False, len(history), history)
@@ -0,0 +1,248 @@
+import csv
+import mmap
+import os
+import struct
+from decimal import Decimal, getcontext
+
+from vector import Vector
+from linsys import LinearSystem, Parametrization
+
+getcontext().prec = 30
+
+# binary layout (little endian):
+#   header: magic 'LSYS', version, kind, coefficient format, 1 pad byte,
+#           number of rows (int64), values per row (int64), fixed-point scale (int64)
+#   body:   rows * values_per_row contiguous float64 or int64 values
+# a LinearSystem row is [a_1, ..., a_n, k]; a Parametrization is stored as the basepoint
+# followed by its direction vectors, one per row
+MAGIC = b'LSYS'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBxqqq')
+
+KIND_LINEAR_SYSTEM = 1
+KIND_PARAMETRIZATION = 2
+
+FORMAT_FLOAT64 = 1
+FORMAT_FIXED_POINT = 2
+
+VALUE_CODES = {FORMAT_FLOAT64: 'd', FORMAT_FIXED_POINT: 'q'}
+
+# fixed-point values are int64s: with scale s only magnitudes below 2**63 / 10**s (about 9.2e6 at the
+# default 12) fit
+FIXED_POINT_MIN = -2 ** 63
+FIXED_POINT_MAX = 2 ** 63 - 1
+
+EMPTY_CSV_MSG = 'The csv file holds no rows'
+
+class BinaryWriter(object):
+
+    UNKNOWN_FORMAT_MSG = 'The coefficient format must be FORMAT_FLOAT64 or FORMAT_FIXED_POINT'
+    WRONG_ROW_LENGTH_MSG = 'Every row must have the same number of values'
+    VALUE_OUT_OF_RANGE_MSG = 'The value does not fit in a 64-bit fixed-point integer at this scale'
+
+    # values_per_row: n+1 for a system in n variables, n for a parametrization
+    # scale: number of decimal digits kept after the point when writing fixed-point values
+    def __init__(self, path, kind, values_per_row, coefficient_format=FORMAT_FLOAT64, scale=12):
+        if coefficient_format not in VALUE_CODES:
+            raise Exception(self.UNKNOWN_FORMAT_MSG)
+
+        self.path = path
+        self.kind = kind
+        self.values_per_row = values_per_row
+        self.coefficient_format = coefficient_format
+        self.scale = scale
+        self.num_rows = 0
+        self.row_struct = struct.Struct('<{}{}'.format(values_per_row, VALUE_CODES[coefficient_format]))
+        self.file = open(path, 'wb')
+        self.write_header()
+
+    def __enter__(self):
+        return self
+
+    # a write that fails part way leaves no file behind, rather than one whose header describes the rows
+    # written so far
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write_header(self):
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.kind, self.coefficient_format,
+                                    self.num_rows, self.values_per_row, self.scale))
+
+    def encode(self, value):
+        if self.coefficient_format == FORMAT_FLOAT64:
+            return float(value)
+        scaled = int(Decimal(value).scaleb(self.scale).to_integral_value())
+        if not FIXED_POINT_MIN <= scaled <= FIXED_POINT_MAX:
+            raise Exception(self.VALUE_OUT_OF_RANGE_MSG)
+        return scaled
+
+    def write_row(self, values):
+        if len(values) != self.values_per_row:
+            raise Exception(self.WRONG_ROW_LENGTH_MSG)
+        self.file.write(self.row_struct.pack(*[self.encode(x) for x in values]))
+        self.num_rows += 1
+
+    # the row count is only known at the end, so the header is rewritten on close
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.write_header()
+        self.file.close()
+
+    def discard(self):
+        if not self.file.closed:
+            self.file.close()
+        os.remove(self.path)
+
+class BinaryReader(object):
+
+    NOT_A_SYSTEM_FILE_MSG = 'The file is not a linear system file'
+    UNSUPPORTED_VERSION_MSG = 'Unsupported linear system file version'
+    WRONG_KIND_MSG = 'The file does not hold the requested kind of object'
+    TRUNCATED_FILE_MSG = 'The file is shorter than its header says'
+    MISSING_BASEPOINT_MSG = 'The parametrization file has no basepoint row'
+    NO_EQUATIONS_MSG = 'The linear system file holds no equations'
+
+    # the file is memory-mapped; rows are decoded on demand so only the rows being used are paged in
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = None
+        size = os.fstat(self.file.fileno()).st_size
+        if size < HEADER.size:
+            self.close()
+            raise Exception(self.NOT_A_SYSTEM_FILE_MSG)
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, kind, coefficient_format, num_rows, values_per_row, scale = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or coefficient_format not in VALUE_CODES or num_rows < 0 or values_per_row < 0:
+            self.close()
+            raise Exception(self.NOT_A_SYSTEM_FILE_MSG)
+        if version != VERSION:
+            self.close()
+            raise Exception(self.UNSUPPORTED_VERSION_MSG)
+
+        self.kind = kind
+        self.coefficient_format = coefficient_format
+        self.num_rows = num_rows
+        self.values_per_row = values_per_row
+        self.scale = scale
+        self.row_struct = struct.Struct('<{}{}'.format(values_per_row, VALUE_CODES[coefficient_format]))
+        if size < HEADER.size + num_rows * self.row_struct.size:
+            self.close()
+            raise Exception(self.TRUNCATED_FILE_MSG)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.num_rows
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+    def decode(self, value):
+        if self.coefficient_format == FORMAT_FLOAT64:
+            return Decimal(value)
+        return Decimal(value).scaleb(-self.scale)
+
+    # raw row values (floats or scaled integers), without any Decimal conversion
+    def raw_row(self, i):
+        return self.row_struct.unpack_from(self.map, HEADER.size + i * self.row_struct.size)
+
+    def row(self, i):
+        return [self.decode(x) for x in self.raw_row(i)]
+
+    def iter_rows(self):
+        for i in range(self.num_rows):
+            yield self.row(i)
+
+    def read_system(self):
+        if self.kind != KIND_LINEAR_SYSTEM:
+            raise Exception(self.WRONG_KIND_MSG)
+        if self.num_rows == 0:
+            raise Exception(self.NO_EQUATIONS_MSG)
+        return LinearSystem.from_augmented_rows(self.iter_rows())
+
+    def read_parametrization(self):
+        if self.kind != KIND_PARAMETRIZATION:
+            raise Exception(self.WRONG_KIND_MSG)
+        if self.num_rows == 0:
+            raise Exception(self.MISSING_BASEPOINT_MSG)
+        rows = self.iter_rows()
+        basepoint = Vector(next(rows))
+        return Parametrization(basepoint, [Vector(row) for row in rows])
+
+def write_system(system, path, coefficient_format=FORMAT_FLOAT64, scale=12):
+    with BinaryWriter(path, KIND_LINEAR_SYSTEM, system.dimension + 1, coefficient_format, scale) as writer:
+        for p in system.planes:
+            writer.write_row(list(p.normal_vector.coordinates) + [p.constant_term])
+
+def write_parametrization(parametrization, path, coefficient_format=FORMAT_FLOAT64, scale=12):
+    with BinaryWriter(path, KIND_PARAMETRIZATION, parametrization.dimension, coefficient_format, scale) as writer:
+        writer.write_row(parametrization.basepoint.coordinates)
+        for v in parametrization.direction_vectors:
+            writer.write_row(v.coordinates)
+
+def read_system(path):
+    with BinaryReader(path) as reader:
+        return reader.read_system()
+
+def read_parametrization(path):
+    with BinaryReader(path) as reader:
+        return reader.read_parametrization()
+
+# read a csv of augmented rows (a_1, ..., a_n, k per line) lazily, yielding lists of at most
+# chunk_size rows of coefficient strings.  blank lines and lines starting with '#' are skipped
+def iter_csv_chunks(path, chunk_size=1024):
+    chunk = []
+    with open(path, newline='') as f:
+        for fields in csv.reader(f):
+            if not fields or fields[0].lstrip().startswith('#'):
+                continue
+            chunk.append([x.strip() for x in fields])
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+# convert a csv of augmented rows to the binary format without building any Plane objects
+def import_csv_to_binary(csv_path, binary_path, coefficient_format=FORMAT_FLOAT64, scale=12, chunk_size=1024):
+    writer = None
+    try:
+        for chunk in iter_csv_chunks(csv_path, chunk_size):
+            if writer is None:
+                writer = BinaryWriter(binary_path, KIND_LINEAR_SYSTEM, len(chunk[0]), coefficient_format, scale)
+            for fields in chunk:
+                writer.write_row(fields)
+    except Exception:
+        if writer is not None:
+            writer.discard()
+        raise
+    if writer is None:
+        raise Exception(EMPTY_CSV_MSG)
+    writer.close()
+
+# build a LinearSystem from a csv of augmented rows, parsing the text one chunk at a time
+def read_csv_system(path, chunk_size=1024):
+    chunks = iter_csv_chunks(path, chunk_size)
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        raise Exception(EMPTY_CSV_MSG)
+
+    def rows():
+        for fields in first_chunk:
+            yield fields
+        for chunk in chunks:
+            for fields in chunk:
+                yield fields
+    return LinearSystem.from_augmented_rows(rows())
@@ -0,0 +1,393 @@
+from decimal import Decimal, getcontext
+from enum import Enum
+
+from vector import Vector
+from linsys import LinearSystem
+
+getcontext().prec = 30
+
+# linear programming over half-spaces.  a Plane or Hyperplane with normal vector a and constant term k
+# stands for the half-space a.x <= k when used as an inequality, and for the hyperplane a.x = k when used
+# as an equality.  problems are brought to standard form (min c.x, Ax = b, b >= 0, x >= 0: free variables
+# split into two nonnegative parts, one slack column per inequality, one artificial column per row) and
+# solved with the two phase revised simplex method
+
+# after this many pivots in a row that don't move the point, pricing switches to bland's rule, which
+# can't cycle
+DEGENERATE_PIVOTS_BEFORE_BLAND = 50
+
+# entries of the sparse basis inverse smaller than this are dropped
+SPARSE_DROP_TOLERANCE = 1e-15
+
+class LPStatus(Enum):
+    OPTIMAL = 'Optimal solution found'
+    INFEASIBLE = 'The constraints are infeasible'
+    UNBOUNDED = 'The objective is unbounded'
+    ITERATION_LIMIT = 'Iteration limit reached'
+
+class LPResult(object):
+    def __init__(self, status, point, objective_value, basis, iterations):
+        self.status = status
+        self.point = point                      # Vector, or None unless the status is OPTIMAL
+        self.objective_value = objective_value
+        self.basis = basis                      # standard form column per constraint row, for warm starts
+        self.iterations = iterations
+
+    def __str__(self):
+        if self.status != LPStatus.OPTIMAL:
+            return self.status.value
+        return '{}: {} at {}'.format(self.status.value, self.objective_value, self.point.coordinates)
+
+# basis inverse and basic values kept as the augmented rows [B^-1 | x_B] of a LinearSystem in Decimal, so
+# that a basis change is a gauss-jordan pivot done with LinearSystem's own row operations
+class DenseBackend(object):
+    def __init__(self, columns, b, tolerance):
+        self.num_rows = len(b)
+        self.columns = []
+        for column in columns:
+            dense = [Decimal(0)] * self.num_rows
+            for i, a in column:
+                dense[i] = Decimal(a)
+            self.columns.append(dense)
+        self.b = [Decimal(k) for k in b]
+        self.tolerance = Decimal(str(tolerance))
+        self.reset()
+
+    def reset(self):
+        rows = []
+        for i in range(self.num_rows):
+            row = [0] * (self.num_rows + 1)
+            row[i] = 1
+            row[-1] = self.b[i]
+            rows.append(row)
+        self.tableau = LinearSystem.from_augmented_rows(rows)
+
+    def number(self, x):
+        return Decimal(x)
+
+    def basic_values(self):
+        return [p.constant_term for p in self.tableau.planes]
+
+    # simplex multipliers y = c_B B^-1
+    def prices(self, basic_costs):
+        y = [Decimal(0)] * self.num_rows
+        for c, p in zip(basic_costs, self.tableau.planes):
+            if c != 0:
+                y = [yi + c * bi for yi, bi in zip(y, p.normal_vector.coordinates)]
+        return y
+
+    def reduced_cost(self, j, cost, y):
+        return cost - sum((yi * a for yi, a in zip(y, self.columns[j]) if a != 0), Decimal(0))
+
+    # B^-1 a_j
+    def basis_column(self, j):
+        column = self.columns[j]
+        return [sum((bi * a for bi, a in zip(p.normal_vector.coordinates, column) if a != 0), Decimal(0))
+                for p in self.tableau.planes]
+
+    def pivot(self, row, d):
+        self.tableau.multiply_coefficient_and_row(Decimal(1) / d[row], row)
+        for i, di in enumerate(d):
+            if i != row and di != 0:
+                self.tableau.add_multiple_times_row_to_row(-di, row, i)
+
+# basis inverse as sparse float rows (dicts of column -> value) and columns as (row, value) lists, for
+# large constraint sets where most coefficients are zero
+class SparseBackend(object):
+    def __init__(self, columns, b, tolerance):
+        self.num_rows = len(b)
+        self.columns = [[(i, float(a)) for i, a in column if a != 0] for column in columns]
+        self.b = [float(k) for k in b]
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self):
+        self.inverse = [{i: 1.0} for i in range(self.num_rows)]
+        self.values = list(self.b)
+
+    def number(self, x):
+        return float(x)
+
+    def basic_values(self):
+        return self.values
+
+    def prices(self, basic_costs):
+        y = {}
+        for c, row in zip(basic_costs, self.inverse):
+            if c != 0:
+                for k, v in row.items():
+                    y[k] = y.get(k, 0.0) + c * v
+        return y
+
+    def reduced_cost(self, j, cost, y):
+        return cost - sum(y.get(i, 0.0) * a for i, a in self.columns[j])
+
+    def basis_column(self, j):
+        column = self.columns[j]
+        return [sum(row.get(i, 0.0) * a for i, a in column) for row in self.inverse]
+
+    def pivot(self, row, d):
+        pivot_row = self.inverse[row]
+        scale = 1.0 / d[row]
+        for k in pivot_row:
+            pivot_row[k] *= scale
+        self.values[row] *= scale
+
+        for i, di in enumerate(d):
+            if i == row or di == 0:
+                continue
+            target = self.inverse[i]
+            for k, v in pivot_row.items():
+                value = target.get(k, 0.0) - di * v
+                if abs(value) > SPARSE_DROP_TOLERANCE:
+                    target[k] = value
+                else:
+                    target.pop(k, None)
+            self.values[i] -= di * self.values[row]
+
+# minimize (or maximize) objective.x subject to inequalities (a.x <= k for each Plane/Hyperplane),
+# equalities (a LinearSystem or a list of Planes/Hyperplanes, a.x = k) and, when nonnegative is set,
+# x >= 0.  objective may be None for a pure feasibility problem
+class LinearProgram(object):
+
+    DIMENSION_MISMATCH_MSG = 'The objective and every constraint must live in the same dimension'
+    DIMENSION_REQUIRED_MSG = 'Without an objective or constraints the dimension cannot be inferred'
+    UNKNOWN_BACKEND_MSG = 'The backend must be either "dense" or "sparse"'
+    UNKNOWN_PIVOT_RULE_MSG = 'The pivot rule must be either "dantzig" or "bland"'
+
+    BACKENDS = {'dense': DenseBackend, 'sparse': SparseBackend}
+    PIVOT_RULES = ('dantzig', 'bland')
+
+    def __init__(self, objective=None, inequalities=(), equalities=None, nonnegative=False, maximize=False):
+        self.inequalities = list(inequalities)
+        if isinstance(equalities, LinearSystem):
+            equalities = equalities.planes
+        self.equalities = list(equalities or [])
+        self.nonnegative = nonnegative
+        self.maximize = maximize
+
+        constraints = self.inequalities + self.equalities
+        if objective is not None:
+            self.objective = objective if isinstance(objective, Vector) else Vector(objective)
+        elif constraints:
+            self.objective = Vector(['0'] * constraints[0].dimension)
+        else:
+            raise Exception(self.DIMENSION_REQUIRED_MSG)
+        self.dimension = self.objective.dimension
+
+        for p in constraints:
+            if p.dimension != self.dimension:
+                raise Exception(self.DIMENSION_MISMATCH_MSG)
+
+        self.build_standard_form()
+
+    # columns: structural variables (split into positive and negative parts unless nonnegative), then
+    # one slack per inequality, then one artificial per row.  rows with a negative constant are negated
+    def build_standard_form(self):
+        n = self.dimension
+        self.num_structural = n if self.nonnegative else 2 * n
+        self.num_columns = self.num_structural + len(self.inequalities)
+
+        constraints = self.inequalities + self.equalities
+        self.num_rows = len(constraints)
+        columns = [[] for _ in range(self.num_columns + self.num_rows)]
+        self.b = []
+        self.initial_basis = []
+
+        for i, p in enumerate(constraints):
+            sign = -1 if p.constant_term < 0 else 1
+            self.b.append(sign * p.constant_term)
+            for j, a in enumerate(p.normal_vector.coordinates):
+                if a != 0:
+                    columns[j].append((i, sign * a))
+                    if not self.nonnegative:
+                        columns[n + j].append((i, -sign * a))
+
+            artificial = self.num_columns + i
+            columns[artificial].append((i, 1))
+            if i < len(self.inequalities):
+                slack = self.num_structural + i
+                columns[slack].append((i, sign))
+                self.initial_basis.append(slack if sign > 0 else artificial)
+            else:
+                self.initial_basis.append(artificial)
+
+        self.columns = columns
+        costs = [c for c in self.objective.coordinates]
+        if self.maximize:
+            costs = [-c for c in costs]
+        if not self.nonnegative:
+            costs = costs + [-c for c in costs]
+        self.costs = costs + [0] * (len(columns) - len(costs))
+
+    def is_artificial(self, j):
+        return j >= self.num_columns
+
+    # solve the program.  basis: the basis of an earlier LPResult for a related problem (same variables,
+    # possibly changed objective, constants or appended inequalities).  it is used as the starting point
+    # when it is still feasible and ignored otherwise
+    def solve(self, backend='dense', pivot_rule='dantzig', basis=None, tolerance=1e-10, max_iterations=None):
+        return self.run(backend, pivot_rule, basis, tolerance, max_iterations, optimize=True)
+
+    # phase one only: any point satisfying the constraints (status OPTIMAL), or INFEASIBLE
+    def find_feasible_point(self, backend='dense', pivot_rule='dantzig', basis=None, tolerance=1e-10,
+                            max_iterations=None):
+        return self.run(backend, pivot_rule, basis, tolerance, max_iterations, optimize=False)
+
+    def run(self, backend, pivot_rule, basis, tolerance, max_iterations, optimize):
+        if backend not in self.BACKENDS:
+            raise Exception(self.UNKNOWN_BACKEND_MSG)
+        if pivot_rule not in self.PIVOT_RULES:
+            raise Exception(self.UNKNOWN_PIVOT_RULE_MSG)
+        if max_iterations is None:
+            max_iterations = 50 * (self.num_rows + len(self.columns))
+
+        if self.num_rows == 0:
+            return self.solve_unconstrained(optimize)
+
+        engine = self.BACKENDS[backend](self.columns, self.b, tolerance)
+        simplex = RevisedSimplex(engine, pivot_rule, max_iterations)
+        simplex.basis = list(self.initial_basis)
+        if basis is not None:
+            self.warm_start(simplex, basis)
+
+        # phase one: drive the artificial variables to zero
+        if any(self.is_artificial(j) for j in simplex.basis):
+            phase_one_costs = [engine.number(1 if self.is_artificial(j) else 0) for j in range(len(self.columns))]
+            status = simplex.run(phase_one_costs, range(len(self.columns)))
+            if status == LPStatus.ITERATION_LIMIT:
+                return self.result(status, simplex)
+            infeasibility = sum(x for j, x in zip(simplex.basis, engine.basic_values()) if self.is_artificial(j))
+            if infeasibility > engine.tolerance * max(1, len(self.b)):
+                return self.result(LPStatus.INFEASIBLE, simplex)
+            self.drive_out_artificials(simplex)
+
+        if optimize:
+            costs = [engine.number(c) for c in self.costs]
+            status = simplex.run(costs, range(self.num_columns))
+            if status != LPStatus.OPTIMAL:
+                return self.result(status, simplex)
+        return self.result(LPStatus.OPTIMAL, simplex)
+
+    # pivot the columns of an old basis into the starting basis, largest pivot first; fall back to the
+    # cold start if that leaves the basic values infeasible
+    def warm_start(self, simplex, basis):
+        engine = simplex.engine
+        wanted = [j for j in basis if 0 <= j < self.num_columns]
+        for j in wanted:
+            if j in simplex.basis:
+                continue
+            d = engine.basis_column(j)
+            candidates = [i for i in range(self.num_rows) if simplex.basis[i] not in wanted and abs(d[i]) > engine.tolerance]
+            if candidates:
+                row = max(candidates, key=lambda i: abs(d[i]))
+                engine.pivot(row, d)
+                simplex.basis[row] = j
+
+        if any(x < -engine.tolerance for x in engine.basic_values()):
+            engine.reset()
+            simplex.basis = list(self.initial_basis)
+
+    # after phase one, artificial variables left in the basis sit at zero.  swap each for any real column
+    # with a nonzero entry in its row; a row with none is redundant and its artificial stays at zero
+    def drive_out_artificials(self, simplex):
+        engine = simplex.engine
+        for row, j in enumerate(simplex.basis):
+            if not self.is_artificial(j):
+                continue
+            basic = set(simplex.basis)
+            for k in range(self.num_columns):
+                if k in basic:
+                    continue
+                d = engine.basis_column(k)
+                if abs(d[row]) > engine.tolerance:
+                    engine.pivot(row, d)
+                    simplex.basis[row] = k
+                    break
+
+    def solve_unconstrained(self, optimize):
+        unbounded = optimize and any((c < 0 if self.nonnegative else c != 0) for c in self.costs[:self.num_structural])
+        if unbounded:
+            return LPResult(LPStatus.UNBOUNDED, None, None, [], 0)
+        return LPResult(LPStatus.OPTIMAL, Vector(['0'] * self.dimension), Decimal(0), [], 0)
+
+    def result(self, status, simplex):
+        if status != LPStatus.OPTIMAL:
+            return LPResult(status, None, None, list(simplex.basis), simplex.iterations)
+
+        values = [Decimal(0)] * self.num_columns
+        for j, x in zip(simplex.basis, simplex.engine.basic_values()):
+            if not self.is_artificial(j):
+                values[j] = Decimal(x)
+
+        n = self.dimension
+        if self.nonnegative:
+            coordinates = values[:n]
+        else:
+            coordinates = [values[j] - values[n + j] for j in range(n)]
+        point = Vector(coordinates)
+        objective_value = sum((c * x for c, x in zip(self.objective.coordinates, coordinates)), Decimal(0))
+        return LPResult(status, point, objective_value, list(simplex.basis), simplex.iterations)
+
+# the iteration shared by both phases: price the allowed nonbasic columns against y = c_B B^-1, bring in
+# the most negative reduced cost (dantzig) or the lowest numbered negative one (bland), pick the leaving
+# row by the ratio test with ties going to the lowest numbered basic variable, pivot
+class RevisedSimplex(object):
+    def __init__(self, engine, pivot_rule, max_iterations):
+        self.engine = engine
+        self.pivot_rule = pivot_rule
+        self.max_iterations = max_iterations
+        self.basis = []
+        self.iterations = 0
+
+    def run(self, costs, allowed_columns):
+        engine = self.engine
+        tolerance = engine.tolerance
+        degenerate_pivots = 0
+
+        while self.iterations < self.max_iterations:
+            bland = self.pivot_rule == 'bland' or degenerate_pivots >= DEGENERATE_PIVOTS_BEFORE_BLAND
+            y = engine.prices([costs[j] for j in self.basis])
+            basic = set(self.basis)
+
+            entering = None
+            best = -tolerance
+            for j in allowed_columns:
+                if j in basic:
+                    continue
+                reduced_cost = engine.reduced_cost(j, costs[j], y)
+                if reduced_cost < best:
+                    entering = j
+                    if bland:
+                        break
+                    best = reduced_cost
+            if entering is None:
+                return LPStatus.OPTIMAL
+
+            d = engine.basis_column(entering)
+            values = engine.basic_values()
+            leaving = None
+            for i, di in enumerate(d):
+                if di <= tolerance:
+                    continue
+                ratio = max(values[i], 0) / di
+                if (leaving is None or ratio < best_ratio - tolerance
+                        or (ratio <= best_ratio + tolerance and self.basis[i] < self.basis[leaving])):
+                    leaving = i
+                    best_ratio = ratio
+            if leaving is None:
+                return LPStatus.UNBOUNDED
+
+            degenerate_pivots = degenerate_pivots + 1 if best_ratio <= tolerance else 0
+            engine.pivot(leaving, d)
+            self.basis[leaving] = entering
+            self.iterations += 1
+
+        return LPStatus.ITERATION_LIMIT
+
+# a point in the intersection of the half-spaces (and hyperplanes), or None when it is empty
+def feasible_point(inequalities, equalities=None, backend='dense'):
+    result = LinearProgram(None, inequalities, equalities).find_feasible_point(backend)
+    if result.status != LPStatus.OPTIMAL:
+        return None
+    return result.point
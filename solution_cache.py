@@ -0,0 +1,100 @@
+import time
+from collections import OrderedDict
+from decimal import getcontext
+from threading import Lock
+
+from canonical import canonical_form
+
+getcontext().prec = 30
+
+class CacheStats(object):
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def __str__(self):
+        return 'hits: {}, misses: {}, evictions: {}, expirations: {}, hit rate: {:.1%}'.format(
+            self.hits, self.misses, self.evictions, self.expirations, self.hit_rate())
+
+# canonical key for a system, equal for systems that differ only in row order, row scaling and
+# duplicated rows.  each row's normal vector is scaled to unit length with its first nonzero coefficient
+# positive, the coefficients are quantized to multiples of tolerance (canonical.canonical_form), and the
+# rows are sorted.  rows reading 0 = 0 carry no information and are dropped
+def canonical_key(system, tolerance=1e-10):
+    rows = set(canonical_form(p, tolerance) for p in system.planes)
+    rows.discard((0,) * (system.dimension + 1))
+    return (system.dimension, tuple(sorted(rows)))
+
+# lru cache in front of LinearSystem.compute_solution.  cached results are shared between callers,
+# so they should be treated as read only
+class SolutionCache(object):
+
+    MAX_SIZE_MUST_BE_POSITIVE_MSG = 'The cache size must be at least one entry'
+
+    # max_size: entries kept before the least recently used one is evicted
+    # ttl: seconds an entry stays valid (None keeps entries until evicted)
+    # tolerance: quantization step for the canonical form
+    def __init__(self, max_size=1024, ttl=None, tolerance=1e-10, clock=time.monotonic):
+        if max_size < 1:
+            raise Exception(self.MAX_SIZE_MUST_BE_POSITIVE_MSG)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.tolerance = tolerance
+        self.clock = clock
+        self.entries = OrderedDict()    # key -> (time stored, solution)
+        self.stats = CacheStats()
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, system):
+        return self.lookup(canonical_key(system, self.tolerance), count=False) is not None
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def compute_solution(self, system):
+        key = canonical_key(system, self.tolerance)
+        entry = self.lookup(key)
+        if entry is not None:
+            return entry[1]
+
+        solution = system.compute_solution()
+        self.store(key, solution)
+        return solution
+
+    def lookup(self, key, count=True):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl is not None and self.clock() - entry[0] > self.ttl:
+                del self.entries[key]
+                self.stats.expirations += 1
+                entry = None
+
+            if entry is None:
+                if count:
+                    self.stats.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            if count:
+                self.stats.hits += 1
+            return entry
+
+    def store(self, key, solution):
+        with self.lock:
+            self.entries[key] = (self.clock(), solution)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.stats.evictions += 1
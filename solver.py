@@ -0,0 +1,167 @@
+import threading
+from decimal import Decimal, getcontext
+
+from vector import Vector
+from linsys import LinearSystem, Parametrization, SolutionStatus, MyDecimal
+
+getcontext().prec = 30
+
+# a rebuilt Plane/Hyperplane stores any zero constant term (-0, 0E-31, ...) as Decimal('0'); do the same
+def normalize_constant(row, n):
+    if not row[n]:
+        row[n] = ZERO_CONSTANT
+
+ZERO_CONSTANT = Decimal('0')
+
+# augmented rows preallocated for systems of up to max_equations x max_variables.  a solve copies the
+# system's coefficients into the existing row lists and eliminates there, so no working copy, Plane or
+# Vector is built per row operation.  row swaps swap the list references
+class Workspace(object):
+    def __init__(self, max_equations, max_variables):
+        self.max_equations = max_equations
+        self.max_variables = max_variables
+        zero = Decimal(0)
+        self.rows = [[zero] * (max_variables + 1) for _ in range(max_equations)]
+        self.pivot_indices = [-1] * max_equations
+        self.num_equations = 0
+        self.num_variables = 0
+
+    def load(self, system):
+        n = system.dimension
+        self.num_equations = len(system)
+        self.num_variables = n
+        for row, p in zip(self.rows, system.planes):
+            row[:n] = p.normal_vector.coordinates
+            row[n] = p.constant_term
+        for i in range(self.num_equations):
+            self.pivot_indices[i] = -1
+
+# gauss-jordan elimination on a reusable per thread Workspace.  gives the same results as
+# LinearSystem.solve / compute_solution (the same row operations in the same order, including the
+# structured fast path and the deferred error bounds of unique solutions), without the per solve
+# allocations of the working copy and of the rebuilt rows.
+# one Solver can be shared between threads: each thread gets its own workspace on first use
+class Solver(object):
+
+    SYSTEM_TOO_LARGE_MSG = 'The system is larger than the workspace this solver was created for'
+
+    def __init__(self, max_equations, max_variables=None):
+        if max_variables is None:
+            max_variables = max_equations
+        self.max_equations = max_equations
+        self.max_variables = max_variables
+        self.local = threading.local()
+
+    # this thread's workspace
+    def workspace(self):
+        workspace = getattr(self.local, 'workspace', None)
+        if workspace is None:
+            workspace = Workspace(self.max_equations, self.max_variables)
+            self.local.workspace = workspace
+        return workspace
+
+    def compute_solution(self, system):
+        status, parametrization = self.solve(system)
+        if status == SolutionStatus.NONE:
+            return LinearSystem.NO_SOLUTIONS_MSG
+        return parametrization
+
+    # (SolutionStatus, Parametrization or None), like LinearSystem.solve
+    def solve(self, system):
+        if len(system) > self.max_equations or system.dimension > self.max_variables:
+            raise Exception(self.SYSTEM_TOO_LARGE_MSG)
+
+        if system.use_structure:
+            parametrization = system.solve_by_structure()
+            if parametrization is not None:
+                return SolutionStatus.UNIQUE, system.bounded(parametrization)
+
+        workspace = self.workspace()
+        workspace.load(system)
+        if system.stats is not None:
+            system.stats.count('workspace_solves')
+        self.triangularize(workspace)
+        self.reduce(workspace)
+
+        m = workspace.num_equations
+        n = workspace.num_variables
+        rows = workspace.rows
+        pivot_indices = workspace.pivot_indices
+
+        for i in range(m):
+            if pivot_indices[i] < 0 and not MyDecimal(rows[i][n]).is_near_zero():
+                system.record_solve_path('workspace_elimination')
+                return SolutionStatus.NONE, None
+
+        pivot_rows = [(i, pivot_indices[i]) for i in range(m) if pivot_indices[i] >= 0]
+        pivot_columns = set(j for _, j in pivot_rows)
+
+        direction_vectors = []
+        for free_var in range(n):
+            if free_var in pivot_columns:
+                continue
+            coords = [0] * n
+            coords[free_var] = 1
+            for i, pivot_var in pivot_rows:
+                coords[pivot_var] = -rows[i][free_var]
+            direction_vectors.append(Vector(coords))
+
+        basepoint_coords = [0] * n
+        for i, pivot_var in pivot_rows:
+            basepoint_coords[pivot_var] = rows[i][n]
+
+        system.record_solve_path('workspace_elimination')
+        if direction_vectors:
+            return SolutionStatus.INFINITE, Parametrization(Vector(basepoint_coords), direction_vectors)
+        return SolutionStatus.UNIQUE, system.bounded(Parametrization(Vector(basepoint_coords), []))
+
+    # LinearSystem.compute_triangular_form on the workspace rows
+    def triangularize(self, workspace):
+        m = workspace.num_equations
+        n = workspace.num_variables
+        rows = workspace.rows
+        j = 0
+        for i in range(m):
+            while j < n:
+                if MyDecimal(rows[i][j]).is_near_zero():
+                    for k in range(i + 1, m):
+                        if not MyDecimal(rows[k][j]).is_near_zero():
+                            rows[i], rows[k] = rows[k], rows[i]
+                            break
+                    else:
+                        j += 1
+                        continue
+
+                pivot_row = rows[i]
+                beta = pivot_row[j]
+                for k in range(i + 1, m):
+                    target = rows[k]
+                    alpha = -target[j] / beta
+                    for c in range(n + 1):
+                        target[c] = alpha * pivot_row[c] + target[c]
+                    normalize_constant(target, n)
+                workspace.pivot_indices[i] = j
+                j += 1
+                break
+
+    # LinearSystem.compute_rref's back substitution on the workspace rows
+    def reduce(self, workspace):
+        m = workspace.num_equations
+        n = workspace.num_variables
+        rows = workspace.rows
+        one = Decimal('1.0')
+        for i in range(m)[::-1]:
+            j = workspace.pivot_indices[i]
+            if j < 0:
+                continue
+            pivot_row = rows[i]
+            beta = Decimal(one / pivot_row[j])
+            for c in range(n + 1):
+                pivot_row[c] = beta * pivot_row[c]
+            normalize_constant(pivot_row, n)
+            for k in range(i)[::-1]:
+                target = rows[k]
+                alpha = -(target[j])
+                for c in range(n + 1):
+                    target[c] = alpha * pivot_row[c] + target[c]
+                normalize_constant(target, n)
@@ -0,0 +1,279 @@
+from decimal import getcontext
+
+from matrix import Matrix
+from linsys import LinearSystem
+import eigen
+
+getcontext().prec = 30
+
+# compressed sparse row (CSR) and column (CSC) matrices.  both keep three lists:
+#   data     the nonzero values, one major line (row for CSR, column for CSC) after another
+#   indices  the minor index (column for CSR, row for CSC) of each value, increasing within a line
+#   pointers line i holds data[pointers[i]:pointers[i+1]], so len(pointers) is one more than the lines
+# products touch only the stored nonzeros: a matrix-vector product costs O(nnz) and a sparse product
+# O(flops) rather than the O(n^3) of matrix_multiplication on nested lists.  the csr arrays of A are the
+# csc arrays of A', so transpose() just relabels them; to_csc()/to_csr() reorder the values for the same
+# matrix in the other layout, in O(nnz + n).  values keep their type (ints, floats or Decimals)
+# both are Matrix variants: solve, detect_structure and the eigen routines work on a dense copy (vals),
+# built on first use, except top_eigenpairs, which only needs products and runs on the nonzeros
+
+SHAPE_MISMATCH_MSG = 'The matrix dimensions do not match'
+INVALID_LAYOUT_MSG = 'The pointers must start at zero, never decrease and end at the number of values'
+
+class CompressedMatrix(Matrix):
+    # matrices share the lists passed in (transpose() relies on this), so treat them as read only
+    def __init__(self, data, indices, pointers, rows, cols):
+        if len(data) != len(indices) or not pointers or pointers[0] != 0 or pointers[-1] != len(data) \
+                or any(pointers[i] > pointers[i + 1] for i in range(len(pointers) - 1)):
+            raise Exception(INVALID_LAYOUT_MSG)
+        self.data = data
+        self.indices = indices
+        self.pointers = pointers
+        self.rows = rows
+        self.cols = cols
+        self.element_count = rows
+        self.dense_rows = None
+
+    # the dense rows Matrix keeps in vals
+    @property
+    def vals(self):
+        if self.dense_rows is None:
+            self.dense_rows = self.to_dense_rows()
+        return self.dense_rows
+
+    # the operator interface of eigen.top_eigenpairs (and iterative.SparseSystem)
+    @property
+    def num_variables(self):
+        return self.cols
+
+    def multiply(self, x):
+        return self.multiply_vector(x)
+
+    def top_eigenpairs(self, k=1, method='lanczos', tolerance=1e-8):
+        if self.rows != self.cols:
+            raise Exception(eigen.NOT_SQUARE_MSG)
+        return Matrix.top_eigenpairs(self, k, method, tolerance)
+
+    def nnz(self):
+        return len(self.data)
+
+    def density(self):
+        cells = self.rows * self.cols
+        return len(self.data) / float(cells) if cells else 0.0
+
+    def to_dense(self):
+        return Matrix(self.to_dense_rows())
+
+    # the equations [a_i1 ... a_in] . x = constants[i] of this matrix
+    def to_linear_system(self, constants):
+        if len(constants) != self.rows:
+            raise Exception(SHAPE_MISMATCH_MSG)
+        return LinearSystem.from_augmented_rows([row + [k] for row, k in zip(self.to_dense_rows(), constants)])
+
+# the same values with major and minor swapped (a counting sort on the minor index): csr arrays in, csc
+# arrays of the same matrix out, and the other way round
+def switch_layout(data, indices, pointers, num_minor):
+    counts = [0] * (num_minor + 1)
+    for j in indices:
+        counts[j + 1] += 1
+    for j in range(num_minor):
+        counts[j + 1] += counts[j]
+    new_pointers = list(counts)
+
+    new_data = [None] * len(data)
+    new_indices = [0] * len(data)
+    for i in range(len(pointers) - 1):
+        for k in range(pointers[i], pointers[i + 1]):
+            position = counts[indices[k]]
+            new_data[position] = data[k]
+            new_indices[position] = i
+            counts[indices[k]] += 1
+    return new_data, new_indices, new_pointers
+
+# compress the nonzeros (abs(value) > tolerance) of nested lists along their rows
+def compress_rows(rows, tolerance=0):
+    data = []
+    indices = []
+    pointers = [0]
+    for row in rows:
+        for j, a in enumerate(row):
+            if abs(a) > tolerance:
+                data.append(a)
+                indices.append(j)
+        pointers.append(len(data))
+    return data, indices, pointers
+
+def dense_rows_of(matrix):
+    return matrix.vals if isinstance(matrix, Matrix) else matrix
+
+class CSRMatrix(CompressedMatrix):
+
+    # matrix: a Matrix or a list of rows.  entries with abs(value) <= tolerance are dropped
+    @staticmethod
+    def from_dense(matrix, tolerance=0):
+        rows = dense_rows_of(matrix)
+        data, indices, pointers = compress_rows(rows, tolerance)
+        return CSRMatrix(data, indices, pointers, len(rows), len(rows[0]) if rows else 0)
+
+    # (row, column, value) triplets in any order; duplicates are added together
+    @staticmethod
+    def from_triplets(triplets, rows, cols):
+        lines = [{} for _ in range(rows)]
+        for i, j, a in triplets:
+            if not 0 <= i < rows or not 0 <= j < cols:
+                raise Exception(SHAPE_MISMATCH_MSG)
+            lines[i][j] = lines[i].get(j, 0) + a
+        return CSRMatrix.from_lines(lines, cols)
+
+    # rows as {column: value} dictionaries; zeros are dropped
+    @staticmethod
+    def from_lines(lines, cols):
+        data = []
+        indices = []
+        pointers = [0]
+        for line in lines:
+            for j in sorted(line):
+                if line[j] != 0:
+                    data.append(line[j])
+                    indices.append(j)
+            pointers.append(len(data))
+        return CSRMatrix(data, indices, pointers, len(lines), cols)
+
+    # (coefficient matrix, constants) of a LinearSystem
+    @staticmethod
+    def from_linear_system(system, tolerance=0):
+        matrix = CSRMatrix.from_dense([p.normal_vector.coordinates for p in system.planes], tolerance)
+        matrix.cols = system.dimension
+        return matrix, [p.constant_term for p in system.planes]
+
+    def to_dense_rows(self):
+        result = [[0] * self.cols for _ in range(self.rows)]
+        for i in range(self.rows):
+            row = result[i]
+            for k in range(self.pointers[i], self.pointers[i + 1]):
+                row[self.indices[k]] = self.data[k]
+        return result
+
+    def element(self, i, j):
+        for k in range(self.pointers[i], self.pointers[i + 1]):
+            if self.indices[k] == j:
+                return self.data[k]
+        return 0
+
+    # csc arrays of the transpose: no copying
+    def transpose(self):
+        return CSCMatrix(self.data, self.indices, self.pointers, self.cols, self.rows)
+
+    def to_csr(self):
+        return self
+
+    def to_csc(self):
+        data, indices, pointers = switch_layout(self.data, self.indices, self.pointers, self.cols)
+        return CSCMatrix(data, indices, pointers, self.rows, self.cols)
+
+    # SpMV: one pass over the nonzeros, a dot product per row
+    def multiply_vector(self, x):
+        if len(x) != self.cols:
+            raise Exception(SHAPE_MISMATCH_MSG)
+        data, indices, pointers = self.data, self.indices, self.pointers
+        return [sum([a * x[j] for a, j in zip(data[start:stop], indices[start:stop])], 0)
+                for start, stop in zip(pointers, pointers[1:])]
+
+    # SpMM.  a sparse other (csr or csc) gives a CSRMatrix, by gustavson's row by row method: row i of the
+    # product is the sum of the rows of other picked out by the nonzeros of row i here.  a dense other
+    # (Matrix or list of rows) gives a Matrix
+    def multiply_matrix(self, other):
+        if not isinstance(other, CompressedMatrix):
+            return self.multiply_dense(dense_rows_of(other))
+        if self.cols != other.rows:
+            raise Exception(SHAPE_MISMATCH_MSG)
+        other = other.to_csr()
+        data, indices, pointers = self.data, self.indices, self.pointers
+        other_data, other_indices, other_pointers = other.data, other.indices, other.pointers
+
+        lines = []
+        for i in range(self.rows):
+            line = {}
+            for k in range(pointers[i], pointers[i + 1]):
+                a = data[k]
+                j = indices[k]
+                for l in range(other_pointers[j], other_pointers[j + 1]):
+                    c = other_indices[l]
+                    line[c] = line.get(c, 0) + a * other_data[l]
+            lines.append(line)
+        return CSRMatrix.from_lines(lines, other.cols)
+
+    def multiply_dense(self, rows):
+        if self.cols != len(rows):
+            raise Exception(SHAPE_MISMATCH_MSG)
+        width = len(rows[0]) if rows else 0
+        result = []
+        for i in range(self.rows):
+            out = [0] * width
+            for k in range(self.pointers[i], self.pointers[i + 1]):
+                a = self.data[k]
+                out = [o + a * b for o, b in zip(out, rows[self.indices[k]])]
+            result.append(out)
+        return Matrix(result)
+
+class CSCMatrix(CompressedMatrix):
+
+    @staticmethod
+    def from_dense(matrix, tolerance=0):
+        return CSRMatrix.from_dense(matrix, tolerance).to_csc()
+
+    @staticmethod
+    def from_triplets(triplets, rows, cols):
+        return CSRMatrix.from_triplets([(j, i, a) for i, j, a in triplets], cols, rows).transpose()
+
+    @staticmethod
+    def from_linear_system(system, tolerance=0):
+        matrix, constants = CSRMatrix.from_linear_system(system, tolerance)
+        return matrix.to_csc(), constants
+
+    def to_dense_rows(self):
+        result = [[0] * self.cols for _ in range(self.rows)]
+        for j in range(self.cols):
+            for k in range(self.pointers[j], self.pointers[j + 1]):
+                result[self.indices[k]][j] = self.data[k]
+        return result
+
+    def element(self, i, j):
+        for k in range(self.pointers[j], self.pointers[j + 1]):
+            if self.indices[k] == i:
+                return self.data[k]
+        return 0
+
+    # csr arrays of the transpose: no copying
+    def transpose(self):
+        return CSRMatrix(self.data, self.indices, self.pointers, self.cols, self.rows)
+
+    def to_csc(self):
+        return self
+
+    def to_csr(self):
+        data, indices, pointers = switch_layout(self.data, self.indices, self.pointers, self.rows)
+        return CSRMatrix(data, indices, pointers, self.rows, self.cols)
+
+    # SpMV by columns: scatter x[j] times column j into the result, skipping zero entries of x
+    def multiply_vector(self, x):
+        if len(x) != self.cols:
+            raise Exception(SHAPE_MISMATCH_MSG)
+        data, indices, pointers = self.data, self.indices, self.pointers
+        y = [0] * self.rows
+        for j in range(self.cols):
+            xj = x[j]
+            if xj == 0:
+                continue
+            for k in range(pointers[j], pointers[j + 1]):
+                y[indices[k]] += data[k] * xj
+        return y
+
+    # SpMM.  a sparse other gives a CSCMatrix, through AB = (B'A')' on the csr views of the transposes;
+    # a dense other gives a Matrix
+    def multiply_matrix(self, other):
+        if not isinstance(other, CompressedMatrix):
+            return self.to_csr().multiply_dense(dense_rows_of(other))
+        if self.cols != other.rows:
+            raise Exception(SHAPE_MISMATCH_MSG)
+        return other.to_csc().transpose().multiply_matrix(self.transpose()).transpose()
@@ -0,0 +1,189 @@
+from decimal import getcontext
+
+getcontext().prec = 30
+
+# sparsity structure of square coefficient matrices, and direct solvers that only touch the nonzero band.
+# rows are sequences of numbers (Decimal for LinearSystems).  the solvers return None when they hit a (near)
+# zero pivot, in which case the caller falls back to general elimination (which also sorts out singular systems)
+
+DIAGONAL = 'diagonal'
+UPPER_TRIANGULAR = 'upper_triangular'
+LOWER_TRIANGULAR = 'lower_triangular'
+TRIDIAGONAL = 'tridiagonal'
+BANDED = 'banded'
+GENERAL = 'general'
+
+# pivots this close to zero count as zero, as in LinearSystem's elimination
+ZERO_PIVOT_TOLERANCE = 1e-10
+
+# name of the solver each structure dispatches to
+SOLVER_PATHS = {
+    DIAGONAL: 'diagonal',
+    UPPER_TRIANGULAR: 'back_substitution',
+    LOWER_TRIANGULAR: 'forward_substitution',
+    TRIDIAGONAL: 'thomas',
+    BANDED: 'banded_lu',
+    GENERAL: 'gaussian_elimination',
+}
+
+class MatrixStructure(object):
+    def __init__(self, kind, lower_bandwidth, upper_bandwidth):
+        self.kind = kind
+        self.lower_bandwidth = lower_bandwidth      # rows below the diagonal holding nonzeros
+        self.upper_bandwidth = upper_bandwidth      # rows above the diagonal holding nonzeros
+
+    def solver_path(self):
+        return SOLVER_PATHS[self.kind]
+
+    def __str__(self):
+        return '{} (lower bandwidth {}, upper bandwidth {})'.format(self.kind, self.lower_bandwidth,
+                                                                    self.upper_bandwidth)
+
+# one pass over the entries.  non-square matrices are always GENERAL.  tridiagonal needs at least 3 rows
+# (any 2x2 matrix has bandwidths of 1), and banded needs the band to cover at most half the rows
+# (lower + upper + 1 <= n // 2), so that the O(n * lower * upper) banded solver clearly beats dense
+# elimination; wider bands are GENERAL
+def detect_structure(rows, tolerance=0):
+    n = len(rows)
+    if n == 0 or any(len(row) != n for row in rows):
+        return MatrixStructure(GENERAL, None, None)
+
+    lower = 0
+    upper = 0
+    for i, row in enumerate(rows):
+        for j, a in enumerate(row):
+            if abs(a) > tolerance:
+                if j < i:
+                    lower = max(lower, i - j)
+                elif j > i:
+                    upper = max(upper, j - i)
+
+    if lower == 0 and upper == 0:
+        kind = DIAGONAL
+    elif lower == 0:
+        kind = UPPER_TRIANGULAR
+    elif upper == 0:
+        kind = LOWER_TRIANGULAR
+    elif lower == 1 and upper == 1 and n >= 3:
+        kind = TRIDIAGONAL
+    elif lower + upper + 1 <= n // 2:
+        kind = BANDED
+    else:
+        kind = GENERAL
+    return MatrixStructure(kind, lower, upper)
+
+def is_zero_pivot(x):
+    return abs(x) <= ZERO_PIVOT_TOLERANCE
+
+def solve_diagonal(rows, b):
+    solution = []
+    for i, k in enumerate(b):
+        if is_zero_pivot(rows[i][i]):
+            return None
+        solution.append(k / rows[i][i])
+    return solution
+
+# back substitution, reading only the upper_bandwidth entries right of each diagonal
+def solve_upper_triangular(rows, b, upper_bandwidth=None):
+    n = len(b)
+    if upper_bandwidth is None:
+        upper_bandwidth = n - 1
+    solution = [0] * n
+    for i in range(n)[::-1]:
+        if is_zero_pivot(rows[i][i]):
+            return None
+        total = b[i]
+        for j in range(i + 1, min(n, i + upper_bandwidth + 1)):
+            total -= rows[i][j] * solution[j]
+        solution[i] = total / rows[i][i]
+    return solution
+
+def solve_lower_triangular(rows, b, lower_bandwidth=None):
+    n = len(b)
+    if lower_bandwidth is None:
+        lower_bandwidth = n - 1
+    solution = [0] * n
+    for i in range(n):
+        if is_zero_pivot(rows[i][i]):
+            return None
+        total = b[i]
+        for j in range(max(0, i - lower_bandwidth), i):
+            total -= rows[i][j] * solution[j]
+        solution[i] = total / rows[i][i]
+    return solution
+
+# thomas algorithm: elimination of the single subdiagonal, then back substitution, O(n)
+def solve_tridiagonal(rows, b):
+    n = len(b)
+    upper = [0] * n         # modified superdiagonal
+    rhs = [0] * n
+    for i in range(n):
+        diagonal = rows[i][i]
+        if i > 0:
+            sub = rows[i][i - 1]
+            diagonal -= sub * upper[i - 1]
+            total = b[i] - sub * rhs[i - 1]
+        else:
+            total = b[i]
+        if is_zero_pivot(diagonal):
+            return None
+        if i + 1 < n:
+            upper[i] = rows[i][i + 1] / diagonal
+        rhs[i] = total / diagonal
+
+    solution = [0] * n
+    for i in range(n)[::-1]:
+        solution[i] = rhs[i] - (upper[i] * solution[i + 1] if i + 1 < n else 0)
+    return solution
+
+# lu without pivoting restricted to the band, O(n * lower * upper): forward elimination touches the lower
+# rows below each pivot and the upper columns right of it, then banded back substitution
+def solve_banded(rows, b, lower_bandwidth, upper_bandwidth):
+    n = len(b)
+    band = [list(row) for row in rows]
+    rhs = list(b)
+    for k in range(n):
+        pivot = band[k][k]
+        if is_zero_pivot(pivot):
+            return None
+        last_column = min(n, k + upper_bandwidth + 1)
+        for i in range(k + 1, min(n, k + lower_bandwidth + 1)):
+            if band[i][k] == 0:
+                continue
+            factor = band[i][k] / pivot
+            band[i][k] = 0
+            for j in range(k + 1, last_column):
+                band[i][j] -= factor * band[k][j]
+            rhs[i] -= factor * rhs[k]
+    return solve_upper_triangular(band, rhs, upper_bandwidth)
+
+# |a_ii| >= sum of |a_ij| over the rest of row i, for every row.  elimination without pivoting is stable on
+# such matrices (no growth in the entries), so the thomas and banded solvers are only used on them
+def diagonally_dominant(rows):
+    for i, row in enumerate(rows):
+        if abs(row[i]) < sum(abs(a) for j, a in enumerate(row) if j != i):
+            return False
+    return True
+
+# (solution or None, solver path).  None with a structured path means that solver can't be trusted here: a
+# zero pivot stopped it, or the matrix is tridiagonal/banded but not diagonally dominant, so pivot free
+# elimination could lose accuracy.  GENERAL structures are left to the caller
+def solve_structured(rows, b, structure=None, tolerance=0):
+    if structure is None:
+        structure = detect_structure(rows, tolerance)
+    kind = structure.kind
+    if kind == DIAGONAL:
+        solution = solve_diagonal(rows, b)
+    elif kind == UPPER_TRIANGULAR:
+        solution = solve_upper_triangular(rows, b, structure.upper_bandwidth)
+    elif kind == LOWER_TRIANGULAR:
+        solution = solve_lower_triangular(rows, b, structure.lower_bandwidth)
+    elif kind in (TRIDIAGONAL, BANDED) and not diagonally_dominant(rows):
+        solution = None
+    elif kind == TRIDIAGONAL:
+        solution = solve_tridiagonal(rows, b)
+    elif kind == BANDED:
+        solution = solve_banded(rows, b, structure.lower_bandwidth, structure.upper_bandwidth)
+    else:
+        solution = None
+    return solution, structure.solver_path()
@@ -0,0 +1,29 @@
+import os
+import sys
+
+# the modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linsys import LinearSystem
+
+# augmented rows [a_1, ..., a_cols, k] of a system of the given rank: rank rows of random integers, then
+# random integer combinations of them.  inconsistent: chance that a combination gets 1 added to its
+# constant term, which usually leaves no solutions
+def dependent_rows(rng, rows, cols, rank, inconsistent=0.0, shuffle=False):
+    basis = [[rng.randint(-9, 9) for _ in range(cols + 1)] for _ in range(rank)]
+    result = list(basis)
+    for _ in range(rows - rank):
+        coefficients = [rng.randint(-2, 2) for _ in basis]
+        row = [sum(c * b[j] for c, b in zip(coefficients, basis)) for j in range(cols + 1)]
+        if rng.random() < inconsistent:
+            row[-1] += 1
+        result.append(row)
+    if shuffle:
+        rng.shuffle(result)
+    return result
+
+# LinearSystem of augmented rows, or of coefficient rows and constants b
+def system_of(rows, b=None):
+    if b is not None:
+        rows = [list(row) + [k] for row, k in zip(rows, b)]
+    return LinearSystem.from_augmented_rows([[str(x) for x in row] for row in rows])
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from linsys import LinearSystem, SolutionStatus
+from batch import SameShapeBatch, solve_same_shape
+from conftest import dependent_rows, system_of
+
+# m x n systems of random rank, some with an inconsistent row, so that infinite and empty solution sets
+# come up too
+def random_systems(rng, count, m, n):
+    return [system_of(dependent_rows(rng, m, n, rng.randint(1, min(m, n)), inconsistent=0.3, shuffle=True))
+            for _ in range(count)]
+
+def test_classification_and_solutions_match_linear_system():
+    rng = random.Random(27)
+    for m, n in ((3, 3), (4, 3), (2, 4), (5, 5)):
+        systems = random_systems(rng, 40, m, n)
+        classifications, solutions = solve_same_shape(systems)
+        for system, classification, solution in zip(systems, classifications, solutions):
+            status, parametrization = system.solve()
+            assert classification == status.value
+            if status == SolutionStatus.NONE:
+                assert solution is None
+                continue
+            assert len(solution.direction_vectors) == len(parametrization.direction_vectors)
+            if status == SolutionStatus.UNIQUE:
+                for x, y in zip(solution.basepoint.coordinates, parametrization.basepoint.coordinates):
+                    assert abs(float(x) - float(y)) < 1e-8
+
+def test_shapes_must_match():
+    systems = [LinearSystem.from_augmented_rows([['1', '2', '3', '4']]),
+               LinearSystem.from_augmented_rows([['1', '2', '3']])]
+    with pytest.raises(Exception) as info:
+        SameShapeBatch(systems)
+    assert str(info.value) == SameShapeBatch.SYSTEMS_MUST_SHARE_SHAPE_MSG
@@ -0,0 +1,49 @@
+from vector import Vector
+from line import Line
+from plane import Plane
+from hyperplane import Hyperplane
+from canonical import deduplicate
+
+def test_equality_agrees_with_coincident():
+    p = Plane(Vector([0.1, 0.3, 0.2]), 0.1)
+    q = Plane(Vector([0.3, 0.9, 0.6]), 0.3)
+    r = Plane(Vector([0.3, 0.9, 0.6]), 0.4)
+    assert p == q and Plane.coincident(p, q)
+    assert p != r and not Plane.coincident(p, r)
+    assert hash(p) == hash(q)
+    assert Line([1, 2], 3) == Line([-2, -4], -6)
+    assert Line([1, 2], 3) != Plane(Vector(['1', '2', '0']), '3')
+
+def test_hash_spreads_distinct_equations():
+    planes = [Plane(Vector([str(i), '1', str(i % 7)]), str(i % 5)) for i in range(200)]
+    assert len(set(hash(p) for p in planes)) == 200
+    lookup = dict((p, i) for i, p in enumerate(planes))
+    assert lookup[Plane(Vector(['-20', '-2', '-6']), '0')] == 10
+
+def test_zero_normal_equations():
+    assert Plane() == Plane()
+    assert Plane(constant_term='1') == Plane(constant_term='2')
+    assert Plane() != Plane(constant_term='1')
+    assert Plane() != Plane(Vector(['1', '0', '0']), '0')
+
+def test_hash_follows_mutation():
+    p = Hyperplane(normal_vector=Vector(['1', '2', '3', '4']), constant_term='5')
+    q = Hyperplane(normal_vector=Vector(['2', '4', '6', '8']), constant_term='10')
+    before = p.canonical_form()
+    assert p == q and len(set([p, q])) == 1
+    p.constant_term = p.constant_term + 1
+    assert p.canonical_form() != before
+    assert p != q and len(set([p, q])) == 2
+
+def test_deduplicate_groups():
+    p = Plane(Vector(['1', '2', '3']), '4')
+    result = deduplicate([p, Plane(Vector(['-2', '-4', '-6']), '-8'), Plane(Vector(['1', '2', '3']), '5'),
+                          Plane(Vector(['0', '0', '1']), '1')])
+    assert [len(g) for g in result.coincident_groups] == [2, 1, 1]
+    assert [len(f) for f in result.parallel_groups] == [2, 1]
+    assert result.unique[0] is p
+
+def test_deduplicate_keeps_degenerate_rows_apart():
+    result = deduplicate([Plane(), Plane(constant_term='3'), Plane(), Plane(Vector(['1', '0', '0']), '0')])
+    assert [len(g) for g in result.coincident_groups] == [2, 1, 1]
+    assert [len(f) for f in result.parallel_groups] == [1, 1, 1]
@@ -0,0 +1,78 @@
+import pickle
+import random
+from fractions import Fraction
+
+from condition import condition_number
+from linsys import LinearSystem, SolutionStatus
+from conftest import system_of
+
+def exact_inverse(rows):
+    n = len(rows)
+    a = [[Fraction(x) for x in row] + [Fraction(int(i == j)) for j in range(n)] for i, row in enumerate(rows)]
+    for c in range(n):
+        p = next(r for r in range(c, n) if a[r][c] != 0)
+        a[c], a[p] = a[p], a[c]
+        a[c] = [x / a[c][c] for x in a[c]]
+        for r in range(n):
+            if r != c and a[r][c] != 0:
+                a[r] = [x - a[r][c] * y for x, y in zip(a[r], a[c])]
+    return [row[n:] for row in a]
+
+def exact_condition_number(rows):
+    norm = lambda m: max(sum(abs(x) for x in row) for row in m)
+    return float(norm([[Fraction(x) for x in row] for row in rows]) * norm(exact_inverse(rows)))
+
+def test_estimate_brackets_the_exact_condition_number():
+    rng = random.Random(46)
+    hilbert = [[Fraction(1, i + j + 1) for j in range(6)] for i in range(6)]
+    matrices = [[[float(x) for x in row] for row in hilbert]]
+    for n in (2, 5, 12):
+        for _ in range(5):
+            matrices.append([[rng.randint(-9, 9) for _ in range(n)] for _ in range(n)])
+    for rows in matrices:
+        exact = exact_condition_number(rows)
+        estimate = condition_number(rows)
+        # hager's method estimates from below, and is rarely off by more than a small factor
+        assert exact / 10 <= estimate <= exact * (1 + 1e-6)
+
+def test_singular_matrix_has_infinite_condition_number():
+    assert condition_number([[1, 2], [2, 4]]) == float('inf')
+
+def test_solve_attaches_error_bounds_to_unique_solutions():
+    rng = random.Random(7)
+    rows = [[rng.randint(-9, 9) for _ in range(6)] for _ in range(6)]
+    for i in range(6):
+        rows[i][i] = 60
+    for use_structure in (True, False):
+        system = system_of(rows, [1, 2, 3, 4, 5, 6])
+        system.use_structure = use_structure
+        parametrization = system.compute_solution()
+        assert parametrization.condition_number is not None
+        assert parametrization.forward_error_bound < 1e-20
+        assert parametrization.is_reliable(1e-15)
+
+    # the bound follows the conditioning: hilbert matrices lose digits fast
+    hilbert = [['1/%d' % (i + j + 1) for j in range(8)] for i in range(8)]
+    system = LinearSystem.from_augmented_rows([[str(float(Fraction(a))) for a in row] + ['1'] for row in hilbert])
+    parametrization = system.compute_solution()
+    assert parametrization.condition_number > 1e9
+
+def test_bounds_are_worked_out_on_first_access():
+    system = system_of([[4, 1], [1, 3]], [1, 2])
+    parametrization = system.compute_solution()
+    assert parametrization.error_bounds is None
+    # later edits to the system don't change the bounds of an earlier solution
+    system[0] = system_of([[1, 1]], [0])[0]
+    assert pickle.loads(pickle.dumps(parametrization)).is_reliable(1e-15)
+    assert parametrization.is_reliable(1e-15)
+    assert parametrization.error_bounds is not None
+
+def test_bounds_are_optional_and_only_for_unique_solutions():
+    system = system_of([[1, 2], [3, 4]], [1, 1])
+    system.attach_bounds = False
+    assert system.compute_solution().forward_error_bound is None
+
+    status, parametrization = system_of([[1, 2], [2, 4]], [1, 2]).solve()
+    assert status == SolutionStatus.INFINITE
+    assert parametrization.forward_error_bound is None
+    assert not parametrization.is_reliable(1.0)
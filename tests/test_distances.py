@@ -0,0 +1,40 @@
+from vector import Vector
+from line import Line
+from plane import Plane
+from hyperplane import Hyperplane
+
+def close(xs, ys, tolerance=1e-12):
+    return all(abs(x - y) <= tolerance for x, y in zip(xs, ys))
+
+def test_plane_distances_and_projection():
+    p = Plane(Vector(['0', '0', '2']), '4')
+    assert close(p.signed_distances([[0, 0, 5], Vector(['1', '1', '-1'])]), [3.0, -3.0])
+    assert p.signed_sides([[0, 0, 5], [1, 1, 2], [0, 0, 0]]) == [1, 0, -1]
+    assert close(p.project_point([3, 4, 7]), [3.0, 4.0, 2.0])
+
+def test_line_distances():
+    line = Line([3, 4], 5)
+    assert close([line.distance_to([0, 0])], [1.0])
+    assert close(line.project_point([0, 0]), [0.6, 0.8])
+
+def test_hyperplane_distances():
+    h = Hyperplane(normal_vector=Vector(['1', '1', '1', '1']), constant_term='2')
+    assert close([h.signed_distance([1, 1, 1, 1])], [1.0])
+    assert close(h.project_point([1, 1, 1, 1]), [0.5, 0.5, 0.5, 0.5])
+
+def test_results_follow_changes_to_the_equation():
+    p = Plane(Vector(['0', '0', '1']), '1')
+    assert close([p.signed_distance([0, 0, 3])], [2.0])
+    p.constant_term = p.constant_term + 1
+    assert close([p.signed_distance([0, 0, 3])], [1.0])
+    p.normal_vector = Vector(['0', '0', '-1'])
+    assert close([p.signed_distance([0, 0, 3])], [-5.0])
+
+def test_unit_normal_is_computed_once_per_equation():
+    p = Plane(Vector(['0', '3', '4']), '10')
+    cached = p.unit_normal_and_offset()
+    p.distances_to([[0, 0, 0], [1, 1, 1]])
+    p.project_point([0, 0, 0])
+    assert p.unit_normal_and_offset() is cached
+    p.constant_term = p.constant_term * 2
+    assert p.unit_normal_and_offset() is not cached
@@ -0,0 +1,42 @@
+import random
+
+from linsys import LinearSystem
+from conftest import dependent_rows, system_of
+
+def check_echelon_invariants(system, reduced):
+    echelon = system.get_echelon_form()
+    assert echelon.reduced == reduced
+    assert echelon.pivot_indices == system.scan_for_pivot_indices()
+
+    # pivots move strictly right, and rows without one come last
+    pivots = [j for j in echelon.pivot_indices if j >= 0]
+    assert pivots == sorted(set(pivots))
+    assert echelon.pivot_indices == pivots + [-1] * len(echelon.zero_rows)
+    assert echelon.zero_rows == list(range(len(pivots), len(system)))
+    assert echelon.num_pivots + len(echelon.free_variable_indices) == echelon.num_variables
+
+    for i, j in echelon.pivot_rows:
+        column = [p.normal_vector[j] for p in system.planes]
+        assert abs(column[i]) > 1e-10
+        assert all(abs(a) < 1e-10 for a in column[i + 1:])
+        if reduced:
+            assert abs(column[i] - 1) < 1e-20
+            assert all(abs(a) < 1e-20 for a in column[:i])
+
+def test_triangular_and_reduced_forms_keep_the_invariants():
+    rng = random.Random(38)
+    for rows, cols, rank in [(4, 4, 4), (5, 3, 3), (3, 6, 3), (6, 5, 2), (4, 4, 0)]:
+        system = system_of(dependent_rows(rng, rows, cols, rank, shuffle=True))
+        triangular = system.compute_triangular_form()
+        check_echelon_invariants(triangular, reduced=False)
+        rref = system.compute_rref()
+        check_echelon_invariants(rref, reduced=True)
+        assert triangular.get_echelon_form().pivot_indices == rref.get_echelon_form().pivot_indices
+        assert rref.get_echelon_form().num_pivots == system.rank() == system.rank(method='qr')
+
+def test_missing_pivot_columns_are_free_variables():
+    system = LinearSystem.from_augmented_rows([[0, 1, 2, 0, 1], [0, 2, 4, 1, 3], [0, 0, 0, 0, 0]])
+    echelon = system.compute_rref().get_echelon_form()
+    assert echelon.pivot_indices == [1, 3, -1]
+    assert echelon.free_variable_indices == [0, 2]
+    assert echelon.zero_rows == [2]
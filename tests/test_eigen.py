@@ -0,0 +1,47 @@
+import random
+
+import eigen
+
+def orthonormal(vectors, tolerance=1e-8):
+    for i, v in enumerate(vectors):
+        for j, w in enumerate(vectors):
+            expected = 1.0 if i == j else 0.0
+            if abs(eigen.dot(v, w) - expected) > tolerance:
+                return False
+    return True
+
+def test_repeated_eigenvalue_gives_orthonormal_vectors():
+    matrix = [[2, 0, 0, 0], [0, 2, 0, 0], [0, 0, 1, 0], [0, 0, 0, .5]]
+    for method in ('lanczos', 'power'):
+        values, vectors = eigen.top_eigenpairs(matrix, k=3, method=method)
+        assert [round(v, 8) for v in values] == [2.0, 2.0, 1.0]
+        assert orthonormal(vectors)
+
+def test_repeated_eigenvalue_in_larger_matrix():
+    rng = random.Random(7)
+    n = 40
+    # Q diag(d) Q' with a random orthogonal Q and the top eigenvalue repeated three times
+    basis = []
+    for _ in range(n):
+        v = eigen.orthogonalize([rng.uniform(-1, 1) for _ in range(n)], basis)
+        magnitude = eigen.norm(v)
+        basis.append([x / magnitude for x in v])
+    d = [5.0, 5.0, 5.0] + [rng.uniform(-3, 3) for _ in range(n - 3)]
+    matrix = [[sum(basis[k][i] * d[k] * basis[k][j] for k in range(n)) for j in range(n)] for i in range(n)]
+
+    values, vectors = eigen.top_eigenpairs(matrix, k=4)
+    assert [round(v, 6) for v in values[:3]] == [5.0, 5.0, 5.0]
+    assert abs(values[3]) < 3.0
+    assert orthonormal(vectors, 1e-6)
+    for value, vector in zip(values, vectors):
+        assert eigen.residual_norm(lambda x: [eigen.dot(row, x) for row in matrix], value, vector) < 1e-6
+
+def test_symmetric_eigen_matches_top_eigenpairs():
+    rng = random.Random(3)
+    n = 12
+    a = [[rng.uniform(-1, 1) for _ in range(n)] for _ in range(n)]
+    matrix = [[a[i][j] + a[j][i] for j in range(n)] for i in range(n)]
+    values, _ = eigen.symmetric_eigen(matrix)
+    expected = sorted(values, key=lambda v: -abs(v))[:3]
+    top, _ = eigen.top_eigenpairs(matrix, k=3)
+    assert all(abs(x - y) < 1e-7 for x, y in zip(top, expected))
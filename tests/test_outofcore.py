@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from linsys import LinearSystem
+from outofcore import OutOfCoreSystem
+from conftest import dependent_rows, system_of
+
+def assert_same_solution(out_of_core, in_memory):
+    if in_memory == LinearSystem.NO_SOLUTIONS_MSG:
+        assert out_of_core == in_memory
+        return
+    assert [float(x) for x in out_of_core.basepoint.coordinates] == \
+        pytest.approx([float(x) for x in in_memory.basepoint.coordinates], abs=1e-8)
+    assert len(out_of_core.direction_vectors) == len(in_memory.direction_vectors)
+    for d, e in zip(out_of_core.direction_vectors, in_memory.direction_vectors):
+        assert [float(x) for x in d.coordinates] == pytest.approx([float(x) for x in e.coordinates], abs=1e-8)
+
+@pytest.mark.parametrize('block_rows', [1, 2, 3, 256])
+def test_matches_in_memory_elimination(tmp_path, block_rows):
+    rng = random.Random(29)
+    cases = [system_of(dependent_rows(rng, 6, 6, 6)),      # unique
+             system_of(dependent_rows(rng, 7, 5, 5)),      # overdetermined but consistent
+             system_of(dependent_rows(rng, 5, 6, 3)),      # infinitely many solutions
+             system_of([[1, 1, 1, 1], [2, 2, 2, 3], [0, 1, 0, 1]])]  # none
+    for k, system in enumerate(cases):
+        path = str(tmp_path / 'system{}.lsys'.format(k))
+        with OutOfCoreSystem.from_system(system, path, block_rows) as out_of_core:
+            assert_same_solution(out_of_core.compute_solution(), system.compute_solution())
+
+def test_rejects_empty_blocks(tmp_path):
+    system = LinearSystem.from_augmented_rows([[1, 2, 3]])
+    with pytest.raises(Exception, match=OutOfCoreSystem.BLOCK_ROWS_MUST_BE_POSITIVE_MSG):
+        OutOfCoreSystem.from_system(system, str(tmp_path / 'system.lsys'), block_rows=0)
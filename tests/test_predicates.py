@@ -0,0 +1,72 @@
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+from vector import Vector
+from line import Line
+from plane import Plane
+from linsys import LinearSystem
+from predicates import proportional, exact_value
+
+def test_float_multiples_are_parallel_and_coincident():
+    p = Plane(Vector([0.1, 0.3, 0.2]), 0.1)
+    q = Plane(Vector([0.3, 0.9, 0.6]), 0.3)
+    assert Plane.parallel(p, q)
+    assert Plane.coincident(p, q)
+    assert Line.parallel(Line([0.1, 0.3], 0.1), Line([0.3, 0.9], 0.3))
+    assert Line.coincident(Line([0.1, 0.3], 0.1), Line([0.3, 0.9], 0.3))
+
+def test_exact_predicates_are_opt_in():
+    p = Plane(Vector([0.1, 0.3, 0.2]), 0.1)
+    q = Plane(Vector([0.3, 0.9, 0.6]), 0.3)
+    assert not Plane.parallel(p, q, exact=True)
+    assert not Plane.coincident(p, q, exact=True)
+    assert Plane.coincident(Plane(Vector(['1', '3', '2']), '1'), Plane(Vector(['3', '9', '6']), '3'), exact=True)
+
+def test_parallel_but_not_coincident():
+    p = Plane(Vector(['1', '2', '3']), '4')
+    q = Plane(Vector(['2', '4', '6']), '9')
+    assert Plane.parallel(p, q)
+    assert not Plane.coincident(p, q)
+    assert not Plane.parallel(p, Plane(Vector(['1', '2', '3.001']), '4'))
+
+def test_vertical_and_horizontal_lines():
+    assert Line.coincident(Line(Vector(['1', '0']), '2'), Line(Vector(['3', '0']), '6'))
+    assert not Line.coincident(Line(Vector(['1', '0']), '2'), Line(Vector(['3', '0']), '5'))
+    assert Line.coincident(Line(Vector(['0', '2']), '2'), Line(Vector(['0', '-1']), '-1'))
+
+def test_rows_from_decimal_elimination_stay_parallel():
+    system = LinearSystem([Plane(Vector(['1', '1', '1']), '1'),
+                           Plane(Vector(['3', '1', '2']), '2'),
+                           Plane(Vector(['1', '1', '1']), '3')])
+    system.add_multiple_times_row_to_row(Decimal(1) / 3, 1, 0)
+    system.add_multiple_times_row_to_row(Decimal(-1) / 3, 1, 0)
+    assert Plane.parallel(system[0], system[2])
+
+def exactly_within_tolerance(u, v, tolerance):
+    u = [exact_value(x) for x in u]
+    v = [exact_value(x) for x in v]
+    bound = Fraction(tolerance) ** 2 * sum(x * x for x in u) * sum(x * x for x in v)
+    return all((u[i] * v[j] - u[j] * v[i]) ** 2 <= bound for i in range(len(u)) for j in range(i + 1, len(u)))
+
+def test_filtered_tolerance_test_matches_exact_arithmetic():
+    rng = random.Random(41)
+    for _ in range(500):
+        u = [rng.uniform(-10, 10) for _ in range(3)]
+        scale = rng.uniform(-5, 5)
+        # nudges around the tolerance boundary, where the float filter has to fall back
+        v = [x * scale + rng.choice((0, 1, -1)) * rng.uniform(0.5, 2) * 1e-10 * abs(scale) * 10 for x in u]
+        v = [Decimal(x) for x in v]
+        assert proportional(u, v) == exactly_within_tolerance(u, v, 1e-10)
+
+def test_boundary_cases_fall_back_to_exact_arithmetic():
+    # minor^2 against tolerance^2 |u|^2 |v|^2 differ by less than the float filter can resolve
+    tolerance = Decimal(1e-10)
+    assert proportional([1, 0], [1, tolerance])
+    assert not proportional([1, 0], [1, tolerance * (1 + Decimal('1e-15'))])
+
+def test_tiny_and_huge_coefficients():
+    assert proportional([1e-200, 2e-200], [3e-200, 6e-200])
+    assert not proportional([1e-200, 2e-200], [3e-200, 7e-200])
+    assert proportional([1e200, 2e200], [3e200, 6e200])
+    assert not proportional([1e200, 2e200], [3e200, 7e200])
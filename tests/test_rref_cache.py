@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+from linsys import LinearSystem
+from plane import Plane
+from vector import Vector
+
+def full_rank_system():
+    return LinearSystem.from_augmented_rows([[1, 0, 0, 1], [0, 1, 0, 2], [0, 0, 1, 3]])
+
+def test_queries_follow_every_kind_of_row_change():
+    dependent = Plane(normal_vector=Vector([1, 1, 0]), constant_term=3)
+    edits = [lambda s: s.__setitem__(2, dependent),
+             lambda s: s.planes.__setitem__(2, dependent),
+             lambda s: s.multiply_coefficient_and_row(0, 2),
+             lambda s: s.add_multiple_times_row_to_row(-1, 0, 2) or s.add_multiple_times_row_to_row(-1, 1, 2)
+                       or s.add_multiple_times_row_to_row(-1, 2, 2),
+             lambda s: s.planes.pop()]
+    for edit in edits:
+        system = full_rank_system()
+        assert system.rank() == 3
+        assert system.null_space() == []
+        edit(system)
+        assert system.rank() == 2
+        assert len(system.null_space()) == 1
+
+def test_echelon_form_follows_row_changes():
+    system = full_rank_system()
+    assert system.get_echelon_form().pivot_indices == [0, 1, 2]
+    system.swap_rows(0, 2)
+    assert system.get_echelon_form().pivot_indices == [2, 1, 0]
+    system.planes[1].normal_vector = Vector([0, 0, 0])
+    assert system.get_echelon_form().pivot_indices == [2, -1, 0]
+
+def test_unchanged_system_reuses_its_rref():
+    system = full_rank_system()
+    rref, _ = system.cached_rref()
+    assert system.cached_rref()[0] is rref
+    system.planes[0].constant_term = Decimal(5)
+    assert system.cached_rref()[0] is not rref
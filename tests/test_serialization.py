@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+import pytest
+
+from linsys import LinearSystem, Parametrization
+from vector import Vector
+from serialization import (BinaryWriter, BinaryReader, write_system, read_system, write_parametrization,
+                           read_parametrization, read_csv_system, import_csv_to_binary, FORMAT_FIXED_POINT,
+                           KIND_LINEAR_SYSTEM, KIND_PARAMETRIZATION, HEADER, EMPTY_CSV_MSG)
+
+def test_fixed_point_round_trip(tmp_path):
+    rows = [['1.5', '-2', '3'], ['0.125', '9200000', '-1']]
+    path = str(tmp_path / 'system.lsys')
+    write_system(LinearSystem.from_augmented_rows(rows), path, FORMAT_FIXED_POINT)
+    assert read_system(path).to_augmented_rows() == [[Decimal(x) for x in row] for row in rows]
+
+def test_fixed_point_values_out_of_range_raise(tmp_path):
+    path = str(tmp_path / 'big.lsys')
+    system = LinearSystem.from_augmented_rows([['1', '2', '1e7']])
+    with pytest.raises(Exception, match=BinaryWriter.VALUE_OUT_OF_RANGE_MSG):
+        write_system(system, path, FORMAT_FIXED_POINT)
+    # a smaller scale leaves room for it
+    write_system(system, path, FORMAT_FIXED_POINT, scale=6)
+    assert read_system(path).planes[0].constant_term == Decimal('1e7')
+
+def test_empty_and_truncated_files_raise_format_errors(tmp_path):
+    empty = tmp_path / 'empty.lsys'
+    empty.write_bytes(b'')
+    with pytest.raises(Exception, match=BinaryReader.NOT_A_SYSTEM_FILE_MSG):
+        read_parametrization(str(empty))
+
+    no_rows = str(tmp_path / 'no_rows.lsys')
+    BinaryWriter(no_rows, KIND_PARAMETRIZATION, 3).close()
+    with pytest.raises(Exception, match=BinaryReader.MISSING_BASEPOINT_MSG):
+        read_parametrization(no_rows)
+
+    path = tmp_path / 'full.lsys'
+    write_parametrization(Parametrization(Vector([1, 2, 3]), [Vector([0, 1, 0])]), str(path))
+    assert read_parametrization(str(path)).direction_vectors[0].coordinates == (0, 1, 0)
+    truncated = tmp_path / 'truncated.lsys'
+    truncated.write_bytes(path.read_bytes()[:HEADER.size + 10])
+    with pytest.raises(Exception, match=BinaryReader.TRUNCATED_FILE_MSG):
+        read_parametrization(str(truncated))
+
+def test_empty_inputs_raise_format_errors(tmp_path):
+    no_rows = str(tmp_path / 'no_rows.lsys')
+    BinaryWriter(no_rows, KIND_LINEAR_SYSTEM, 4).close()
+    with pytest.raises(Exception, match=BinaryReader.NO_EQUATIONS_MSG):
+        read_system(no_rows)
+
+    csv_path = tmp_path / 'empty.csv'
+    csv_path.write_text('# only a comment\n\n')
+    with pytest.raises(Exception, match=EMPTY_CSV_MSG):
+        read_csv_system(str(csv_path))
+    binary_path = tmp_path / 'empty.lsys'
+    with pytest.raises(Exception, match=EMPTY_CSV_MSG):
+        import_csv_to_binary(str(csv_path), str(binary_path))
+    assert not binary_path.exists()
+
+def test_failed_writes_leave_no_file(tmp_path):
+    path = tmp_path / 'big.lsys'
+    system = LinearSystem.from_augmented_rows([['1', '2', '3'], ['1', '2', '1e7']])
+    with pytest.raises(Exception, match=BinaryWriter.VALUE_OUT_OF_RANGE_MSG):
+        write_system(system, str(path), FORMAT_FIXED_POINT)
+    assert not path.exists()
+
+    csv_path = tmp_path / 'ragged.csv'
+    csv_path.write_text('1,2,3\n4,5\n')
+    with pytest.raises(Exception, match=BinaryWriter.WRONG_ROW_LENGTH_MSG):
+        import_csv_to_binary(str(csv_path), str(path))
+    assert not path.exists()
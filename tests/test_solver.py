@@ -0,0 +1,25 @@
+from linsys import LinearSystem
+from solver import Solver
+
+def test_matches_linear_system_solve():
+    cases = [[[4, 1, 0, 1], [1, 4, 1, 2], [0, 1, 4, 3]],     # structured (tridiagonal) path
+             [[1, 2, 3, 1], [3, 1, 2, 2], [2, 3, 1, 3]],     # elimination
+             [[1, 2, 3, 1], [2, 4, 6, 2], [0, 0, 1, 1]],     # infinitely many
+             [[1, 2, 3, 1], [2, 4, 6, 3], [0, 0, 1, 1]]]     # none
+    solver = Solver(3)
+    for rows in cases:
+        for attach_bounds in (True, False):
+            system = LinearSystem.from_augmented_rows(rows)
+            system.attach_bounds = attach_bounds
+            status, parametrization = solver.solve(system)
+            expected_status, expected = system.solve()
+            assert status == expected_status
+            if expected is None:
+                assert parametrization is None
+                continue
+            assert parametrization.basepoint == expected.basepoint
+            assert parametrization.direction_vectors == expected.direction_vectors
+            assert parametrization.error_bounds == expected.error_bounds
+            assert parametrization.forward_error_bound == expected.forward_error_bound
+            assert (parametrization.forward_error_bound is not None) == \
+                (attach_bounds and not parametrization.direction_vectors)
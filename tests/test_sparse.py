@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+import eigen
+from matrix import Matrix, matrix_multiplication
+from sparse import CSRMatrix, CSCMatrix
+from structure import TRIDIAGONAL
+
+def random_rows(rng, n, fraction):
+    return [[rng.randint(-9, 9) if rng.random() < fraction else 0 for _ in range(n)] for _ in range(n)]
+
+def test_layouts_agree_with_dense_products():
+    rng = random.Random(50)
+    a = random_rows(rng, 12, 0.2)
+    b = random_rows(rng, 12, 0.2)
+    x = [rng.randint(-5, 5) for _ in range(12)]
+    expected_vector = [sum(p * q for p, q in zip(row, x)) for row in a]
+    expected_product = matrix_multiplication(a, b)
+    for matrix in (CSRMatrix.from_dense(a), CSCMatrix.from_dense(a)):
+        assert matrix.to_dense_rows() == a
+        assert matrix.multiply_vector(x) == expected_vector
+        assert matrix.multiply_matrix(CSRMatrix.from_dense(b)).to_dense_rows() == expected_product
+        assert matrix.multiply_matrix(b).vals == expected_product
+        assert matrix.transpose().to_dense_rows() == [list(c) for c in zip(*a)]
+
+def test_sparse_matrices_are_matrix_variants():
+    n = 8
+    rows = [[4 if i == j else (-1 if abs(i - j) == 1 else 0) for j in range(n)] for i in range(n)]
+    b = list(range(n))
+    dense = Matrix(rows)
+    for matrix in (CSRMatrix.from_dense(rows), CSCMatrix.from_dense(rows)):
+        assert isinstance(matrix, Matrix)
+        assert matrix.detect_structure().kind == TRIDIAGONAL
+        assert matrix.solve(b) == dense.solve(b)
+        values, _ = matrix.symmetric_eigen()
+        assert values == pytest.approx(dense.symmetric_eigen()[0])
+        top, _ = matrix.top_eigenpairs(2)
+        assert top == pytest.approx(sorted(values, key=abs, reverse=True)[:2], abs=1e-8)
+
+def test_top_eigenpairs_needs_a_square_matrix():
+    with pytest.raises(Exception, match=eigen.NOT_SQUARE_MSG):
+        CSRMatrix.from_dense([[1, 2, 3], [4, 5, 6]]).top_eigenpairs()
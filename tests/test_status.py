@@ -0,0 +1,38 @@
+from linsys import LinearSystem, SolutionStatus
+
+def solve(rows, **options):
+    system = LinearSystem.from_augmented_rows(rows)
+    for name, value in options.items():
+        setattr(system, name, value)
+    return system.solve()
+
+def test_classification():
+    cases = [([[1, 1, 1, 6], [0, 1, 1, 5], [0, 0, 1, 3]], SolutionStatus.UNIQUE),
+             ([[1, 1, 2], [1, -1, 0], [2, 0, 2]], SolutionStatus.UNIQUE),           # overdetermined, consistent
+             ([[1, 1, 2], [1, -1, 0], [2, 0, 3]], SolutionStatus.NONE),             # overdetermined, inconsistent
+             ([[1, 2, 3, 4], [2, 4, 6, 8]], SolutionStatus.INFINITE),               # underdetermined
+             ([[1, 2, 3, 4], [2, 4, 6, 9]], SolutionStatus.NONE),                   # parallel planes
+             ([[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]], SolutionStatus.INFINITE),  # 0 = 0 everywhere
+             ([[0, 0, 0, 0], [0, 0, 0, 1], [1, 0, 0, 0]], SolutionStatus.NONE),      # a 0 = 1 row
+             ([[2, 0, 0, 2], [0, 0, 0, 0], [0, 0, 3, 3]], SolutionStatus.INFINITE)]  # a missing variable
+    for rows, expected in cases:
+        for use_structure in (True, False):
+            status, parametrization = solve(rows, use_structure=use_structure)
+            assert status == expected
+            if status == SolutionStatus.NONE:
+                assert parametrization is None
+            elif status == SolutionStatus.UNIQUE:
+                assert parametrization.direction_vectors == []
+            else:
+                assert parametrization.direction_vectors
+
+def test_unique_solution_values():
+    status, parametrization = solve([[1, 1, 1, 6], [0, 1, 1, 5], [0, 0, 1, 3]])
+    assert status == SolutionStatus.UNIQUE
+    assert [float(x) for x in parametrization.basepoint.coordinates] == [1.0, 2.0, 3.0]
+
+def test_compute_solution_follows_solve():
+    assert LinearSystem.from_augmented_rows([[1, 1, 2], [1, 1, 3]]).compute_solution() == \
+        LinearSystem.NO_SOLUTIONS_MSG
+    parametrization = LinearSystem.from_augmented_rows([[1, 1, 2], [2, 2, 4]]).compute_solution()
+    assert len(parametrization.direction_vectors) == 1
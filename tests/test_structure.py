@@ -0,0 +1,74 @@
+import random
+
+from linsys import SolutionStatus
+from conftest import system_of
+from structure import (detect_structure, DIAGONAL, UPPER_TRIANGULAR, LOWER_TRIANGULAR, TRIDIAGONAL, BANDED,
+                       GENERAL, SOLVER_PATHS)
+
+def banded_rows(rng, n, lower, upper, dominant=True):
+    rows = []
+    for i in range(n):
+        row = [0] * n
+        for j in range(max(0, i - lower), min(n, i + upper + 1)):
+            row[j] = rng.randint(1, 9) * rng.choice((-1, 1))
+        if dominant:
+            row[i] = sum(abs(a) for a in row) + rng.randint(1, 5)
+        rows.append(row)
+    return rows
+
+def solve_both_ways(rows, b):
+    structured = system_of(rows, b)
+    general = system_of(rows, b)
+    general.use_structure = False
+    return structured.solve(), structured.solve_path, general.solve()
+
+def test_classification():
+    rng = random.Random(43)
+    assert detect_structure([[1, 2], [3, 4]]).kind == GENERAL
+    assert detect_structure(banded_rows(rng, 3, 1, 1)).kind == TRIDIAGONAL
+    assert detect_structure(banded_rows(rng, 10, 1, 2)).kind == BANDED
+    assert detect_structure(banded_rows(rng, 10, 3, 3)).kind == GENERAL
+    missing_corner = banded_rows(rng, 6, 5, 5)
+    missing_corner[5][0] = 0
+    assert detect_structure(missing_corner).kind == GENERAL
+    assert detect_structure([[1, 0], [0, 2]]).kind == DIAGONAL
+    assert detect_structure([[1, 2], [0, 2]]).kind == UPPER_TRIANGULAR
+    assert detect_structure([[1, 0], [3, 2]]).kind == LOWER_TRIANGULAR
+
+def test_structured_paths_match_general_elimination():
+    rng = random.Random(7)
+    cases = [(banded_rows(rng, 8, 0, 0), 'diagonal'),
+             (banded_rows(rng, 8, 0, 7), 'back_substitution'),
+             (banded_rows(rng, 8, 7, 0), 'forward_substitution'),
+             (banded_rows(rng, 12, 1, 1), 'thomas'),
+             (banded_rows(rng, 16, 2, 3), 'banded_lu')]
+    for rows, path in cases:
+        b = [rng.randint(-9, 9) for _ in rows]
+        (status, structured), solve_path, (general_status, general) = solve_both_ways(rows, b)
+        assert solve_path == path
+        assert status == general_status == SolutionStatus.UNIQUE
+        for x, y in zip(structured.basepoint.coordinates, general.basepoint.coordinates):
+            assert abs(x - y) < 1e-20
+
+def test_zero_pivots_fall_back_to_elimination():
+    # tridiagonal with a zero leading pivot, solvable with row exchanges
+    rows = [[0, 1, 0], [1, 0, 1], [0, 1, 1]]
+    (status, parametrization), solve_path, (general_status, general) = solve_both_ways(rows, [1, 2, 3])
+    assert solve_path == SOLVER_PATHS[GENERAL]
+    assert status == general_status == SolutionStatus.UNIQUE
+    assert parametrization.basepoint.coordinates == general.basepoint.coordinates
+
+    # singular triangular systems: the substitution stops and elimination classifies them
+    rows = [[1, 2, 3], [0, 0, 1], [0, 0, 1]]
+    (status, _), solve_path, (general_status, _) = solve_both_ways(rows, [1, 2, 2])
+    assert solve_path == SOLVER_PATHS[GENERAL]
+    assert status == general_status == SolutionStatus.INFINITE
+    (status, _), _, (general_status, _) = solve_both_ways(rows, [1, 2, 3])
+    assert status == general_status == SolutionStatus.NONE
+
+def test_tridiagonal_without_dominance_uses_elimination():
+    # nonzero pivots throughout, but a tiny leading one that pivot free elimination would amplify
+    rows = [[1e-9, 1, 0], [1, 1, 1], [0, 1, 1]]
+    (status, parametrization), solve_path, (_, general) = solve_both_ways(rows, [1, 2, 3])
+    assert solve_path == SOLVER_PATHS[GENERAL]
+    assert parametrization.basepoint.coordinates == general.basepoint.coordinates
@@ -10,6 +10,8 @@ class Vector(object):
     CANNOT_NORMALIZE_ZERO_VECTOR_MSG = 'Cannot normalize the zero vector'
     ATTEMPTED_ZERO_DIVIDE = 'An attempt was made to divide by zero'
     ATTEMPTED_CROSS_PRODUCT_WO3DINPUTS = 'Cannot perform cross product without 3D input vectors'
+    NO_UNIQUE_PARALLELL_COMPONENT_MSG = 'No unique parallel component: cannot project onto the zero vector'
+    NO_UNIQUE_ORTHOGANAL_COMPONENT_MSG = 'No unique orthogonal component: cannot project onto the zero vector'
 
     def __init__(self, coordinates):
         try: 
@@ -25,7 +27,7 @@ class Vector(object):
             raise TypeError('The coordinates must be an iterable')
 
     def __iter__(self):
-        return self.coordinates
+        return iter(self.coordinates)
     #
     # def __next__(self):
     #     value = self.coordinates[self.current]
@@ -130,26 +132,25 @@ class Vector(object):
         return parallel
 
     # projection functions
-    @staticmethod 
-    def v_parallel(self, v, b): # return the (2D?) projection of v onto b a.k.a. v"
+    @staticmethod
+    def v_parallel(v, b): # return the projection of v onto b a.k.a. v"
         try:
             b_normalized = b.normalized()
             u = Vector.dot(v, b_normalized)
             return b_normalized.times_scalar(u)
         except Exception as e:
-            if str(e) == self.CANNON_NORMALIZE_ZERO_VECTOR_MSG:
-                raise Exception(self.NO_UNIQUE_PARALLELL_COMPONENT_MSG)
+            if str(e) == Vector.CANNOT_NORMALIZE_ZERO_VECTOR_MSG:
+                raise Exception(Vector.NO_UNIQUE_PARALLELL_COMPONENT_MSG)
             else:
                 raise e
 
     @staticmethod
-    def v_perp(self, v, b): # return the vector orthagonal to v"
+    def v_perp(v, b): # return the component of v orthagonal to b
         try:
-            vee = v
-            return vee.minus(Vector.v_parallel(v, b))
+            return v.minus(Vector.v_parallel(v, b))
         except Exception as e:
-            if str(e) == self.NO_UNIQUE_PARALLELL_COMPONENT_MSG:
-                raise Exception(self.NO_UNIQUE_ORTHOGANAL_COMPONENT_MSG)
+            if str(e) == Vector.NO_UNIQUE_PARALLELL_COMPONENT_MSG:
+                raise Exception(Vector.NO_UNIQUE_ORTHOGANAL_COMPONENT_MSG)
             else:
                 raise e
 